@@ -0,0 +1,143 @@
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+from collections import deque
+from typing import Callable, Dict
+
+from core.compact import EntityPool
+from network.compact_decoder import CompactDecoder
+from network.decoder import JDISDecoder, MemoryViewDecoder
+from network.lazy_decoder import LazyDecoder
+from network.synthetic import synthetic_frame
+
+
+def decoding_modes() -> Dict[str, Callable[[bytes], object]]:
+    memoryview_decoder = MemoryViewDecoder()
+    lazy_decoder = LazyDecoder()
+    compact_decoder = CompactDecoder()
+    pooled_decoder = CompactDecoder(EntityPool())
+    modes = {
+        # What Socket.handle_message used to do: a fresh decoder and a copied payload per frame.
+        "jdis": lambda frame: JDISDecoder().decode_game_state(frame[1:]),
+        "memoryview": lambda frame: memoryview_decoder.decode_game_state(frame, 1),
+        # A tick that only looks at positions, then one that also reads every projectile.
+        "lazy": lambda frame: lazy_decoder.decode_game_state(frame, 1),
+        "lazy+proj": lambda frame: [p.projectiles for p in lazy_decoder.decode_game_state(frame, 1).players],
+        "slots": lambda frame: compact_decoder.decode_game_state(frame, 1),
+        "pooled": lambda frame: pooled_decoder.decode_game_state(frame, 1),
+    }
+
+    try:
+        from network.columnar_decoder import ColumnarDecoder
+    except ImportError:
+        return modes
+
+    columnar_decoder = ColumnarDecoder()
+    modes["columnar"] = lambda frame: columnar_decoder.decode_columnar(frame, 1)
+    return modes
+
+
+def measure(decode: Callable[[bytes], object], frame: bytes, min_time: float) -> dict:
+    decode(frame)
+
+    frames = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < min_time:
+        decode(frame)
+        frames += 1
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    blocks = sys.getallocatedblocks()
+    before, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    result = decode(frame)
+    after, peak = tracemalloc.get_traced_memory()
+    retained_blocks = sys.getallocatedblocks() - blocks
+    tracemalloc.stop()
+    del result
+
+    return {
+        "fps": frames / elapsed,
+        "us": elapsed / frames * 1e6,
+        "peak_kb": (peak - before) / 1024,
+        "retained_kb": (after - before) / 1024,
+        "blocks": retained_blocks,
+    }
+
+
+def gc_pressure(decode: Callable[[bytes], object], frame: bytes, frames: int, keep: int = 2) -> dict:
+    """
+    Collector activity while decoding `frames` frames and, like a bot comparing
+    ticks, keeping the last `keep` results alive.
+    """
+    counts = [0, 0, 0]
+    paused = [0.0]
+    started = [0.0]
+
+    def callback(phase, info):
+        if phase == "start":
+            started[0] = time.perf_counter()
+        else:
+            counts[info["generation"]] += 1
+            paused[0] += time.perf_counter() - started[0]
+
+    kept = deque(maxlen=keep)
+    for _ in range(keep + 1):
+        kept.append(decode(frame))
+
+    gc.collect()
+    gc.callbacks.append(callback)
+    try:
+        for _ in range(frames):
+            kept.append(decode(frame))
+    finally:
+        gc.callbacks.remove(callback)
+
+    scale = 1000 / frames
+    return {"gen0": counts[0] * scale, "gen1": counts[1] * scale, "gen2": counts[2] * scale, "gc_ms": paused[0] * 1000 * scale}
+
+
+def gc_benchmark(sizes, frames: int) -> None:
+    modes = decoding_modes()
+    print(f"{'players':>8} {'proj/p':>7} {'coins':>6}  {'mode':<11} {'gen0/1k':>8} {'gen1/1k':>8} {'gen2/1k':>8} {'GC ms/1k':>9}")
+    for players, projectiles, coins in sizes:
+        frame = synthetic_frame(players, projectiles, coins, seed=0)
+        for name, decode in modes.items():
+            r = gc_pressure(decode, frame, frames)
+            print(f"{players:>8} {projectiles:>7} {coins:>6}  {name:<11} {r['gen0']:>8.1f} {r['gen1']:>8.1f} "
+                  f"{r['gen2']:>8.1f} {r['gc_ms']:>9.2f}")
+
+
+def benchmark(sizes, min_time: float) -> None:
+    modes = decoding_modes()
+    print(f"{'players':>8} {'proj/p':>7} {'coins':>6} {'bytes':>8}  {'mode':<11} {'frames/s':>10} {'us/frame':>10} "
+          f"{'peak KiB':>9} {'kept KiB':>9} {'blocks':>7}")
+    for players, projectiles, coins in sizes:
+        frame = synthetic_frame(players, projectiles, coins, seed=0)
+        for name, decode in modes.items():
+            r = measure(decode, frame, min_time)
+            print(f"{players:>8} {projectiles:>7} {coins:>6} {len(frame):>8}  {name:<11} {r['fps']:>10.1f} "
+                  f"{r['us']:>10.1f} {r['peak_kb']:>9.1f} {r['retained_kb']:>9.1f} {r['blocks']:>7}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks the GameState decoders on synthetic frames")
+    parser.add_argument("-p", "--players", type=int, nargs="+", default=[8, 64, 256], help="Player counts to sweep")
+    parser.add_argument("-j", "--projectiles", type=int, default=10, help="Projectiles per player")
+    parser.add_argument("-c", "--coins", type=int, default=30, help="Coins per frame")
+    parser.add_argument("-t", "--time", type=float, default=1.0, help="Seconds spent timing each decoder and size")
+    parser.add_argument("--gc", type=int, default=0, metavar="FRAMES",
+                        help="Also count garbage collections over FRAMES decodes per decoder, keeping the last two results alive")
+
+    args = parser.parse_args()
+
+    sizes = [(players, args.projectiles, args.coins) for players in args.players]
+    benchmark(sizes, args.time)
+    if args.gc:
+        gc_benchmark(sizes, args.gc)
+
+if __name__ == "__main__":
+    main()
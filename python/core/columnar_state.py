@@ -0,0 +1,148 @@
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+PLAYER_DTYPE = np.dtype([
+    ('pos',              '<f8', (2,)),
+    ('dest',             '<f8', (2,)),
+    ('has_dest',         '?'),
+    ('color',            '<i4'),
+    ('health',           '<i4'),
+    ('score',            '<i8'),
+    ('weapon',           'u1'),
+    ('blade_start',      '<f8', (2,)),
+    ('blade_end',        '<f8', (2,)),
+    ('blade_rotation',   '<f8'),
+    ('projectile_start', '<i4'),
+    ('projectile_count', '<i4'),
+])
+
+# The projectile and coin tables share their leading fields with the wire
+# layout so whole blocks can be copied straight out of a frame.
+PROJECTILE_WIRE_DTYPE = np.dtype([
+    ('uid',  'S16'),
+    ('pos',  '<f8', (2,)),
+    ('dest', '<f8', (2,)),
+])
+
+PROJECTILE_DTYPE = np.dtype(PROJECTILE_WIRE_DTYPE.descr + [('owner', '<i4')])
+
+COIN_DTYPE = np.dtype([
+    ('uid',   'S16'),
+    ('pos',   '<f8', (2,)),
+    ('value', '<i4'),
+])
+
+
+def _grow(table: np.ndarray, needed: int) -> np.ndarray:
+    if needed <= len(table):
+        return table
+    capacity = max(needed, 2 * len(table))
+    grown = np.zeros(capacity, dtype=table.dtype)
+    grown[:len(table)] = table
+    return grown
+
+
+class ColumnarGameState:
+    """
+    (fr) Vue en colonnes d'un GameState. Les tables sont préallouées et réutilisées d'un tick à l'autre.
+    (en) Columnar view of a GameState. Tables are preallocated and reused from tick to tick.
+
+    Attributes:
+        players     (np.ndarray) : (fr) Une ligne par joueur (PLAYER_DTYPE).
+                                   (en) One row per player (PLAYER_DTYPE).
+
+        projectiles (np.ndarray) : (fr) Tous les projectiles de la frame, `owner` est l'index du joueur.
+                                   (en) Every projectile in the frame, `owner` is the player index.
+
+        coins       (np.ndarray) : (fr) Une ligne par pièce (COIN_DTYPE).
+                                   (en) One row per coin (COIN_DTYPE).
+
+        names       (List[str])  : (fr) Le nom de chaque joueur, dans l'ordre des lignes.
+                                   (en) The name of each player, in row order.
+    """
+
+    def __init__(self, player_capacity: int = 16, projectile_capacity: int = 256, coin_capacity: int = 64):
+        self.current_tick = 0
+        self.current_round = 0
+        self._players = np.zeros(player_capacity, dtype=PLAYER_DTYPE)
+        self._projectiles = np.zeros(projectile_capacity, dtype=PROJECTILE_DTYPE)
+        self._coins = np.zeros(coin_capacity, dtype=COIN_DTYPE)
+        self.player_count = 0
+        self.projectile_count = 0
+        self.coin_count = 0
+        self.names: List[str] = []
+        self.index: Dict[str, int] = {}
+
+    def reset(self, player_count: int) -> None:
+        self._players = _grow(self._players, player_count)
+        self.player_count = player_count
+        self.projectile_count = 0
+        self.coin_count = 0
+        self.names.clear()
+        self.index.clear()
+
+    def reserve_coins(self, coin_count: int) -> None:
+        self._coins = _grow(self._coins, coin_count)
+        self.coin_count = coin_count
+
+    def reserve_projectiles(self, extra: int) -> np.ndarray:
+        start = self.projectile_count
+        self._projectiles = _grow(self._projectiles, start + extra)
+        self.projectile_count = start + extra
+        return self._projectiles[start:start + extra]
+
+    @property
+    def players(self) -> np.ndarray:
+        return self._players[:self.player_count]
+
+    @property
+    def projectiles(self) -> np.ndarray:
+        return self._projectiles[:self.projectile_count]
+
+    @property
+    def coins(self) -> np.ndarray:
+        return self._coins[:self.coin_count]
+
+    @property
+    def alive(self) -> np.ndarray:
+        return self.players['health'] > 0
+
+    def player_index(self, name: str) -> Optional[int]:
+        return self.index.get(name)
+
+    def player_projectiles(self, index: int) -> np.ndarray:
+        row = self._players[index]
+        start = int(row['projectile_start'])
+        return self._projectiles[start:start + int(row['projectile_count'])]
+
+    def distances(self, origin: Tuple[float, float], positions: np.ndarray) -> np.ndarray:
+        return np.hypot(positions[:, 0] - origin[0], positions[:, 1] - origin[1])
+
+    def player_distances(self, origin: Tuple[float, float]) -> np.ndarray:
+        return self.distances(origin, self.players['pos'])
+
+    def coin_distances(self, origin: Tuple[float, float]) -> np.ndarray:
+        return self.distances(origin, self.coins['pos'])
+
+    def nearest_enemy(self, name: str) -> Optional[int]:
+        me = self.index.get(name)
+        if me is None or self.player_count < 2:
+            return None
+
+        d = self.player_distances(self.players['pos'][me])
+        d[me] = np.inf
+        d[~self.alive] = np.inf
+        target = int(np.argmin(d))
+        return None if np.isinf(d[target]) else target
+
+    def nearest_coin(self, origin: Tuple[float, float]) -> Optional[int]:
+        if self.coin_count == 0:
+            return None
+        return int(np.argmin(self.coin_distances(origin)))
+
+    def enemy_projectiles(self, name: str) -> np.ndarray:
+        me = self.index.get(name, -1)
+        projectiles = self.projectiles
+        return projectiles[projectiles['owner'] != me]
@@ -0,0 +1,171 @@
+import json
+from typing import List
+
+from core.game_state import PlayerWeapon
+
+
+class Compact:
+    """
+    (fr) Base des entités compactes : des équivalents à __slots__ des dataclasses
+         de core/, sans __dict__ par instance. L'égalité se fait champ par champ,
+         y compris avec les dataclasses d'origine.
+    (en) Base of the compact entities: __slots__ equivalents of the core/
+         dataclasses, without a per-instance __dict__. Equality is field by
+         field, the original dataclasses included.
+
+    `__dict__` is a read-only view of the fields, so the existing JSON
+    `__str__` helpers (json.dumps(..., default=lambda o: o.__dict__)) work
+    unchanged on compact objects.
+    """
+
+    __slots__ = ()
+
+    @property
+    def __dict__(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __eq__(self, other) -> bool:
+        if not hasattr(other, "__dict__"):
+            return NotImplemented
+        return self.__dict__ == other.__dict__
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+    def __str__(self) -> str:
+        return json.dumps(self.__dict__, default=lambda o: o.__dict__)
+
+
+class CompactPoint(Compact):
+    __slots__ = ("x", "y")
+
+    def __init__(self, x: float = 0.0, y: float = 0.0):
+        self.x = x
+        self.y = y
+
+
+class CompactProjectile(Compact):
+    __slots__ = ("uid", "pos", "dest")
+
+    def __init__(self, uid: str = '', pos: CompactPoint = None, dest: CompactPoint = None):
+        self.uid = uid
+        self.pos = pos if pos is not None else CompactPoint()
+        self.dest = dest if dest is not None else CompactPoint()
+
+
+class CompactBlade(Compact):
+    __slots__ = ("start", "end", "rotation")
+
+    def __init__(self, start: CompactPoint = None, end: CompactPoint = None, rotation: float = 0.0):
+        self.start = start if start is not None else CompactPoint()
+        self.end = end if end is not None else CompactPoint()
+        self.rotation = rotation
+
+
+class CompactCoin(Compact):
+    __slots__ = ("uid", "value", "pos")
+
+    def __init__(self, uid: str = '', value: int = 0, pos: CompactPoint = None):
+        self.uid = uid
+        self.value = value
+        self.pos = pos if pos is not None else CompactPoint()
+
+
+class CompactPlayerInfo(Compact):
+    __slots__ = ("name", "color", "health", "score", "pos", "dest", "playerWeapon", "projectiles", "blade")
+
+    def __init__(self, name: str = '', color: int = 0, health: int = 0, score: int = 0, pos: CompactPoint = None,
+                 dest: CompactPoint = None, playerWeapon: PlayerWeapon = PlayerWeapon.PlayerWeaponNone,
+                 projectiles: List[CompactProjectile] = None, blade: CompactBlade = None):
+        self.name = name
+        self.color = color
+        self.health = health
+        self.score = score
+        self.pos = pos if pos is not None else CompactPoint()
+        self.dest = dest if dest is not None else CompactPoint()
+        self.playerWeapon = playerWeapon
+        self.projectiles = projectiles if projectiles is not None else []
+        self.blade = blade if blade is not None else CompactBlade()
+
+    def isAlive(self) -> bool:
+        return self.health > 0
+
+    def __str__(self) -> str:
+        return json.dumps(self.__dict__, default=lambda o: o.__dict__, indent=4)
+
+
+class EntityPool:
+    """
+    (fr) Réserve d'entités compactes recyclées d'un tick à l'autre.
+    (en) Pool of compact entities recycled from one tick to the next.
+
+    Objects handed out during a tick stay untouched for `generations` ticks
+    (the default 2 lets the bot compare the current GameState with the
+    previous one), then go back to the free lists and are overwritten.
+    Nothing may hold on to pooled entities for longer than that.
+    """
+
+    def __init__(self, generations: int = 2):
+        self.generations = [self._generation() for _ in range(max(generations, 1))]
+        self.free = self._generation()
+        self.allocated = 0
+        self.reused = 0
+
+    @staticmethod
+    def _generation() -> dict:
+        return {CompactPoint: [], CompactProjectile: [], CompactBlade: [], CompactCoin: [], CompactPlayerInfo: []}
+
+    def begin_tick(self) -> None:
+        """Recycles the oldest generation; call once per decoded GameState."""
+        oldest = self.generations.pop(0)
+        for cls, objects in oldest.items():
+            self.free[cls].extend(objects)
+            objects.clear()
+        self.generations.append(oldest)
+
+    def _take(self, cls):
+        free = self.free[cls]
+        if free:
+            obj = free.pop()
+            self.reused += 1
+        else:
+            obj = cls()
+            self.allocated += 1
+        self.generations[-1][cls].append(obj)
+        return obj
+
+    def point(self, x: float, y: float) -> CompactPoint:
+        p = self._take(CompactPoint)
+        p.x = x
+        p.y = y
+        return p
+
+    def projectile(self, uid: str, px: float, py: float, dx: float, dy: float) -> CompactProjectile:
+        projectile = self._take(CompactProjectile)
+        projectile.uid = uid
+        projectile.pos = self.point(px, py)
+        projectile.dest = self.point(dx, dy)
+        return projectile
+
+    def blade(self, sx: float, sy: float, ex: float, ey: float, rotation: float) -> CompactBlade:
+        blade = self._take(CompactBlade)
+        blade.start = self.point(sx, sy)
+        blade.end = self.point(ex, ey)
+        blade.rotation = rotation
+        return blade
+
+    def coin(self, uid: str, value: int, x: float, y: float) -> CompactCoin:
+        coin = self._take(CompactCoin)
+        coin.uid = uid
+        coin.value = value
+        coin.pos = self.point(x, y)
+        return coin
+
+    def player(self) -> CompactPlayerInfo:
+        # The projectile list is reused too; the caller refills it.
+        player = self._take(CompactPlayerInfo)
+        player.projectiles.clear()
+        return player
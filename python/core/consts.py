@@ -2,6 +2,7 @@ class Consts:
     class Game:
 	    TICKS_PER_GAME = 5 * 60 * 3
 	    TICKS_SECONS_STAGE_START = 4 * 60 * 3
+	    TICK_DURATION = 0.3
 
     class Map:
         """
@@ -0,0 +1,190 @@
+import asyncio
+import ssl
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, List, Optional, Union
+
+import websockets
+
+from core.action import Action, MoveAction
+from core.message import MessageType
+from network.decoder import JDISDecoder
+from network.metrics import TickMetrics
+from network.network import Socket
+
+if TYPE_CHECKING:
+    from network.profiler import SlowTickProfiler
+    from network.recorder import FrameRecorder
+
+
+class AsyncSocket(Socket):
+    """
+    asyncio client. Receiving, the bot decision, sending and keepalive run as
+    tasks on one event loop; every send goes through a single lock so pings
+    and actions never interleave. The decision itself runs on a one-thread
+    executor so a slow on_tick cannot stall the loop, and a response that
+    misses `tick_deadline` is replaced by `fallback` instead of being sent
+    late. Until that late decision is done, further states are skipped
+    rather than queued behind it. An exception from the bot or the decoder
+    is printed and drops that message only.
+    """
+
+    def __init__(self, url: str, token: str, decoder: Optional[JDISDecoder] = None,
+                 tick_deadline: Optional[float] = None, initial_backoff: float = 1.0, max_backoff: float = 30.0,
+                 metrics: Optional[TickMetrics] = None, profiler: Optional["SlowTickProfiler"] = None,
+                 recorder: Optional["FrameRecorder"] = None, bot: Optional[object] = None):
+        super().__init__(url, token, decoder, metrics=metrics, profiler=profiler, recorder=recorder, bot=bot)
+        self.tick_deadline = tick_deadline
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.reconnect = True
+        self.late_ticks = 0
+        self.skipped_ticks = 0
+        self.late: Optional[asyncio.Future] = None
+        self.last_response: Optional[List[Action]] = None
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bot")
+        self.send_lock: Optional[asyncio.Lock] = None
+        self.stop_event: Optional[asyncio.Event] = None
+
+
+    def run(self):
+        print(f"Starting bot with base URL: {self.url}, token: {self.token}")
+        asyncio.run(self.run_async())
+
+
+    async def run_async(self) -> None:
+        self.send_lock = asyncio.Lock()
+        self.stop_event = asyncio.Event()
+        backoff = self.initial_backoff
+
+        while not self.stop_event.is_set():
+            try:
+                async with websockets.connect(self.url,
+                                              additional_headers={'Authorization': self.token},
+                                              ssl=self.ssl_context(),
+                                              ping_interval=None,
+                                              max_size=None) as ws:
+                    print("Connection opened")
+                    backoff = self.initial_backoff
+                    await self.session(ws)
+                print("Connection closed")
+            except (OSError, asyncio.TimeoutError, websockets.WebSocketException) as e:
+                print("Error: ", e)
+
+            if not self.reconnect or self.stop_event.is_set():
+                break
+
+            print(f"Reconnecting in {backoff:.1f}s")
+            try:
+                await asyncio.wait_for(self.stop_event.wait(), backoff)
+            except asyncio.TimeoutError:
+                pass
+            backoff = min(backoff * 2, self.max_backoff)
+
+
+    def stop(self) -> None:
+        if self.stop_event is not None:
+            self.stop_event.set()
+
+
+    def ssl_context(self) -> Optional[ssl.SSLContext]:
+        if not self.url.startswith("wss://"):
+            return None
+        context = ssl.create_default_context()
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+        return context
+
+
+    async def session(self, ws) -> None:
+        keepalive = asyncio.create_task(self.keepalive(ws))
+        stopped = asyncio.create_task(self.stop_event.wait())
+        receiver = asyncio.create_task(self.receive(ws))
+        try:
+            await asyncio.wait({receiver, stopped}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in (keepalive, stopped, receiver):
+                task.cancel()
+            await asyncio.gather(keepalive, stopped, receiver, return_exceptions=True)
+            if receiver.done() and not receiver.cancelled() and receiver.exception() is not None:
+                raise receiver.exception()
+
+
+    async def receive(self, ws) -> None:
+        async for message in ws:
+            if isinstance(message, str):
+                continue
+            if self.recorder is not None:
+                self.recorder.record(message)
+            await self.on_message_async(ws, message)
+
+
+    async def on_message_async(self, ws, message: bytes) -> None:
+        start = time.perf_counter()
+        try:
+            response = await self.decide(message)
+        except Exception as e:
+            # Like websocket-client's on_error: a failing message costs its tick, not the connection.
+            print("Error: ", e)
+            response = None
+        if response:
+            with self.metrics.measure("serialize"):
+                data = self.encode_actions(response)
+            send_start = time.perf_counter()
+            await self.send(ws, data)
+            self.metrics.record("send", time.perf_counter() - send_start)
+        self.metrics.record("tick", time.perf_counter() - start)
+
+
+    async def decide(self, message: bytes) -> Optional[List[Action]]:
+        if self.late is not None:
+            if not self.late.done() and message[0] == MessageType.GameState.value:
+                # Latest state wins: this state is dropped rather than queued behind the late decision.
+                self.skipped_ticks += 1
+                return None
+            await asyncio.wait({self.late})
+            self.late = None
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self.executor, self.handle_message, message)
+        if self.tick_deadline is None:
+            return await future
+
+        try:
+            response = await asyncio.wait_for(asyncio.shield(future), self.tick_deadline)
+        except asyncio.TimeoutError:
+            self.late_ticks += 1
+            self.late = future
+            future.add_done_callback(self.late_done)
+            return self.fallback()
+        self.last_response = response
+        return response
+
+
+    def late_done(self, future: asyncio.Future) -> None:
+        # Nobody awaits a late decision's result; its error would otherwise go unreported.
+        if not future.cancelled() and future.exception() is not None:
+            print("Error: ", future.exception())
+
+
+    def fallback(self) -> Optional[List[Action]]:
+        """Actions sent for a tick the bot missed: the last move, so the player keeps its course."""
+        if not self.last_response:
+            return None
+        moves = [action for action in self.last_response if isinstance(action, MoveAction)]
+        return moves or None
+
+
+    async def send(self, ws, data: Union[bytes, bytearray, str]) -> None:
+        # websocket-client's ws.send sends the prefixed actions as a text frame, and the game
+        # server has only ever seen those; websockets would send bytes as a binary frame.
+        if not isinstance(data, str):
+            data = bytes(data).decode('utf-8')
+        async with self.send_lock:
+            await ws.send(data)
+
+
+    async def keepalive(self, ws) -> None:
+        while True:
+            await self.send(ws, 'ping')
+            await asyncio.sleep(self.ping_interval)
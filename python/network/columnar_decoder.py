@@ -0,0 +1,75 @@
+from typing import Optional
+
+import numpy as np
+
+from core.columnar_state import ColumnarGameState, COIN_DTYPE, PROJECTILE_WIRE_DTYPE
+from network.decoder import MemoryViewDecoder, _TICK_HEADER, _PLAYER_HEADER, _POINT, _WEAPON_PROJECTILES, _BLADE, _I32
+
+
+class ColumnarDecoder(MemoryViewDecoder):
+    """
+    Decodes GameState frames into a reusable ColumnarGameState instead of
+    building PlayerInfo/Projectile/Coin objects. Projectile and coin blocks
+    are copied out of the frame with np.frombuffer, one block at a time.
+    """
+
+    def __init__(self, state: Optional[ColumnarGameState] = None):
+        self.state = state if state is not None else ColumnarGameState()
+
+
+    def decode_columnar(self, data: bytes, offset: int = 0) -> ColumnarGameState:
+        raw = data if isinstance(data, (bytes, bytearray)) else bytes(data)
+        view = memoryview(raw)
+        s = self.state
+
+        s.current_tick, s.current_round, player_size = _TICK_HEADER.unpack_from(view, offset)
+        offset += _TICK_HEADER.size
+
+        s.reset(player_size)
+        players = s.players
+        for i in range(player_size):
+            end_index = raw.find(b'\0', offset)
+            name = raw[offset:end_index].decode('utf-8')
+            s.names.append(name)
+            s.index[name] = i
+            offset = end_index + 1
+
+            row = players[i]
+            row['color'], row['health'], row['score'], x, y, has_dest = _PLAYER_HEADER.unpack_from(view, offset)
+            row['pos'] = (x, y)
+            row['has_dest'] = has_dest
+            offset += _PLAYER_HEADER.size
+
+            if has_dest:
+                row['dest'] = _POINT.unpack_from(view, offset)
+                offset += 16
+            else:
+                row['dest'] = (x, y)
+
+            row['weapon'], projectile_size = _WEAPON_PROJECTILES.unpack_from(view, offset)
+            offset += _WEAPON_PROJECTILES.size
+
+            row['projectile_start'] = s.projectile_count
+            row['projectile_count'] = projectile_size
+            if projectile_size:
+                block = np.frombuffer(raw, dtype=PROJECTILE_WIRE_DTYPE, count=projectile_size, offset=offset)
+                table = s.reserve_projectiles(projectile_size)
+                table['uid'] = block['uid']
+                table['pos'] = block['pos']
+                table['dest'] = block['dest']
+                table['owner'] = i
+                offset += projectile_size * PROJECTILE_WIRE_DTYPE.itemsize
+
+            sx, sy, ex, ey, row['blade_rotation'] = _BLADE.unpack_from(view, offset)
+            row['blade_start'] = (sx, sy)
+            row['blade_end'] = (ex, ey)
+            offset += _BLADE.size
+
+        coin_size = _I32.unpack_from(view, offset)[0]
+        offset += 4
+
+        s.reserve_coins(coin_size)
+        if coin_size:
+            s.coins[:] = np.frombuffer(raw, dtype=COIN_DTYPE, count=coin_size, offset=offset)
+
+        return s
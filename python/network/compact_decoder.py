@@ -0,0 +1,90 @@
+from typing import Optional, Tuple
+
+from core.compact import CompactBlade, CompactCoin, CompactPlayerInfo, CompactPoint, CompactProjectile, EntityPool
+from core.game_state import GameState, PlayerWeapon
+from network.decoder import (MemoryViewDecoder, format_uuid, _I32, _POINT, _TICK_HEADER, _PLAYER_HEADER,
+                             _WEAPON_PROJECTILES, _PROJECTILE, _BLADE, _COIN)
+
+
+_WEAPONS = {weapon.value: weapon for weapon in PlayerWeapon}
+
+
+class CompactDecoder(MemoryViewDecoder):
+    """
+    MemoryViewDecoder producing the __slots__ entities of core/compact.py.
+    Given an EntityPool, entities are recycled between ticks instead of
+    allocated (see EntityPool for how long a GameState stays valid).
+    """
+
+    def __init__(self, pool: Optional[EntityPool] = None):
+        self.pool = pool
+
+
+    def _decode_player(self, raw: bytes, view: memoryview, offset: int) -> Tuple[CompactPlayerInfo, int]:
+        end_index = raw.find(b'\0', offset)
+        name = raw[offset:end_index].decode('utf-8')
+        offset = end_index + 1
+
+        color, health, score, x, y, has_dest = _PLAYER_HEADER.unpack_from(view, offset)
+        offset += _PLAYER_HEADER.size
+
+        if has_dest:
+            dx, dy = _POINT.unpack_from(view, offset)
+            offset += 16
+        else:
+            dx = dy = 0.0
+
+        weapon, projectile_size = _WEAPON_PROJECTILES.unpack_from(view, offset)
+        offset += _WEAPON_PROJECTILES.size
+        projectiles = _PROJECTILE.iter_unpack(view[offset:offset + projectile_size * _PROJECTILE.size])
+        offset += projectile_size * _PROJECTILE.size
+        blade = _BLADE.unpack_from(view, offset)
+        offset += _BLADE.size
+
+        pool = self.pool
+        if pool is None:
+            sx, sy, ex, ey, rotation = blade
+            p = CompactPlayerInfo(
+                name, color, health, score, CompactPoint(x, y), CompactPoint(dx, dy), _WEAPONS[weapon],
+                [CompactProjectile(format_uuid(uid), CompactPoint(px, py), CompactPoint(qx, qy))
+                 for uid, px, py, qx, qy in projectiles],
+                CompactBlade(CompactPoint(sx, sy), CompactPoint(ex, ey), rotation),
+            )
+            return p, offset
+
+        p = pool.player()
+        p.name, p.color, p.health, p.score = name, color, health, score
+        p.pos = pool.point(x, y)
+        p.dest = pool.point(dx, dy)
+        p.playerWeapon = _WEAPONS[weapon]
+        p.projectiles.extend(pool.projectile(format_uuid(uid), px, py, qx, qy) for uid, px, py, qx, qy in projectiles)
+        p.blade = pool.blade(*blade)
+        return p, offset
+
+
+    def decode_game_state(self, data: bytes, offset: int = 0) -> GameState:
+        raw = data if isinstance(data, (bytes, bytearray)) else bytes(data)
+        view = memoryview(raw)
+        pool = self.pool
+        if pool is not None:
+            pool.begin_tick()
+
+        g = GameState()
+        g.current_tick, g.current_round, player_size = _TICK_HEADER.unpack_from(view, offset)
+        offset += _TICK_HEADER.size
+
+        g.players = []
+        for _ in range(player_size):
+            player, offset = self._decode_player(raw, view, offset)
+            g.players.append(player)
+
+        coin_size = _I32.unpack_from(view, offset)[0]
+        offset += 4
+
+        coins = _COIN.iter_unpack(view[offset:offset + coin_size * _COIN.size])
+        if pool is not None:
+            g.coins = [pool.coin(format_uuid(uid), value, x, y) for uid, x, y, value in coins]
+        else:
+            g.coins = [CompactCoin(format_uuid(uid), value, CompactPoint(x, y)) for uid, x, y, value in coins]
+
+        return g
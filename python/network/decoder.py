@@ -151,3 +151,128 @@ class JDISDecoder:
             g.coins.append(coin)
 
         return g
+
+
+def format_uuid(raw: bytes) -> str:
+    h = raw.hex()
+    return f'{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}'
+
+
+_U8 = struct.Struct('<B')
+_I32 = struct.Struct('<i')
+_POINT = struct.Struct('<dd')
+_TICK_HEADER = struct.Struct('<ibi')
+_PLAYER_HEADER = struct.Struct('<iiqdd?')
+_WEAPON_PROJECTILES = struct.Struct('<Bi')
+_PROJECTILE = struct.Struct('<16sdddd')
+_BLADE = struct.Struct('<ddddd')
+_COIN = struct.Struct('<16sddi')
+
+
+class MemoryViewDecoder(JDISDecoder):
+    """
+    Decodes frames through a single memoryview with absolute offsets and
+    precompiled structs, so no call ever copies the remainder of the frame.
+    Produces the same MapState/GameState objects as JDISDecoder and is meant
+    to be kept alive across messages.
+
+    One deliberate difference: JDISDecoder.decode_colliders reads point i of
+    every collider at byte i * 16 of the payload, whatever the collider's
+    offset, so it returns the map header bytes as wall positions. Here the
+    points are read where they are, after the collider's size byte. The two
+    only agree on maps sent without colliders.
+    """
+
+    def decode_map_state(self, data: bytes, offset: int = 0) -> MapState:
+        view = memoryview(data)
+        m = MapState()
+        m.size = _U8.unpack_from(view, offset)[0]
+        m.spawns = []
+        m.walls = []
+
+        row = struct.Struct('<' + 'B' * m.size)
+        offset += 1
+        m.discrete_grid = [list(row.unpack_from(view, offset + i * m.size)) for i in range(m.size)]
+        offset += m.size * m.size
+
+        walls_len = _I32.unpack_from(view, offset)[0]
+        offset += 4
+        for _ in range(walls_len):
+            pos_size = _U8.unpack_from(view, offset)[0]
+            offset += 1
+
+            c = Collider()
+            for _ in range(pos_size):
+                x, y = _POINT.unpack_from(view, offset)
+                c.positions.append(Point(x, y))
+                offset += 16
+            c.collider_type = ColliderType(_U8.unpack_from(view, offset)[0])
+            offset += 1
+
+            m.walls.append(c)
+
+        m.save = bytearray(view[offset: offset + 100])
+
+        return m
+
+
+    def decode_player_info(self, data: bytes, offset: int = 0) -> Tuple[PlayerInfo, int]:
+        raw = data if isinstance(data, (bytes, bytearray)) else bytes(data)
+        return self._decode_player(raw, memoryview(raw), offset)
+
+
+    def _decode_player(self, raw: bytes, view: memoryview, offset: int) -> Tuple[PlayerInfo, int]:
+        p = PlayerInfo()
+
+        end_index = raw.find(b'\0', offset)
+        p.name = raw[offset:end_index].decode('utf-8')
+        offset = end_index + 1
+
+        p.color, p.health, p.score, x, y, has_dest = _PLAYER_HEADER.unpack_from(view, offset)
+        p.pos = Point(x, y)
+        offset += _PLAYER_HEADER.size
+
+        if has_dest:
+            p.dest = Point(*_POINT.unpack_from(view, offset))
+            offset += 16
+
+        weapon, projectile_size = _WEAPON_PROJECTILES.unpack_from(view, offset)
+        p.playerWeapon = PlayerWeapon(weapon)
+        offset += _WEAPON_PROJECTILES.size
+
+        p.projectiles = []
+        for _ in range(projectile_size):
+            uid, px, py, dx, dy = _PROJECTILE.unpack_from(view, offset)
+            p.projectiles.append(Projectile(format_uuid(uid), Point(px, py), Point(dx, dy)))
+            offset += _PROJECTILE.size
+
+        sx, sy, ex, ey, rotation = _BLADE.unpack_from(view, offset)
+        p.blade = Blade(Point(sx, sy), Point(ex, ey), rotation)
+        offset += _BLADE.size
+
+        return p, offset
+
+
+    def decode_game_state(self, data: bytes, offset: int = 0) -> GameState:
+        raw = data if isinstance(data, (bytes, bytearray)) else bytes(data)
+        view = memoryview(raw)
+
+        g = GameState()
+        g.current_tick, g.current_round, player_size = _TICK_HEADER.unpack_from(view, offset)
+        offset += _TICK_HEADER.size
+
+        g.players = []
+        for _ in range(player_size):
+            player, offset = self._decode_player(raw, view, offset)
+            g.players.append(player)
+
+        coin_size = _I32.unpack_from(view, offset)[0]
+        offset += 4
+
+        g.coins = []
+        for _ in range(coin_size):
+            uid, x, y, value = _COIN.unpack_from(view, offset)
+            g.coins.append(Coin(format_uuid(uid), value, Point(x, y)))
+            offset += _COIN.size
+
+        return g
@@ -0,0 +1,68 @@
+import uuid
+
+from core.game_state import GameState, PlayerInfo
+from core.map_state import MapState, Point
+from core.message import MessageType
+from network.decoder import _U8, _I32, _POINT, _TICK_HEADER, _PLAYER_HEADER, _WEAPON_PROJECTILES, _PROJECTILE, _BLADE, _COIN
+
+
+SAVE_SIZE = 100
+
+
+def uuid_bytes(uid: str) -> bytes:
+    return uuid.UUID(uid).bytes if uid else bytes(16)
+
+
+class JDISEncoder:
+    """
+    Inverse of JDISDecoder: builds the wire frames the server sends. A player
+    whose `dest` is the default Point() is encoded without a destination,
+    which is also what decoding such a frame gives back.
+    """
+
+    def encode_map_state(self, m: MapState) -> bytes:
+        out = bytearray(_U8.pack(m.size))
+        for row in m.discrete_grid:
+            out += bytes(row)
+
+        out += _I32.pack(len(m.walls))
+        for wall in m.walls:
+            out += _U8.pack(len(wall.positions))
+            for position in wall.positions:
+                out += _POINT.pack(position.x, position.y)
+            out += _U8.pack(wall.collider_type)
+
+        out += bytes(m.save[:SAVE_SIZE]).ljust(SAVE_SIZE, b'\0')
+        return bytes(out)
+
+
+    def encode_player_info(self, p: PlayerInfo, out: bytearray) -> None:
+        out += p.name.encode('utf-8') + b'\0'
+
+        has_dest = p.dest != Point()
+        out += _PLAYER_HEADER.pack(p.color, p.health, p.score, p.pos.x, p.pos.y, has_dest)
+        if has_dest:
+            out += _POINT.pack(p.dest.x, p.dest.y)
+
+        out += _WEAPON_PROJECTILES.pack(p.playerWeapon, len(p.projectiles))
+        for projectile in p.projectiles:
+            out += _PROJECTILE.pack(uuid_bytes(projectile.uid), projectile.pos.x, projectile.pos.y,
+                                    projectile.dest.x, projectile.dest.y)
+
+        out += _BLADE.pack(p.blade.start.x, p.blade.start.y, p.blade.end.x, p.blade.end.y, p.blade.rotation)
+
+
+    def encode_game_state(self, g: GameState) -> bytes:
+        out = bytearray(_TICK_HEADER.pack(g.current_tick, g.current_round, len(g.players)))
+        for player in g.players:
+            self.encode_player_info(player, out)
+
+        out += _I32.pack(len(g.coins))
+        for coin in g.coins:
+            out += _COIN.pack(uuid_bytes(coin.uid), coin.pos.x, coin.pos.y, coin.value)
+        return bytes(out)
+
+
+    def encode_message(self, message_type: MessageType, payload: bytes = b'') -> bytes:
+        """Prefixes a payload with its message type byte, as received by Socket.on_message."""
+        return bytes([message_type.value]) + payload
@@ -0,0 +1,147 @@
+from functools import cached_property
+from typing import List, Tuple
+
+from core.game_state import PlayerInfo, PlayerWeapon, Projectile, Blade, GameState, Coin
+from core.map_state import Point
+from network.decoder import (MemoryViewDecoder, format_uuid, _I32, _POINT, _TICK_HEADER, _PLAYER_HEADER,
+                             _WEAPON_PROJECTILES, _PROJECTILE, _BLADE, _COIN)
+
+
+class LazyPlayerInfo(PlayerInfo):
+    """
+    PlayerInfo whose `dest`, `projectiles` and `blade` are decoded from the
+    frame on first access (then cached like regular attributes). Name,
+    color, health, score, position and weapon are decoded up front.
+    """
+
+    __slots__ = ("_view", "_dest_offset", "_projectile_offset", "projectile_count", "_blade_offset")
+
+    def __init__(self, view: memoryview, name: str, color: int, health: int, score: int, pos: Point,
+                 weapon: PlayerWeapon, dest_offset: int, projectile_offset: int, projectile_count: int,
+                 blade_offset: int):
+        self.name = name
+        self.color = color
+        self.health = health
+        self.score = score
+        self.pos = pos
+        self.playerWeapon = weapon
+        self._view = view
+        self._dest_offset = dest_offset
+        self._projectile_offset = projectile_offset
+        self.projectile_count = projectile_count
+        self._blade_offset = blade_offset
+
+    @cached_property
+    def dest(self) -> Point:
+        if self._dest_offset < 0:
+            return Point()
+        return Point(*_POINT.unpack_from(self._view, self._dest_offset))
+
+    @cached_property
+    def projectiles(self) -> List[Projectile]:
+        projectiles = []
+        for uid, px, py, dx, dy in _PROJECTILE.iter_unpack(
+                self._view[self._projectile_offset:self._projectile_offset + self.projectile_count * _PROJECTILE.size]):
+            projectiles.append(Projectile(format_uuid(uid), Point(px, py), Point(dx, dy)))
+        return projectiles
+
+    @cached_property
+    def blade(self) -> Blade:
+        sx, sy, ex, ey, rotation = _BLADE.unpack_from(self._view, self._blade_offset)
+        return Blade(Point(sx, sy), Point(ex, ey), rotation)
+
+    def materialize(self) -> PlayerInfo:
+        return PlayerInfo(self.name, self.color, self.health, self.score, self.pos, self.dest,
+                          self.playerWeapon, self.projectiles, self.blade)
+
+    def __str__(self) -> str:
+        return str(self.materialize())
+
+
+class LazyCoin(Coin):
+    """Coin whose `uid` string is only formatted when accessed."""
+
+    __slots__ = ("_raw_uid",)
+
+    def __init__(self, raw_uid: bytes, value: int, pos: Point):
+        self._raw_uid = raw_uid
+        self.value = value
+        self.pos = pos
+
+    @cached_property
+    def uid(self) -> str:
+        return format_uuid(self._raw_uid)
+
+    def __str__(self) -> str:
+        return str(Coin(self.uid, self.value, self.pos))
+
+
+class LazyGameState(GameState):
+    def materialize(self) -> GameState:
+        return GameState(self.current_tick, self.current_round, [p.materialize() for p in self.players],
+                         [Coin(c.uid, c.value, c.pos) for c in self.coins])
+
+    def __str__(self) -> str:
+        return str(self.materialize())
+
+
+class LazyDecoder(MemoryViewDecoder):
+    """
+    Indexes a GameState frame in one pass, recording where each player's
+    destination, projectile block and blade are, and decodes those only when
+    the bot reads them. Projectile and coin UUIDs are formatted on access too.
+
+    This only pays off for bots that leave those fields alone on most ticks.
+    MyBot does not: WallLearner reads every destination every tick and
+    ThreatForecaster every projectile whenever the bot moves, so with MyBot
+    the lazy fields are all decoded anyway, one by one, which is slower than
+    eager decoding once players carry projectiles (see the lazy+proj row of
+    bench_decoder.py).
+    """
+
+    def _index_player(self, raw: bytes, view: memoryview, offset: int) -> Tuple[LazyPlayerInfo, int]:
+        end_index = raw.find(b'\0', offset)
+        name = raw[offset:end_index].decode('utf-8')
+        offset = end_index + 1
+
+        color, health, score, x, y, has_dest = _PLAYER_HEADER.unpack_from(view, offset)
+        offset += _PLAYER_HEADER.size
+
+        dest_offset = -1
+        if has_dest:
+            dest_offset = offset
+            offset += _POINT.size
+
+        weapon, projectile_count = _WEAPON_PROJECTILES.unpack_from(view, offset)
+        offset += _WEAPON_PROJECTILES.size
+        projectile_offset = offset
+        offset += projectile_count * _PROJECTILE.size
+
+        player = LazyPlayerInfo(view, name, color, health, score, Point(x, y), PlayerWeapon(weapon),
+                                dest_offset, projectile_offset, projectile_count, offset)
+        return player, offset + _BLADE.size
+
+
+    def decode_game_state(self, data: bytes, offset: int = 0) -> LazyGameState:
+        raw = data if isinstance(data, (bytes, bytearray)) else bytes(data)
+        # Lazy fields read the frame later, so a bytearray the caller may reuse is copied once.
+        if isinstance(raw, bytearray):
+            raw = bytes(raw)
+        view = memoryview(raw)
+
+        g = LazyGameState()
+        g.current_tick, g.current_round, player_size = _TICK_HEADER.unpack_from(view, offset)
+        offset += _TICK_HEADER.size
+
+        g.players = []
+        for _ in range(player_size):
+            player, offset = self._index_player(raw, view, offset)
+            g.players.append(player)
+
+        coin_size = _I32.unpack_from(view, offset)[0]
+        offset += 4
+
+        g.coins = [LazyCoin(uid, value, Point(x, y))
+                   for uid, x, y, value in _COIN.iter_unpack(view[offset:offset + coin_size * _COIN.size])]
+
+        return g
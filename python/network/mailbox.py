@@ -0,0 +1,72 @@
+import struct
+import threading
+from collections import deque
+from typing import Deque, Optional
+
+from core.message import MessageType
+
+
+_TICK = struct.Struct('<i')
+
+
+def frame_tick(message: bytes) -> int:
+    """current_tick of a raw GameState frame, read without decoding the rest."""
+    return _TICK.unpack_from(message, 1)[0]
+
+
+class TickMailbox:
+    """
+    Latest-state-wins mailbox between the receiver and the decision worker.
+
+    A GameState frame replaces any GameState still waiting, so the worker
+    always gets the newest tick. GameStart and GameEnd frames are never
+    dropped and keep their order relative to the states around them.
+    """
+
+    def __init__(self):
+        self.pending: Deque[bytes] = deque()
+        self.condition = threading.Condition()
+        self.closed = False
+        self.superseded = 0
+        self.stale = 0
+        self.skipped_ticks = 0
+        self.last_tick: Optional[int] = None
+
+    def put(self, message: bytes) -> None:
+        with self.condition:
+            if message[0] == MessageType.GameState.value and self.pending \
+                    and self.pending[-1][0] == MessageType.GameState.value:
+                self.pending[-1] = message
+                self.superseded += 1
+            else:
+                self.pending.append(message)
+            self.condition.notify()
+
+    def get(self, timeout: Optional[float] = None) -> Optional[bytes]:
+        """Next frame to act on, or None once closed (or on timeout)."""
+        with self.condition:
+            while True:
+                while not self.pending:
+                    if self.closed or not self.condition.wait(timeout):
+                        return None
+
+                message = self.pending.popleft()
+                if message[0] != MessageType.GameState.value:
+                    if message[0] == MessageType.GameStart.value:
+                        self.last_tick = None
+                    return message
+
+                tick = frame_tick(message)
+                if self.last_tick is not None and tick <= self.last_tick:
+                    self.stale += 1
+                    continue
+
+                if self.last_tick is not None:
+                    self.skipped_ticks += tick - self.last_tick - 1
+                self.last_tick = tick
+                return message
+
+    def close(self) -> None:
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
@@ -0,0 +1,94 @@
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Iterator, Optional
+
+
+PHASES = ("dispatch", "decode", "on_tick", "serialize", "send", "tick")
+
+
+class TickMetrics:
+    """
+    Per-phase tick timings over a rolling window. Phases are `dispatch`
+    (message handling outside decode/on_tick), `decode`, `on_tick`,
+    `serialize`, `send` and `tick` (the whole message, receive to send).
+
+    When `report_every` is set, a summary is printed (or written to
+    `path` as JSON) every that many ticks. `startup`, when set (see
+    network/startup.py), is included in the JSON summary.
+    """
+
+    def __init__(self, window: int = 1000, report_every: Optional[int] = None, path: Optional[str] = None):
+        self.window = window
+        self.samples: Dict[str, Deque[float]] = {phase: deque(maxlen=window) for phase in PHASES}
+        self.counts: Dict[str, int] = {phase: 0 for phase in PHASES}
+        self.last_tick: Optional[int] = None
+        self.ticks = 0
+        self.report_every = report_every
+        self.path = path
+        self.startup: Optional[dict] = None
+        # record() may run on the decision thread while summary() runs elsewhere.
+        self.lock = threading.Lock()
+
+    def record(self, phase: str, seconds: float) -> None:
+        with self.lock:
+            if phase not in self.samples:
+                self.samples[phase] = deque(maxlen=self.window)
+                self.counts[phase] = 0
+            self.samples[phase].append(seconds)
+            self.counts[phase] += 1
+
+    @contextmanager
+    def measure(self, phase: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(phase, time.perf_counter() - start)
+
+    def tick_done(self, current_tick: int) -> None:
+        self.last_tick = current_tick
+        self.ticks += 1
+        if self.report_every and self.ticks % self.report_every == 0:
+            self.report()
+
+    def summary(self) -> dict:
+        with self.lock:
+            snapshot = {phase: (list(samples), self.counts[phase]) for phase, samples in self.samples.items()}
+
+        phases = {}
+        for phase, (samples, count) in snapshot.items():
+            if not samples:
+                continue
+            ordered = sorted(samples)
+            n = len(ordered)
+            phases[phase] = {
+                "count": count,
+                "p50_ms": ordered[int(0.50 * (n - 1))] * 1000,
+                "p99_ms": ordered[int(0.99 * (n - 1))] * 1000,
+                "max_ms": ordered[-1] * 1000,
+            }
+        summary = {"last_tick": self.last_tick, "ticks": self.ticks, "phases": phases}
+        if self.startup is not None:
+            summary["startup"] = self.startup
+        return summary
+
+    def format_summary(self) -> str:
+        summary = self.summary()
+        lines = [f"tick {summary['last_tick']} ({summary['ticks']} processed)"]
+        for phase, stats in summary["phases"].items():
+            lines.append(f"  {phase:<10} p50 {stats['p50_ms']:8.3f} ms  p99 {stats['p99_ms']:8.3f} ms  "
+                         f"max {stats['max_ms']:8.3f} ms  n={stats['count']}")
+        return "\n".join(lines)
+
+    def dump(self, path: str) -> None:
+        with open(path, "w") as f:
+            json.dump(self.summary(), f, indent=4)
+
+    def report(self) -> None:
+        if self.path:
+            self.dump(self.path)
+        else:
+            print(self.format_summary())
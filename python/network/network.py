@@ -3,20 +3,40 @@ import json
 import ssl
 import threading
 import time
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional
 
-from src.bot import MyBot
 from core.message import MessageType
 from core.action import Action
-from network.decoder import JDISDecoder
+from core.game_state import GameState
+from core.map_state import MapState
+from network.decoder import JDISDecoder, MemoryViewDecoder
+from network.mailbox import TickMailbox
+from network.metrics import TickMetrics
+
+if TYPE_CHECKING:
+    # Only imported by run_bot.py when --profile / --record ask for them.
+    from network.profiler import SlowTickProfiler
+    from network.recorder import FrameRecorder
 
 
 class Socket:  
-    def __init__(self, url: str, token: str):
+    def __init__(self, url: str, token: str, decoder: Optional[JDISDecoder] = None, pipeline: bool = False,
+                 metrics: Optional[TickMetrics] = None, profiler: Optional["SlowTickProfiler"] = None,
+                 recorder: Optional["FrameRecorder"] = None, bot: Optional[object] = None):
         self.url = url
         self.token = token
-        self.bot = MyBot()
+        if bot is None:
+            # Imported here so tools that bring their own bot skip the bot's imports.
+            from src.bot import MyBot
+            bot = MyBot()
+        self.bot = bot
+        self.decoder = decoder if decoder is not None else MemoryViewDecoder()
         self.ping_interval = 1
+        self.send_lock = threading.Lock()
+        self.mailbox = TickMailbox() if pipeline else None
+        self.metrics = metrics if metrics is not None else TickMetrics()
+        self.profiler = profiler
+        self.recorder = recorder
 
         
     def run(self):
@@ -36,18 +56,39 @@ class Socket:
 
 
     def handle_message(self, message: bytes) -> Optional[List[Action]]:
+        if self.profiler is None:
+            return self.dispatch(message)
+
+        self.profiler.begin()
+        try:
+            return self.dispatch(message)
+        finally:
+            message_type = int(message[0])
+            self.profiler.end(self.metrics.last_tick if message_type == MessageType.GameState.value
+                              else f"type{message_type}")
+
+
+    def dispatch(self, message: bytes) -> Optional[List[Action]]:
+        start = time.perf_counter()
         message_type = int(message[0])
         response = None
-
-        decoder = JDISDecoder()
+        decode = decide = 0.0
 
         if message_type == MessageType.GameStart.value:
-            map_state = decoder.decode_map_state(message[1:])
+            map_state = self.decode_map_state(message)
             self.bot.on_start(map_state)
 
         elif message_type == MessageType.GameState.value:
-            game_state = decoder.decode_game_state(message[1:])
+            t0 = time.perf_counter()
+            game_state = self.decode_game_state(message)
+            t1 = time.perf_counter()
             response = self.bot.on_tick(game_state)
+            t2 = time.perf_counter()
+
+            decode, decide = t1 - t0, t2 - t1
+            self.metrics.record("decode", decode)
+            self.metrics.record("on_tick", decide)
+            self.metrics.tick_done(game_state.current_tick)
 
         elif message_type == MessageType.GameState.GameEnd.value:
             self.bot.on_end()
@@ -55,18 +96,43 @@ class Socket:
         else:
             print("Unknown message type")
 
+        self.metrics.record("dispatch", time.perf_counter() - start - decode - decide)
         return response
 
 
+    def decode_map_state(self, message: bytes) -> MapState:
+        if isinstance(self.decoder, MemoryViewDecoder):
+            return self.decoder.decode_map_state(message, 1)
+        return self.decoder.decode_map_state(bytes(message[1:]))
+
+
+    def decode_game_state(self, message: bytes) -> GameState:
+        if isinstance(self.decoder, MemoryViewDecoder):
+            return self.decoder.decode_game_state(message, 1)
+        return self.decoder.decode_game_state(bytes(message[1:]))
+
+
     def on_open(self, ws: websocket.WebSocketApp) -> None:
         print("Connection opened")
         self.start_ping_thread(ws)
+        if self.mailbox is not None:
+            self.start_decision_thread(ws)
         
 
     def on_message(self, ws: websocket.WebSocketApp, message: bytes) -> None:
+        if self.recorder is not None and isinstance(message, bytes):
+            self.recorder.record(message)
+
+        if self.mailbox is not None:
+            if isinstance(message, bytes):
+                self.mailbox.put(message)
+            return
+
+        start = time.perf_counter()
         response = self.handle_message(message)
         if response:
             self.send_message(ws, response)
+        self.metrics.record("tick", time.perf_counter() - start)
         
 
     def on_error(self, ws: websocket.WebSocketApp, error: str) -> None:
@@ -75,9 +141,19 @@ class Socket:
 
     def on_close(self, ws: websocket.WebSocketApp, close_status_code, close_msg) -> None:
         print("Connection closed")
+        if self.mailbox is not None:
+            self.mailbox.close()
+            print(f"Dropped ticks: {self.mailbox.skipped_ticks} (superseded frames: {self.mailbox.superseded})")
         
 
     def send_message(self, ws: websocket.WebSocketApp, actions: List[Action]) -> None:
+        with self.metrics.measure("serialize"):
+            data = self.encode_actions(actions)
+        with self.metrics.measure("send"), self.send_lock:
+            ws.send(data)
+
+
+    def encode_actions(self, actions: List[Action]) -> bytearray:
         json_reponse = {}
         for action in actions:
             try:
@@ -88,8 +164,7 @@ class Socket:
         json_message = json.dumps(json_reponse)
 
         # print(f"Sending message: {json_message}")
-        prefixed_message = bytearray([3]) + json_message.encode('utf-8')
-        ws.send(prefixed_message)
+        return bytearray([3]) + json_message.encode('utf-8')
 
 
     def start_ping_thread(self, ws: websocket.WebSocketApp) -> None:
@@ -100,6 +175,26 @@ class Socket:
 
     def ping(self, ws: websocket.WebSocketApp) -> None:
         while ws.keep_running:
-            ws.send('ping')
+            with self.send_lock:
+                ws.send('ping')
             time.sleep(self.ping_interval)
+
+
+    def start_decision_thread(self, ws: websocket.WebSocketApp) -> None:
+        decision_thread = threading.Thread(target=self.decide, args=(ws,))
+        decision_thread.daemon = True
+        decision_thread.start()
+
+
+    def decide(self, ws: websocket.WebSocketApp) -> None:
+        while True:
+            message = self.mailbox.get()
+            if message is None:
+                return
+
+            start = time.perf_counter()
+            response = self.handle_message(message)
+            if response:
+                self.send_message(ws, response)
+            self.metrics.record("tick", time.perf_counter() - start)
     
\ No newline at end of file
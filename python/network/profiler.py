@@ -0,0 +1,127 @@
+import gc
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import List, Optional, Tuple
+
+
+class SlowTickProfiler:
+    """
+    Sampling profiler for the decode/on_tick cycle. While a tick is running, a
+    background thread samples the ticking thread's call stack every
+    `interval` seconds. A collection holds the GIL until it is over, so the
+    sampler never runs during one: collections on the ticking thread are
+    timed from the `gc.callbacks` hooks instead and counted as a
+    `[gc genN]` frame on top of the stack that triggered them, one sample
+    per `interval` of pause (the tick's total is kept in `gc_time`).
+    Samples are thrown away unless the tick took longer than `threshold`
+    seconds, in which case they are written to `directory` as collapsed
+    stacks (`frame;frame;frame count`), the input format of flamegraph.pl,
+    speedscope and inferno.
+
+    The interpreter switch interval is lowered to `interval` during a tick so
+    the sampler thread actually gets the GIL that often.
+    """
+
+    def __init__(self, directory: str, threshold: float = 0.15, interval: float = 0.001):
+        self.directory = directory
+        self.threshold = threshold
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self.target: Optional[int] = None
+        self.started = 0.0
+        self.active = threading.Event()
+        self.lock = threading.Lock()
+        self.gc_start: Optional[Tuple[float, str]] = None
+        self.gc_pauses: List[Tuple[str, float]] = []
+        self.gc_time = 0.0
+        self.slow_ticks = 0
+        self.ticks = 0
+        self.switch_interval = sys.getswitchinterval()
+
+        os.makedirs(directory, exist_ok=True)
+        gc.callbacks.append(self._on_gc)
+        self.sampler = threading.Thread(target=self._sample, name="tick-profiler", daemon=True)
+        self.sampler.start()
+
+
+    def begin(self) -> None:
+        with self.lock:
+            self.samples.clear()
+            self.gc_pauses = []
+            self.target = threading.get_ident()
+            self.started = time.perf_counter()
+        sys.setswitchinterval(self.interval)
+        self.active.set()
+
+
+    def end(self, label) -> Optional[str]:
+        """Stops sampling the current tick. Returns the written file, if the tick was slow."""
+        self.active.clear()
+        duration = time.perf_counter() - self.started
+        sys.setswitchinterval(self.switch_interval)
+        self.ticks += 1
+        pauses, self.gc_pauses = self.gc_pauses, []
+        self.gc_time = sum(pause for _, pause in pauses)
+        if duration < self.threshold:
+            return None
+
+        with self.lock:
+            samples, self.samples = self.samples, Counter()
+        for stack, pause in pauses:
+            samples[stack] += max(1, round(pause / self.interval))
+
+        self.slow_ticks += 1
+        path = os.path.join(self.directory, f"tick-{label}-{duration * 1000:.0f}ms.folded")
+        with open(path, "w") as f:
+            for stack, count in samples.most_common():
+                f.write(f"{stack} {count}\n")
+        return path
+
+
+    def close(self) -> None:
+        self.active.clear()
+        sys.setswitchinterval(self.switch_interval)
+        if self._on_gc in gc.callbacks:
+            gc.callbacks.remove(self._on_gc)
+
+
+    def _on_gc(self, phase: str, info: dict) -> None:
+        # Runs on the collecting thread, which holds the GIL from "start" to "stop".
+        if not self.active.is_set() or threading.get_ident() != self.target:
+            return
+        if phase == "start":
+            self.gc_start = (time.perf_counter(), self._stack(sys._getframe(1)))
+        elif self.gc_start is not None:
+            started, stack = self.gc_start
+            self.gc_start = None
+            self.gc_pauses.append((f"{stack};[gc gen{info['generation']}]", time.perf_counter() - started))
+
+
+    @staticmethod
+    def _stack(frame) -> str:
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+            frame = frame.f_back
+        stack.reverse()
+        return ";".join(stack)
+
+
+    def _sample(self) -> None:
+        while True:
+            self.active.wait()
+            time.sleep(self.interval)
+            if not self.active.is_set():
+                continue
+
+            frame = sys._current_frames().get(self.target)
+            if frame is None:
+                continue
+
+            stack = self._stack(frame)
+            with self.lock:
+                self.samples[stack] += 1
@@ -0,0 +1,70 @@
+import mmap
+import struct
+import time
+from typing import Iterator, Tuple
+
+
+MAGIC = b'JDISREC1'
+_RECORD = struct.Struct('<dI')
+
+
+class FrameRecorder:
+    """
+    Append-only log of raw server frames. After an 8-byte magic header each
+    record is `<dI` (receive timestamp, frame length) followed by the frame,
+    message type byte included.
+    """
+
+    def __init__(self, path: str, flush_every: int = 1):
+        self.path = path
+        self.flush_every = flush_every
+        self.frames = 0
+        self.file = open(path, 'ab')
+        if self.file.tell() == 0:
+            self.file.write(MAGIC)
+
+    def record(self, message: bytes, timestamp: float = None) -> None:
+        if timestamp is None:
+            timestamp = time.time()
+        self.file.write(_RECORD.pack(timestamp, len(message)))
+        self.file.write(message)
+        self.frames += 1
+        if self.frames % self.flush_every == 0:
+            self.file.flush()
+
+    def close(self) -> None:
+        self.file.close()
+
+
+class FrameLog:
+    """Memory-mapped reader for a FrameRecorder log. Frames are zero-copy memoryviews."""
+
+    def __init__(self, path: str):
+        self.file = open(path, 'rb')
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.map[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a frame log")
+        self.view = memoryview(self.map)
+
+    def __iter__(self) -> Iterator[Tuple[float, memoryview]]:
+        offset = len(MAGIC)
+        end = len(self.view)
+        while offset + _RECORD.size <= end:
+            timestamp, length = _RECORD.unpack_from(self.view, offset)
+            offset += _RECORD.size
+            if offset + length > end:
+                # Truncated last record, e.g. the bot was killed mid-write.
+                return
+            yield timestamp, self.view[offset:offset + length]
+            offset += length
+
+    def close(self) -> None:
+        self.view.release()
+        self.map.close()
+        self.file.close()
+
+    def __enter__(self) -> "FrameLog":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
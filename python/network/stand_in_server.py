@@ -0,0 +1,88 @@
+import asyncio
+import json
+from typing import List, Optional, Sequence
+
+import websockets
+
+from core.message import MessageType
+
+
+class StandInServer:
+    """
+    Local websocket server standing in for the game server in tests. Once a
+    client connects it plays `frames` (raw binary messages, type byte
+    included) every `tick_interval` seconds and records what the client sends
+    back: decoded JSON actions in `actions`, keepalive pings in `pings`, and
+    the number of binary frames, which the game server never gets, in
+    `binary_frames`.
+    With `drop`, the connection is closed once the frames are played, to
+    exercise reconnects.
+    """
+
+    def __init__(self, frames: Sequence[bytes], tick_interval: float = 0.0, host: str = "127.0.0.1", port: int = 0,
+                 drop: bool = False):
+        self.frames = list(frames)
+        self.tick_interval = tick_interval
+        self.drop = drop
+        self.host = host
+        self.port = port
+        self.actions: List[dict] = []
+        self.pings = 0
+        self.binary_frames = 0
+        self.connections = 0
+        self.headers: List[websockets.Headers] = []
+        self.done = asyncio.Event()
+        self.server = None
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}/echo"
+
+    async def start(self) -> "StandInServer":
+        self.server = await websockets.serve(self.handler, self.host, self.port, max_size=None)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self) -> None:
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+
+    async def __aenter__(self) -> "StandInServer":
+        return await self.start()
+
+    async def __aexit__(self, *exc) -> None:
+        await self.stop()
+
+    async def handler(self, ws) -> None:
+        self.connections += 1
+        self.headers.append(ws.request.headers)
+        reader = asyncio.create_task(self.read(ws))
+        try:
+            for frame in self.frames:
+                await ws.send(frame)
+                await asyncio.sleep(self.tick_interval)
+            self.done.set()
+            if self.drop:
+                await ws.close()
+            await reader
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            reader.cancel()
+
+    async def read(self, ws) -> None:
+        async for message in ws:
+            # Clients must send text frames, as websocket-client does; binary ones are only counted.
+            if not isinstance(message, str):
+                self.binary_frames += 1
+                continue
+            message = message.encode('utf-8')
+            if message == b'ping':
+                self.pings += 1
+            elif message and message[0] == 3:
+                self.actions.append(json.loads(bytes(message[1:]).decode('utf-8')))
+
+
+def game_end_frame() -> bytes:
+    return bytes([MessageType.GameEnd.value])
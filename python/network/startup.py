@@ -0,0 +1,69 @@
+import contextlib
+import io
+import time
+from typing import Dict, Optional
+
+from core.message import MessageType
+from network.encoder import JDISEncoder
+from network.metrics import TickMetrics
+from network.network import Socket
+
+
+class StartupTimer:
+    """Wall-clock time of each startup phase, from `start` (default: now) to each `mark`."""
+
+    def __init__(self, start: Optional[float] = None):
+        self.start = start if start is not None else time.perf_counter()
+        self.last = self.start
+        self.phases: Dict[str, float] = {}
+
+    def mark(self, phase: str) -> None:
+        now = time.perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + now - self.last
+        self.last = now
+
+    def summary(self) -> dict:
+        return {
+            "phases_ms": {phase: seconds * 1000 for phase, seconds in self.phases.items()},
+            "total_ms": (self.last - self.start) * 1000,
+        }
+
+    def format_summary(self) -> str:
+        phases = ", ".join(f"{phase} {seconds * 1000:.1f} ms" for phase, seconds in self.phases.items())
+        return f"Startup {(self.last - self.start) * 1000:.1f} ms ({phases})"
+
+
+def warm_up(socket: Socket, ticks: int = 20, seed: int = 0) -> None:
+    """
+    Runs a short simulated game through `socket` before it connects, so the
+    first real ticks do not pay for first-call costs (lazy numpy imports,
+    the wall solver, flow fields, the decoder's pool). The game is played by
+    a throwaway bot of the same class with the same name; the socket's own
+    bot, metrics and profiler are left untouched. Bot output is discarded.
+    """
+    from sim.game import Simulation
+    from sim.match import decode_actions
+
+    bot, metrics, profiler = socket.bot, socket.metrics, socket.profiler
+    socket.bot = type(bot)()
+    socket.bot.name = bot.name
+    socket.metrics = TickMetrics()
+    socket.profiler = None
+
+    sim = Simulation(seed)
+    sim.add_player(bot.name)
+    sim.add_player("warm-up")
+    encoder = JDISEncoder()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            socket.handle_message(encoder.encode_message(MessageType.GameStart,
+                                                         encoder.encode_map_state(sim.map_state(bot.name))))
+            for _ in range(ticks):
+                frame = encoder.encode_message(MessageType.GameState, encoder.encode_game_state(sim.game_state()))
+                response = socket.handle_message(frame)
+                if response:
+                    sim.apply_actions(bot.name, decode_actions(socket.encode_actions(response)))
+                sim.step()
+            socket.handle_message(encoder.encode_message(MessageType.GameEnd))
+    finally:
+        socket.bot, socket.metrics, socket.profiler = bot, metrics, profiler
@@ -0,0 +1,62 @@
+import random
+import uuid
+from typing import Optional
+
+from core.consts import Consts
+from core.game_state import Blade, Coin, GameState, PlayerInfo, PlayerWeapon, Projectile
+from core.map_state import MapState, Point
+from core.message import MessageType
+from network.encoder import JDISEncoder, SAVE_SIZE
+
+
+def _uid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128)))
+
+
+def _point(rng: random.Random) -> Point:
+    return Point(rng.uniform(0, Consts.Map.WIDTH * Consts.Map.CELL_WIDTH),
+                 rng.uniform(0, Consts.Map.HEIGHT * Consts.Map.CELL_HEIGHT))
+
+
+def synthetic_game_state(players: int = 8, projectiles_per_player: int = 5, coins: int = Consts.Coin.QUANTITY,
+                         tick: int = 1, seed: Optional[int] = None) -> GameState:
+    """A random but well-formed GameState of the requested size."""
+    rng = random.Random(seed)
+    g = GameState(current_tick=tick, current_round=1)
+
+    for i in range(players):
+        pos = _point(rng)
+        p = PlayerInfo(
+            name=f"bot{i:04d}",
+            color=rng.getrandbits(24),
+            health=rng.randint(0, Consts.Player.MAX_HEALTH),
+            score=rng.randint(0, 100_000),
+            pos=pos,
+            dest=_point(rng) if rng.random() < 0.8 else Point(),
+            playerWeapon=PlayerWeapon(rng.randint(0, 2)),
+        )
+        p.projectiles = [Projectile(_uid(rng), _point(rng), _point(rng)) for _ in range(projectiles_per_player)]
+        rotation = rng.uniform(0, 6.283185307179586)
+        p.blade = Blade(Point(pos.x, pos.y), Point(pos.x + Consts.Blade.LENGTH, pos.y), rotation)
+        g.players.append(p)
+
+    g.coins = [Coin(_uid(rng), Consts.Coin.VALUE, _point(rng)) for _ in range(coins)]
+    return g
+
+
+def synthetic_map_state(size: int = Consts.Map.WIDTH // 2, seed: Optional[int] = None) -> MapState:
+    rng = random.Random(seed)
+    return MapState(
+        size=size,
+        discrete_grid=[[rng.randint(0, 12) for _ in range(size)] for _ in range(size)],
+        walls=[],
+        save=bytearray(rng.getrandbits(8) for _ in range(SAVE_SIZE)),
+    )
+
+
+def synthetic_frame(players: int = 8, projectiles_per_player: int = 5, coins: int = Consts.Coin.QUANTITY,
+                    tick: int = 1, seed: Optional[int] = None) -> bytes:
+    """A GameState frame as received by Socket.on_message (type byte included)."""
+    encoder = JDISEncoder()
+    g = synthetic_game_state(players, projectiles_per_player, coins, tick, seed)
+    return encoder.encode_message(MessageType.GameState, encoder.encode_game_state(g))
@@ -0,0 +1,71 @@
+import argparse
+import time
+
+from core.compact import EntityPool
+from network.compact_decoder import CompactDecoder
+from network.decoder import JDISDecoder, MemoryViewDecoder
+from network.lazy_decoder import LazyDecoder
+from network.metrics import TickMetrics
+from network.network import Socket
+from network.recorder import FrameLog
+
+
+DECODERS = {
+    "jdis": JDISDecoder,
+    "memoryview": MemoryViewDecoder,
+    "lazy": LazyDecoder,
+    "slots": CompactDecoder,
+    "pooled": lambda: CompactDecoder(EntityPool()),
+}
+
+
+def replay(path: str, decoder: str = "memoryview", speed: float = 0.0, repeat: int = 1) -> TickMetrics:
+    metrics = TickMetrics(window=1_000_000)
+    socket = Socket("replay", "", decoder=DECODERS[decoder](), metrics=metrics)
+
+    frames = 0
+    started = time.perf_counter()
+    with FrameLog(path) as log:
+        for _ in range(repeat):
+            first = None
+            for timestamp, message in log:
+                if speed > 0:
+                    # Real-time pacing: wait until the frame's receive time, scaled by `speed`.
+                    if first is None:
+                        first = (timestamp, time.perf_counter())
+                    delay = (timestamp - first[0]) / speed - (time.perf_counter() - first[1])
+                    if delay > 0:
+                        time.sleep(delay)
+
+                start = time.perf_counter()
+                response = socket.handle_message(message)
+                if response:
+                    with metrics.measure("serialize"):
+                        socket.encode_actions(response)
+                metrics.record("tick", time.perf_counter() - start)
+                frames += 1
+            # Drop the last frame view so the log can be unmapped.
+            message = None
+    elapsed = time.perf_counter() - started
+
+    print(f"{frames} frames in {elapsed:.3f}s ({frames / elapsed:.1f} frames/s)")
+    print(metrics.format_summary())
+    return metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replays a recorded frame log through the decoder and the bot")
+    parser.add_argument("log", help="A log written by run_bot.py --record")
+    parser.add_argument("-d", "--decoder", choices=sorted(DECODERS), default="memoryview", help="The decoder to replay with")
+    parser.add_argument("-s", "--speed", type=float, default=0.0, help="Pace frames at SPEED x real time (0: as fast as possible)")
+    parser.add_argument("-n", "--repeat", type=int, default=1, help="Replay the log this many times")
+    parser.add_argument("--metrics", metavar="PATH", default=None, help="Also write the timings as JSON to this file")
+
+    args = parser.parse_args()
+
+    metrics = replay(args.log, args.decoder, args.speed, args.repeat)
+    if args.metrics:
+        metrics.dump(args.metrics)
+
+if __name__ == "__main__":
+    main()
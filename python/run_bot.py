@@ -1,19 +1,90 @@
+import time
+STARTED = time.perf_counter()
+
 import argparse
 
 from network.network import Socket
+from network.metrics import TickMetrics
+from network.startup import StartupTimer, warm_up
 
 def main():
     parser = argparse.ArgumentParser(description="Starts the bot")
     parser.add_argument("-t", "--token", help="The token to authenticate yout bot", required=True)
     parser.add_argument("-r", "--rank", action="store_true" ,help="If set, the bot will play ranked games")
+    parser.add_argument("--asyncio", action="store_true", help="If set, use the asyncio client (single event loop, reconnects with backoff)")
+    parser.add_argument("--pipeline", action="store_true", help="If set, decide on the newest received tick only and skip superseded ones")
+    parser.add_argument("--tick-deadline", type=float, default=None, help="With --asyncio, drop responses that take longer than this many seconds")
+    parser.add_argument("--metrics", metavar="PATH", default=None, help="Write per-phase tick timings as JSON to this file")
+    parser.add_argument("--metrics-every", type=int, default=None, metavar="TICKS", help="Report tick timings every TICKS ticks (printed unless --metrics is set)")
+    parser.add_argument("--profile", metavar="DIR", default=None, help="Write a collapsed-stack profile of every slow tick to DIR")
+    parser.add_argument("--profile-threshold", type=float, default=150, metavar="MS", help="With --profile, ticks slower than MS milliseconds are kept (default: 150)")
+    parser.add_argument("--record", metavar="PATH", default=None, help="Append every raw server frame to PATH for offline replay")
+    parser.add_argument("--lazy", action="store_true", help="If set, decode projectiles, blades and destinations only when the bot reads them (no gain with MyBot, which reads them all every tick)")
+    parser.add_argument("--pooled", action="store_true", help="If set, decode into __slots__ entities recycled between ticks")
+    parser.add_argument("--url", default=None, help="Connect to this server instead (e.g. the local simulator from run_sim.py)")
+    parser.add_argument("--manual", action="store_true", help="If set, steer with w/a/s/d (needs the keyboard package, and root on Linux)")
+    parser.add_argument("--warm-up", type=int, default=20, metavar="TICKS", help="Simulated ticks played before connecting to warm up the decoder and solvers (0 to skip, default: 20)")
 
     args = parser.parse_args()
 
     channel = "wss://jdis-ia.dinf.fsci.usherbrooke.ca:8088/echo"
     if args.rank:
         channel = "wss://jdis-ia.dinf.fsci.usherbrooke.ca:8087/echo"
+    if args.url:
+        channel = args.url
     
-    Socket(channel, args.token).run()
+    # Optional features are only imported when asked for. The "imports" phase covers
+    # everything imported up to here, the bot and its strategy modules included.
+    timer = StartupTimer(STARTED)
+    if args.profile:
+        from network.profiler import SlowTickProfiler
+    if args.record:
+        from network.recorder import FrameRecorder
+    if args.lazy:
+        from network.lazy_decoder import LazyDecoder
+    elif args.pooled:
+        from core.compact import EntityPool
+        from network.compact_decoder import CompactDecoder
+    if args.asyncio:
+        from network.async_network import AsyncSocket
+    if args.manual:
+        from src.keyboard_control import KeyboardControl
+    from src.bot import MyBot
+    timer.mark("imports")
+
+    report_every = args.metrics_every or (100 if args.metrics else None)
+    metrics = TickMetrics(report_every=report_every, path=args.metrics)
+    profiler = recorder = decoder = None
+    if args.profile:
+        profiler = SlowTickProfiler(args.profile, args.profile_threshold / 1000)
+    if args.record:
+        recorder = FrameRecorder(args.record)
+    if args.lazy:
+        decoder = LazyDecoder()
+    elif args.pooled:
+        decoder = CompactDecoder(EntityPool())
+
+    bot = MyBot()
+    if args.asyncio:
+        socket = AsyncSocket(channel, args.token, decoder=decoder, tick_deadline=args.tick_deadline,
+                             metrics=metrics, profiler=profiler, recorder=recorder, bot=bot)
+    else:
+        socket = Socket(channel, args.token, decoder=decoder, pipeline=args.pipeline,
+                        metrics=metrics, profiler=profiler, recorder=recorder, bot=bot)
+    if args.manual:
+        bot.manual = KeyboardControl.load()
+    timer.mark("bot")
+
+    if args.warm_up > 0:
+        warm_up(socket, args.warm_up)
+        timer.mark("warm_up")
+    metrics.startup = timer.summary()
+    print(timer.format_summary())
+
+    socket.run()
+
+    if args.metrics:
+        metrics.dump(args.metrics)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
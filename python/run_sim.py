@@ -0,0 +1,74 @@
+import argparse
+import asyncio
+import json
+
+from core.consts import Consts
+
+
+def serve(args) -> None:
+    from sim.server import SimServer
+
+    async def main():
+        server = SimServer(args.seed, tick_interval=args.tick_interval, lockstep=args.lockstep,
+                           players=args.players, games=args.games, host=args.host, port=args.port)
+        async with server:
+            print(f"Simulator listening on {server.url} (start bots with: python run_bot.py -t <bot name> --url {server.url})")
+            for game, scores in enumerate(await server.run()):
+                print(f"game {game}: {scores}")
+
+    asyncio.run(main())
+
+
+def match(args) -> None:
+    from sim.match import run_match
+    from src.bot import MyBot
+
+    for game in range(args.games):
+        seed = None if args.seed is None else args.seed + game
+        result = run_match({f"bot{i}": MyBot for i in range(args.players)}, seed)
+        print(f"game {game} ({result.ticks} ticks in {result.elapsed:.1f}s): {result.scores}")
+
+
+def sweep(args) -> None:
+    from sim.tournament import BotConfig, format_standings, tournament
+
+    configs = [BotConfig.parse(spec) for spec in args.config]
+    if args.configs:
+        with open(args.configs) as f:
+            configs += [BotConfig(**config) for config in json.load(f)]
+
+    standings = tournament(configs or [BotConfig("default")], args.games, seats=args.players,
+                           seed=args.seed or 0, workers=args.workers)
+    print(format_standings(standings))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Runs the local game simulator")
+    parser.add_argument("-p", "--players", type=int, default=2, help="Number of bots per game")
+    parser.add_argument("-n", "--games", type=int, default=1, help="Number of games to play")
+    parser.add_argument("-s", "--seed", type=int, default=None, help="Seed of the first game (maze, spawns, coins)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    server = commands.add_parser("serve", help="Serve games over websocket to bots started with run_bot.py --url")
+    server.add_argument("--host", default="127.0.0.1")
+    server.add_argument("--port", type=int, default=8765)
+    server.add_argument("--tick-interval", type=float, default=Consts.Game.TICK_DURATION, help="Seconds between ticks (0 to run as fast as possible)")
+    server.add_argument("--lockstep", action="store_true", help="Send the next tick as soon as every bot has answered")
+    server.set_defaults(run=serve)
+
+    in_process = commands.add_parser("match", help="Play MyBot against itself in-process, as fast as possible")
+    in_process.set_defaults(run=match)
+
+    tournament = commands.add_parser("tournament", help="Play configurations of MyBot against each other across all cores")
+    tournament.add_argument("-c", "--config", action="append", default=[], metavar="NAME:KEY=VALUE,...",
+                            help="A bot configuration, e.g. patient:blade_sweep.horizon=6 (repeatable)")
+    tournament.add_argument("--configs", metavar="PATH", default=None,
+                            help="JSON list of configurations ({\"name\": ..., \"params\": {...}, \"factory\": \"module:Class\"})")
+    tournament.add_argument("-w", "--workers", type=int, default=None, help="Worker processes (default: one per core)")
+    tournament.set_defaults(run=sweep)
+
+    args = parser.parse_args()
+    args.run(args)
+
+if __name__ == "__main__":
+    main()
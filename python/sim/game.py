@@ -0,0 +1,303 @@
+import base64
+import math
+import random
+import uuid
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from core.consts import Consts
+from core.game_state import Blade, Coin, GameState, PlayerInfo, PlayerWeapon, Projectile
+from core.map_state import MapState, Point
+from sim.maze import discrete_grid, random_maze
+from src.wall_map import WallMap, TOP, RIGHT, BOTTOM, LEFT
+
+
+STEPS_PER_TICK = 10
+MAP_WIDTH = Consts.Map.WIDTH * Consts.Map.CELL_WIDTH
+MAP_HEIGHT = Consts.Map.HEIGHT * Consts.Map.CELL_HEIGHT
+PLAYER_RADIUS = Consts.Player.SIZE / 2
+
+# Items of the README scoring table. A cannon hit is worth 15 points, blade
+# contact its damage (up to 40 per tick), coins and the treasure their value.
+CANON, BLADE, COIN, TREASURE = "canon", "blade", "coin", "treasure"
+ITEMS = (CANON, BLADE, COIN, TREASURE)
+CANON_POINTS = 15
+
+
+@dataclass
+class SimProjectile:
+    uid: str
+    pos: Point
+    dest: Point
+    ttl: float = Consts.Projectile.TTL
+
+
+@dataclass
+class SimPlayer:
+    name: str
+    color: int
+    pos: Point
+    dest: Optional[Point] = None
+    health: int = Consts.Player.MAX_HEALTH
+    score: int = 0
+    weapon: PlayerWeapon = PlayerWeapon.PlayerWeaponNone
+    rotation: float = 0.0
+    projectiles: List[SimProjectile] = field(default_factory=list)
+    respawn_at: Optional[int] = None
+    save: bytes = b''
+    kills: int = 0
+    deaths: int = 0
+    coins: int = 0
+    points: Dict[str, int] = field(default_factory=lambda: dict.fromkeys(ITEMS, 0))
+
+    def award(self, item: str, points: int) -> None:
+        self.score += points
+        self.points[item] += points
+
+    def alive(self) -> bool:
+        return self.respawn_at is None
+
+
+class Simulation:
+    """
+    Headless implementation of the game rules in core/consts.py. Every tick
+    applies the players' JSON actions (the dicts Socket.send_message builds),
+    then runs STEPS_PER_TICK physics steps of Consts.Game.TICK_DURATION /
+    STEPS_PER_TICK seconds. Walls are a hidden random maze consistent with
+    the discrete grid sent in MapState.
+    """
+
+    def __init__(self, seed: Optional[int] = None, ticks_per_game: int = Consts.Game.TICKS_PER_GAME,
+                 phase2_tick: int = Consts.Game.TICKS_SECONS_STAGE_START):
+        self.rng = random.Random(seed)
+        self.walls: WallMap = random_maze(seed=self.rng.getrandbits(32))
+        self.grid = discrete_grid(self.walls)
+        self.ticks_per_game = ticks_per_game
+        self.phase2_tick = phase2_tick
+        self.tick = 0
+        self.round = 1
+        self.players: Dict[str, SimPlayer] = {}
+        self.coins: List[Coin] = [self._new_coin() for _ in range(Consts.Coin.QUANTITY)]
+        self.treasure: Optional[Coin] = None
+        self.dt = Consts.Game.TICK_DURATION / STEPS_PER_TICK
+
+    # -- setup ---------------------------------------------------------------
+
+    def _uid(self) -> str:
+        return str(uuid.UUID(int=self.rng.getrandbits(128)))
+
+    def _random_point(self) -> Point:
+        cx, cy = self.rng.randrange(self.walls.size), self.rng.randrange(self.walls.size)
+        margin = PLAYER_RADIUS + 0.5
+        return Point(cx * Consts.Map.CELL_WIDTH + self.rng.uniform(margin, Consts.Map.CELL_WIDTH - margin),
+                     cy * Consts.Map.CELL_HEIGHT + self.rng.uniform(margin, Consts.Map.CELL_HEIGHT - margin))
+
+    def _new_coin(self) -> Coin:
+        return Coin(self._uid(), Consts.Coin.VALUE, self._random_point())
+
+    def add_player(self, name: str) -> SimPlayer:
+        if name not in self.players:
+            self.players[name] = SimPlayer(name, self.rng.getrandbits(24), self._random_point())
+        return self.players[name]
+
+    def remove_player(self, name: str) -> None:
+        self.players.pop(name, None)
+
+    def map_state(self, name: str) -> MapState:
+        player = self.players.get(name)
+        return MapState(size=len(self.grid), discrete_grid=[row[:] for row in self.grid], walls=[],
+                        save=bytearray(player.save if player else b''))
+
+    def finished(self) -> bool:
+        return self.tick >= self.ticks_per_game
+
+    # -- state ---------------------------------------------------------------
+
+    def game_state(self) -> GameState:
+        g = GameState(current_tick=self.tick, current_round=self.round)
+        # Dead players stay in the state with health 0, as on the game server.
+        for p in self.players.values():
+            end = Point(p.pos.x + Consts.Blade.LENGTH * math.cos(p.rotation),
+                        p.pos.y + Consts.Blade.LENGTH * math.sin(p.rotation))
+            g.players.append(PlayerInfo(
+                name=p.name, color=p.color, health=p.health, score=p.score,
+                pos=Point(p.pos.x, p.pos.y),
+                dest=Point(p.dest.x, p.dest.y) if p.dest else Point(),
+                playerWeapon=p.weapon,
+                projectiles=[Projectile(q.uid, Point(q.pos.x, q.pos.y), Point(q.dest.x, q.dest.y)) for q in p.projectiles],
+                blade=Blade(Point(p.pos.x, p.pos.y), end, p.rotation),
+            ))
+        g.coins = [Coin(c.uid, c.value, Point(c.pos.x, c.pos.y)) for c in self.coins]
+        if self.treasure:
+            g.coins.append(Coin(self.treasure.uid, self.treasure.value, Point(self.treasure.pos.x, self.treasure.pos.y)))
+        return g
+
+    # -- actions -------------------------------------------------------------
+
+    def apply_actions(self, name: str, actions: dict) -> None:
+        p = self.players.get(name)
+        if p is None:
+            return
+
+        if "save" in actions:
+            p.save = base64.b64decode(actions["save"])[:100]
+        if not p.alive():
+            return
+
+        if "dest" in actions:
+            d = actions["dest"]
+            p.dest = Point(min(max(float(d["x"]), 0.0), MAP_WIDTH), min(max(float(d["y"]), 0.0), MAP_HEIGHT))
+
+        # Switching weapons uses up the weapon for this tick.
+        if "switch" in actions:
+            p.weapon = PlayerWeapon(int(actions["switch"]))
+            return
+
+        if "shoot" in actions and p.weapon == PlayerWeapon.PlayerWeaponCanon:
+            target = actions["shoot"]
+            dx, dy = float(target["x"]) - p.pos.x, float(target["y"]) - p.pos.y
+            norm = math.hypot(dx, dy)
+            if norm > 1e-9:
+                reach = Consts.Projectile.SPEED * Consts.Projectile.TTL
+                dest = Point(p.pos.x + dx / norm * reach, p.pos.y + dy / norm * reach)
+                p.projectiles.append(SimProjectile(self._uid(), Point(p.pos.x, p.pos.y), dest))
+
+        if "rotate_blade" in actions and p.weapon == PlayerWeapon.PlayerWeaponBlade:
+            p.rotation = float(actions["rotate_blade"])
+
+    # -- physics -------------------------------------------------------------
+
+    def step(self) -> None:
+        """Advances one tick."""
+        self._respawn()
+        for _ in range(STEPS_PER_TICK):
+            self._move_players()
+            self._move_projectiles()
+            self._blades()
+            self._collect()
+
+        self.tick += 1
+        if self.tick == self.phase2_tick:
+            self._start_phase2()
+
+    def _respawn(self) -> None:
+        for p in self.players.values():
+            if p.respawn_at is not None and self.tick >= p.respawn_at:
+                p.respawn_at = None
+                p.health = Consts.Player.MAX_HEALTH
+                p.pos = self._random_point()
+                p.dest = None
+
+    def _blocked(self, x: float, y: float, nx: float, ny: float, radius: float) -> Point:
+        """Moves from (x, y) toward (nx, ny), stopping `radius` short of any wall."""
+        cx, cy = self.walls.cell_of(x, y)
+        left, top = cx * Consts.Map.CELL_WIDTH, cy * Consts.Map.CELL_HEIGHT
+        right, bottom = left + Consts.Map.CELL_WIDTH, top + Consts.Map.CELL_HEIGHT
+
+        if nx - radius < left and self.walls.has_wall(cx, cy, LEFT):
+            nx = left + radius
+        if nx + radius > right and self.walls.has_wall(cx, cy, RIGHT):
+            nx = right - radius
+        if ny - radius < top and self.walls.has_wall(cx, cy, TOP):
+            ny = top + radius
+        if ny + radius > bottom and self.walls.has_wall(cx, cy, BOTTOM):
+            ny = bottom - radius
+        return Point(min(max(nx, radius), MAP_WIDTH - radius), min(max(ny, radius), MAP_HEIGHT - radius))
+
+    def _move_players(self) -> None:
+        step = Consts.Player.SPEED * self.dt
+        for p in self.players.values():
+            if not p.alive() or p.dest is None:
+                continue
+            dx, dy = p.dest.x - p.pos.x, p.dest.y - p.pos.y
+            dist = math.hypot(dx, dy)
+            if dist <= step:
+                nx, ny = p.dest.x, p.dest.y
+            else:
+                nx, ny = p.pos.x + dx / dist * step, p.pos.y + dy / dist * step
+            p.pos = self._blocked(p.pos.x, p.pos.y, nx, ny, PLAYER_RADIUS)
+
+    def _move_projectiles(self) -> None:
+        step = Consts.Projectile.SPEED * self.dt
+        hit_radius = (Consts.Player.SIZE + Consts.Projectile.SIZE) / 2
+        for owner in self.players.values():
+            kept = []
+            for q in owner.projectiles:
+                dx, dy = q.dest.x - q.pos.x, q.dest.y - q.pos.y
+                dist = math.hypot(dx, dy)
+                if dist <= step:
+                    continue
+                nx, ny = q.pos.x + dx / dist * step, q.pos.y + dy / dist * step
+
+                # Projectiles stop on walls instead of sliding along them.
+                stopped = self._blocked(q.pos.x, q.pos.y, nx, ny, Consts.Projectile.SIZE / 2)
+                q.ttl -= self.dt
+                if q.ttl <= 0 or abs(stopped.x - nx) > 1e-9 or abs(stopped.y - ny) > 1e-9:
+                    continue
+                q.pos = stopped
+
+                victim = next((v for v in self.players.values() if v is not owner and v.alive()
+                               and math.hypot(v.pos.x - q.pos.x, v.pos.y - q.pos.y) <= hit_radius), None)
+                if victim is not None:
+                    self._damage(owner, victim, Consts.Projectile.DAMAGE, CANON, CANON_POINTS)
+                    continue
+                kept.append(q)
+            owner.projectiles = kept
+
+    def _blades(self) -> None:
+        reach = Consts.Blade.THICKNESS / 2 + PLAYER_RADIUS
+        for owner in self.players.values():
+            if not owner.alive() or owner.weapon != PlayerWeapon.PlayerWeaponBlade:
+                continue
+            ex, ey = math.cos(owner.rotation), math.sin(owner.rotation)
+            for victim in self.players.values():
+                if victim is owner or not victim.alive():
+                    continue
+                # Distance from the victim to the blade segment.
+                vx, vy = victim.pos.x - owner.pos.x, victim.pos.y - owner.pos.y
+                along = min(max(vx * ex + vy * ey, 0.0), Consts.Blade.LENGTH)
+                if math.hypot(vx - along * ex, vy - along * ey) <= reach:
+                    self._damage(owner, victim, Consts.Blade.DAMAGE, BLADE, Consts.Blade.DAMAGE)
+
+    def _damage(self, owner: SimPlayer, victim: SimPlayer, damage: int, item: str, points: int) -> None:
+        victim.health -= damage
+        owner.award(item, points)
+        if victim.health <= 0:
+            victim.health = 0
+            victim.deaths += 1
+            owner.kills += 1
+            victim.projectiles = []
+            victim.respawn_at = self.tick + int(round(Consts.Player.RESPAWN_TIME / Consts.Game.TICK_DURATION))
+
+    def _collect(self) -> None:
+        for p in self.players.values():
+            if not p.alive():
+                continue
+            for i, coin in enumerate(self.coins):
+                if math.hypot(coin.pos.x - p.pos.x, coin.pos.y - p.pos.y) <= (Consts.Player.SIZE + Consts.Coin.SIZE) / 2:
+                    p.award(COIN, coin.value)
+                    p.coins += 1
+                    self.coins[i] = self._new_coin()
+            if self.treasure and math.hypot(self.treasure.pos.x - p.pos.x, self.treasure.pos.y - p.pos.y) \
+                    <= (Consts.Player.SIZE + Consts.Treasure.SIZE) / 2:
+                p.award(TREASURE, self.treasure.value)
+                self.treasure = None
+
+    def _start_phase2(self) -> None:
+        self.round = 2
+        self.coins = []
+        center = self.walls.size // 2
+        self.treasure = Coin(self._uid(), Consts.Treasure.VALUE,
+                             Point(center * Consts.Map.CELL_WIDTH, center * Consts.Map.CELL_HEIGHT))
+
+        # Every agent restarts at the same distance from the treasure.
+        alive = [p for p in self.players.values()]
+        radius = 0.4 * min(MAP_WIDTH, MAP_HEIGHT)
+        offset = self.rng.uniform(0, 2 * math.pi)
+        for i, p in enumerate(alive):
+            angle = offset + 2 * math.pi * i / max(len(alive), 1)
+            p.pos = Point(self.treasure.pos.x + radius * math.cos(angle), self.treasure.pos.y + radius * math.sin(angle))
+            p.dest = None
+            p.projectiles = []
+            p.respawn_at = None
+            p.health = Consts.Player.MAX_HEALTH
@@ -0,0 +1,75 @@
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional
+
+from core.message import MessageType
+from network.encoder import JDISEncoder
+from network.network import Socket
+from sim.game import Simulation
+
+
+@dataclass
+class MatchResult:
+    seed: Optional[int]
+    ticks: int
+    elapsed: float
+    scores: Dict[str, int] = field(default_factory=dict)
+    kills: Dict[str, int] = field(default_factory=dict)
+    deaths: Dict[str, int] = field(default_factory=dict)
+    coins: Dict[str, int] = field(default_factory=dict)
+    points: Dict[str, Dict[str, int]] = field(default_factory=dict)
+
+
+def decode_actions(data: bytes) -> dict:
+    """Inverse of Socket.encode_actions: the JSON actions after the 0x03 prefix."""
+    if not data or data[0] != 3:
+        return {}
+    return json.loads(bytes(data[1:]).decode('utf-8'))
+
+
+def run_match(bots: Dict[str, Callable[[], object]], seed: Optional[int] = None, **kwargs) -> MatchResult:
+    """
+    Plays one game in-process as fast as the bots allow. Each bot sits behind
+    its own Socket, so it goes through the same binary frames and JSON
+    actions as against the real server. `bots` maps player names to
+    factories (MyBot or any object with on_start/on_tick/on_end); a bot's
+    `name` attribute is overwritten with its player name.
+    """
+    sim = Simulation(seed, **kwargs)
+    encoder = JDISEncoder()
+    sockets = {}
+    for name, factory in bots.items():
+        sim.add_player(name)
+        socket = Socket("sim", name, bot=factory())
+        if hasattr(socket.bot, "name"):
+            socket.bot.name = name
+        sockets[name] = socket
+
+    start = time.perf_counter()
+    for name, socket in sockets.items():
+        socket.handle_message(encoder.encode_message(MessageType.GameStart, encoder.encode_map_state(sim.map_state(name))))
+
+    while not sim.finished():
+        frame = encoder.encode_message(MessageType.GameState, encoder.encode_game_state(sim.game_state()))
+        for name, socket in sockets.items():
+            response = socket.handle_message(frame)
+            if response:
+                sim.apply_actions(name, decode_actions(socket.encode_actions(response)))
+        sim.step()
+
+    end = encoder.encode_message(MessageType.GameEnd)
+    for socket in sockets.values():
+        socket.handle_message(end)
+
+    players = sim.players.values()
+    return MatchResult(
+        seed=seed,
+        ticks=sim.tick,
+        elapsed=time.perf_counter() - start,
+        scores={p.name: p.score for p in players},
+        kills={p.name: p.kills for p in players},
+        deaths={p.name: p.deaths for p in players},
+        coins={p.name: p.coins for p in players},
+        points={p.name: dict(p.points) for p in players},
+    )
@@ -0,0 +1,70 @@
+import random
+from typing import List, Optional
+
+from core.consts import Consts
+from src.wall_map import WallMap, OFFSETS, TOP, RIGHT, BOTTOM, LEFT
+
+
+def random_maze(size: int = Consts.Map.WIDTH, openness: float = 0.35, seed: Optional[int] = None) -> WallMap:
+    """
+    Hidden wall layout: a random spanning-tree maze (every cell reachable),
+    after which a fraction `openness` of the remaining internal walls is
+    knocked down to create loops.
+    """
+    rng = random.Random(seed)
+    walls = WallMap(size)
+    for y in range(size):
+        for x in range(size):
+            if x < size - 1:
+                walls.set_wall(x, y, RIGHT)
+            if y < size - 1:
+                walls.set_wall(x, y, BOTTOM)
+
+    # Randomized depth-first carving.
+    seen = {(0, 0)}
+    stack = [(0, 0)]
+    while stack:
+        x, y = stack[-1]
+        options = [(d, x + dx, y + dy) for d, (dx, dy) in enumerate(OFFSETS)
+                   if walls.in_bounds(x + dx, y + dy) and (x + dx, y + dy) not in seen]
+        if not options:
+            stack.pop()
+            continue
+        d, nx, ny = rng.choice(options)
+        walls.set_wall(x, y, d, False)
+        seen.add((nx, ny))
+        stack.append((nx, ny))
+
+    for y in range(size):
+        for x in range(size):
+            for d in (RIGHT, BOTTOM):
+                if walls.has_wall(x, y, d) and rng.random() < openness:
+                    walls.set_wall(x, y, d, False)
+
+    walls.version = 0
+    return walls
+
+
+def discrete_grid(walls: WallMap) -> List[List[int]]:
+    """
+    Wall count of every 2x2 block of cells, as sent in MapState.discrete_grid:
+    the 8 edges around the block (outer border included) and the 4 inside it.
+    """
+    blocks = walls.size // 2
+    grid = []
+    for by in range(blocks):
+        row = []
+        for bx in range(blocks):
+            x0, y0 = 2 * bx, 2 * by
+            count = 0
+            for i in range(2):
+                count += walls.has_wall(x0 + i, y0, TOP)
+                count += walls.has_wall(x0 + i, y0 + 1, BOTTOM)
+                count += walls.has_wall(x0, y0 + i, LEFT)
+                count += walls.has_wall(x0 + 1, y0 + i, RIGHT)
+                # The cross inside the block.
+                count += walls.has_wall(x0 + i, y0, BOTTOM)
+                count += walls.has_wall(x0, y0 + i, RIGHT)
+            row.append(count)
+        grid.append(row)
+    return grid
@@ -0,0 +1,138 @@
+import asyncio
+import json
+from typing import Dict, List, Optional
+
+import websockets
+
+from core.consts import Consts
+from core.message import MessageType
+from network.encoder import JDISEncoder
+from sim.game import Simulation
+
+
+class SimServer:
+    """
+    Websocket server running Simulation games for real bots, so run_bot.py
+    can play locally (run_bot.py --url ws://127.0.0.1:<port>/echo). Clients are
+    identified by their Authorization header, like on the game server.
+
+    Ticks go out every `tick_interval` seconds. With `lockstep`, the next tick
+    is sent as soon as every connected bot has answered the current one
+    (`tick_interval` then only bounds the wait), which runs games as fast as
+    the bots decide.
+    """
+
+    def __init__(self, seed: Optional[int] = None, tick_interval: float = Consts.Game.TICK_DURATION,
+                 lockstep: bool = False, players: int = 1, games: int = 1, host: str = "127.0.0.1", port: int = 0,
+                 **simulation):
+        self.seed = seed
+        self.tick_interval = tick_interval
+        self.lockstep = lockstep
+        self.players = players
+        self.games = games
+        self.host = host
+        self.port = port
+        self.simulation = simulation
+        self.encoder = JDISEncoder()
+        self.sim: Optional[Simulation] = None
+        self.clients: Dict[str, object] = {}
+        self.pending = set()
+        self.answered = asyncio.Event()
+        self.joined = asyncio.Event()
+        self.results: List[Dict[str, int]] = []
+        self.server = None
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}/echo"
+
+    async def start(self) -> "SimServer":
+        self.server = await websockets.serve(self.handler, self.host, self.port, max_size=None)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self) -> None:
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+
+    async def __aenter__(self) -> "SimServer":
+        return await self.start()
+
+    async def __aexit__(self, *exc) -> None:
+        await self.stop()
+
+    async def handler(self, ws) -> None:
+        name = ws.request.headers.get('Authorization') or f"player{len(self.clients)}"
+        self.clients[name] = ws
+        if len(self.clients) >= self.players:
+            self.joined.set()
+        try:
+            if self.sim is not None:
+                await self.send_start(name)
+            async for message in ws:
+                self.receive(name, message)
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            if self.clients.get(name) is ws:
+                del self.clients[name]
+            self.answer(name)
+
+    def receive(self, name: str, message) -> None:
+        if isinstance(message, str):
+            message = message.encode('utf-8')
+        if not message or message[0] != 3 or self.sim is None:
+            return
+        self.sim.apply_actions(name, json.loads(bytes(message[1:]).decode('utf-8')))
+        self.answer(name)
+
+    def answer(self, name: str) -> None:
+        self.pending.discard(name)
+        if not self.pending:
+            self.answered.set()
+
+    async def send_start(self, name: str) -> None:
+        # A bot joining mid-game gets its save back, as on the game server.
+        self.sim.add_player(name)
+        payload = self.encoder.encode_map_state(self.sim.map_state(name))
+        await self.clients[name].send(self.encoder.encode_message(MessageType.GameStart, payload))
+
+    async def broadcast(self, frame: bytes) -> None:
+        for ws in list(self.clients.values()):
+            try:
+                await ws.send(frame)
+            except websockets.ConnectionClosed:
+                pass
+
+    async def play(self, seed: Optional[int]) -> Dict[str, int]:
+        self.sim = Simulation(seed, **self.simulation)
+        for name in list(self.clients):
+            await self.send_start(name)
+
+        while not self.sim.finished():
+            self.pending = set(self.clients)
+            self.answered.clear()
+            await self.broadcast(self.encoder.encode_message(MessageType.GameState,
+                                                             self.encoder.encode_game_state(self.sim.game_state())))
+            if self.lockstep:
+                try:
+                    await asyncio.wait_for(self.answered.wait(), self.tick_interval)
+                except asyncio.TimeoutError:
+                    pass
+            else:
+                await asyncio.sleep(self.tick_interval)
+            self.sim.step()
+
+        await self.broadcast(self.encoder.encode_message(MessageType.GameEnd))
+        scores = {p.name: p.score for p in self.sim.players.values()}
+        self.sim = None
+        return scores
+
+    async def run(self) -> List[Dict[str, int]]:
+        """Waits for `players` bots, then plays `games` games back to back."""
+        for game in range(self.games):
+            await self.joined.wait()
+            seed = None if self.seed is None else self.seed + game
+            self.results.append(await self.play(seed))
+        return self.results
@@ -0,0 +1,132 @@
+import contextlib
+import importlib
+import io
+import json
+import os
+import statistics
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+from sim.game import ITEMS
+from sim.match import MatchResult, run_match
+
+
+@dataclass
+class BotConfig:
+    """
+    One entrant: a MyBot-compatible class ("module:Class") and attribute
+    overrides applied after construction, e.g. {"blade_sweep.horizon": 6}.
+    Dotted keys reach into the bot's components.
+    """
+    name: str
+    params: Dict[str, object] = field(default_factory=dict)
+    factory: str = "src.bot:MyBot"
+
+    def build(self) -> object:
+        module, _, cls = self.factory.partition(":")
+        bot = getattr(importlib.import_module(module), cls)()
+        for key, value in self.params.items():
+            *path, attribute = key.split(".")
+            target = bot
+            for part in path:
+                target = getattr(target, part, None)
+            if target is None or not hasattr(target, attribute):
+                raise ValueError(f"{self.factory} has no attribute {key!r} (config {self.name})")
+            setattr(target, attribute, value)
+        return bot
+
+    @staticmethod
+    def parse(spec: str) -> "BotConfig":
+        """Parses "name:key=value,key=value"; values are read as JSON when possible."""
+        name, _, assignments = spec.partition(":")
+        params = {}
+        for assignment in filter(None, assignments.split(",")):
+            key, _, value = assignment.partition("=")
+            try:
+                params[key.strip()] = json.loads(value)
+            except json.JSONDecodeError:
+                params[key.strip()] = value
+        return BotConfig(name, params)
+
+
+@dataclass
+class Standing:
+    name: str
+    games: int = 0
+    wins: float = 0.0
+    scores: List[int] = field(default_factory=list)
+    kills: int = 0
+    deaths: int = 0
+    coins: int = 0
+    points: Dict[str, int] = field(default_factory=lambda: dict.fromkeys(ITEMS, 0))
+
+    @property
+    def mean_score(self) -> float:
+        return statistics.fmean(self.scores) if self.scores else 0.0
+
+    @property
+    def stderr(self) -> float:
+        if len(self.scores) < 2:
+            return 0.0
+        return statistics.stdev(self.scores) / len(self.scores) ** 0.5
+
+
+def seating(configs: Sequence[BotConfig], games: int, seats: int) -> List[List[BotConfig]]:
+    """Rotates the configurations through the seats so each plays equally often."""
+    return [[configs[(game + seat) % len(configs)] for seat in range(seats)] for game in range(games)]
+
+
+def play(seed: Optional[int], entrants: List[BotConfig], quiet: bool = True, **kwargs) -> MatchResult:
+    bots = {f"{config.name}#{seat}": config.build for seat, config in enumerate(entrants)}
+    if not quiet:
+        return run_match(bots, seed, **kwargs)
+    with contextlib.redirect_stdout(io.StringIO()):
+        return run_match(bots, seed, **kwargs)
+
+
+def aggregate(results: Sequence[MatchResult]) -> Dict[str, Standing]:
+    standings: Dict[str, Standing] = {}
+    for result in results:
+        best = max(result.scores.values(), default=0)
+        winners = [player for player, score in result.scores.items() if score == best]
+        for player, score in result.scores.items():
+            config = player.rpartition("#")[0]
+            standing = standings.setdefault(config, Standing(config))
+            standing.games += 1
+            standing.scores.append(score)
+            standing.kills += result.kills[player]
+            standing.deaths += result.deaths[player]
+            standing.coins += result.coins[player]
+            for item, points in result.points[player].items():
+                standing.points[item] += points
+            if player in winners:
+                standing.wins += 1 / len(winners)
+    return standings
+
+
+def tournament(configs: Sequence[BotConfig], games: int, seats: int = 4, seed: int = 0,
+               workers: Optional[int] = None, quiet: bool = True, **kwargs) -> Dict[str, Standing]:
+    """
+    Plays `games` simulated games of `seats` bots across a process pool and
+    aggregates the results per configuration. Game i uses seed `seed + i`, so
+    a sweep is reproducible.
+    """
+    schedule = seating(configs, games, seats)
+    results = []
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        futures = [pool.submit(play, seed + game, entrants, quiet, **kwargs) for game, entrants in enumerate(schedule)]
+        for future in as_completed(futures):
+            results.append(future.result())
+    return aggregate(results)
+
+
+def format_standings(standings: Dict[str, Standing]) -> str:
+    lines = [f"{'config':<20} {'games':>6} {'wins':>6} {'score':>9} {'+/-':>7} {'kills':>6} {'deaths':>6} {'coins':>6} "
+             + " ".join(f"{item:>9}" for item in ITEMS)]
+    for s in sorted(standings.values(), key=lambda s: s.mean_score, reverse=True):
+        per_game = max(s.games, 1)
+        lines.append(f"{s.name:<20} {s.games:>6} {s.wins:>6.1f} {s.mean_score:>9.1f} {s.stderr:>7.1f} "
+                     f"{s.kills / per_game:>6.2f} {s.deaths / per_game:>6.2f} {s.coins / per_game:>6.2f} "
+                     + " ".join(f"{s.points[item] / per_game:>9.1f}" for item in ITEMS))
+    return "\n".join(lines)
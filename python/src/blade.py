@@ -0,0 +1,149 @@
+import math
+from typing import NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.consts import Consts
+from core.game_state import PlayerWeapon
+from src.motion import MotionEstimator
+from src.wall_map import WallMap
+
+
+# A victim is touched while its centre is within this distance of the blade.
+BLADE_REACH = Consts.Blade.THICKNESS / 2 + Consts.Player.SIZE / 2
+HIT_RADIUS = (Consts.Player.SIZE + Consts.Projectile.SIZE) / 2
+# Enemies further than this can't reach the blade within a tick (both walking
+# straight at each other, plus a margin for prediction spread) and are not scored.
+BLADE_RANGE = Consts.Blade.LENGTH + BLADE_REACH + 2 * Consts.Player.SPEED * Consts.Game.TICK_DURATION + 1.0
+CANON_RANGE = Consts.Projectile.SPEED * Consts.Projectile.TTL
+
+# README scoring: a cannon hit is worth 15 points, the blade its damage,
+# up to 40 per tick of full contact.
+CANON_POINTS = 15
+BLADE_POINTS = 40
+# Below this many expected points a tick, a weapon is as good as idle.
+IDLE_POINTS = 0.5
+
+# Logistic approximation of the normal CDF (numpy has no erf).
+_PROBIT = 1.702
+
+
+class WeaponPlan(NamedTuple):
+    """
+    The weapon to hold this tick, the blade rotation (radians) to send if it
+    is the blade, and the expected points of each weapon over the tick.
+    """
+    weapon: PlayerWeapon
+    angle: float
+    blade: float
+    canon: float
+
+
+def blade_contact(rel: np.ndarray, sigma: np.ndarray, directions: np.ndarray,
+                  length: float = Consts.Blade.LENGTH, reach: float = BLADE_REACH) -> np.ndarray:
+    """
+    Expected fraction of the tick each enemy spends touching the blade, for
+    every candidate direction at once: (A, N) from enemy positions relative
+    to us `rel` (N, S, 2) at S sample times, their position uncertainty
+    `sigma` (N, S) and unit blade directions (A, 2). At each sample the
+    contact probability is P(distance to the segment <= reach) with the
+    distance error treated as normal.
+    """
+    proj = rel @ directions.T
+    along = np.minimum(np.maximum(proj, 0.0), length)
+    d2 = np.sum(rel * rel, axis=-1)[..., None] - (2.0 * proj - along) * along
+    z = (reach - np.sqrt(np.maximum(d2, 0.0))) * (_PROBIT / np.maximum(sigma, 1e-3))[..., None]
+    return (1.0 / (1.0 + np.exp(np.minimum(-z, 30.0)))).sum(axis=1).T / rel.shape[1]
+
+
+class BladeSweep:
+    """
+    Chooses between the canon and the blade, and the blade angle. Each tick,
+    `angles` evenly spaced rotations plus the directions of the enemies
+    within BLADE_RANGE are scored in one batch: the blade segment follows our planned move while
+    the enemies follow the MotionEstimator's predictions, sampled `samples`
+    times over the tick. The canon is valued as one shot at the likeliest
+    hit. Enemies behind a known wall of `wall_map` are left out of both.
+    Switching weapons uses up the tick, so it only happens when the other
+    weapon's advantage, assumed to last `horizon_ticks` ticks, pays for the
+    tick given up.
+    """
+
+    def __init__(self, motion: MotionEstimator, wall_map: WallMap, angles: int = 64, samples: int = 10,
+                 horizon_ticks: int = 3):
+        self.motion = motion
+        self.wall_map = wall_map
+        self.grid = np.linspace(0.0, 2 * math.pi, angles, endpoint=False)
+        self.times = (np.arange(samples) + 1) / samples * Consts.Game.TICK_DURATION
+        self.horizon = horizon_ticks
+
+    def path(self, pos: Tuple[float, float], dest: Optional[Tuple[float, float]]) -> np.ndarray:
+        """(S, 2) our positions at the sample times, walking toward `dest` (or standing still)."""
+        start = np.asarray(pos, dtype=float)
+        if dest is None:
+            return np.tile(start, (len(self.times), 1))
+        travel = np.asarray(dest, dtype=float) - start
+        distance = math.hypot(travel[0], travel[1])
+        if distance < 1e-9:
+            return np.tile(start, (len(self.times), 1))
+        walked = np.minimum(self.times * Consts.Player.SPEED, distance)
+        return start + walked[:, None] * (travel / distance)
+
+    def blade(self, pos: Tuple[float, float], dest: Optional[Tuple[float, float]],
+              means: np.ndarray, sigma: np.ndarray) -> Tuple[float, float]:
+        """Best blade rotation and its expected points this tick, against enemies predicted at the sample times."""
+        if not len(means):
+            return 0.0, 0.0
+        rel = means - self.path(pos, dest)
+        middle = rel[:, len(self.times) // 2]
+        angles = np.concatenate([self.grid, np.arctan2(middle[:, 1], middle[:, 0])])
+        directions = np.column_stack([np.cos(angles), np.sin(angles)])
+
+        value = blade_contact(rel, sigma, directions).sum(axis=1) * BLADE_POINTS
+        best = int(np.argmax(value))
+        return float(angles[best] % (2 * math.pi)), float(value[best])
+
+    @staticmethod
+    def canon(flight: np.ndarray, sigma: np.ndarray) -> float:
+        """Expected points of one shot at the enemy likeliest to be hit, given flight times and miss spreads."""
+        if not len(flight):
+            return 0.0
+        sigma = np.where(np.isnan(sigma), Consts.Player.SPEED * flight, sigma)
+        # P(|error| <= HIT_RADIUS) for an isotropic normal error.
+        hit = 1.0 - np.exp(-HIT_RADIUS ** 2 / (2.0 * np.maximum(sigma, 1e-3) ** 2))
+        return float(np.max(hit)) * CANON_POINTS
+
+    def set_map(self, wall_map: WallMap) -> None:
+        self.wall_map = wall_map
+
+    def plan(self, weapon: PlayerWeapon, pos: Tuple[float, float], dest: Optional[Tuple[float, float]],
+             names: Sequence[str], positions: np.ndarray) -> WeaponPlan:
+        distance = np.hypot(positions[:, 0] - pos[0], positions[:, 1] - pos[1])
+        reach = distance <= CANON_RANGE
+        # Walls stop projectiles; the blade is not aimed through them either.
+        for i in np.flatnonzero(reach):
+            reach[i] = self.wall_map.line_of_sight(pos[0], pos[1], positions[i, 0], positions[i, 1])
+        angle, blade, canon = 0.0, 0.0, 0.0
+        if reach.any():
+            # One prediction batch: the blade's sample times, then each enemy's shot flight time.
+            distance = distance[reach]
+            samples = len(self.times)
+            times = np.empty((len(distance), samples + 1))
+            times[:, :samples] = self.times
+            times[:, samples] = distance / Consts.Projectile.SPEED
+            means, sigma = self.motion.trajectories([name for name, r in zip(names, reach) if r], times)
+
+            near = (distance <= BLADE_RANGE) & ~np.isnan(sigma[:, 0])
+            angle, blade = self.blade(pos, dest, means[near, :samples], sigma[near, :samples])
+            canon = self.canon(times[:, samples], sigma[:, samples])
+
+        # The canon is the default weapon; the blade is only worth holding while it expects contact.
+        if weapon == PlayerWeapon.PlayerWeaponBlade:
+            if blade < IDLE_POINTS or self.horizon * (canon - blade) > blade:
+                weapon = PlayerWeapon.PlayerWeaponCanon
+        elif weapon == PlayerWeapon.PlayerWeaponCanon:
+            if blade >= IDLE_POINTS and self.horizon * (blade - canon) > canon:
+                weapon = PlayerWeapon.PlayerWeaponBlade
+        else:
+            weapon = PlayerWeapon.PlayerWeaponBlade if blade >= max(canon, IDLE_POINTS) else PlayerWeapon.PlayerWeaponCanon
+        return WeaponPlan(weapon, angle, blade, canon)
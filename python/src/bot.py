@@ -3,145 +3,146 @@ from core.action import MoveAction, ShootAction, RotateBladeAction, SwitchWeapon
 from core.consts import Consts
 from core.game_state import GameState, PlayerWeapon, Point
 from core.map_state import MapState
-import math
-import heapq
+from src.intercept import intercept
+from src.wall_map import WallMap
+from src.wall_inference import WallInference
+from src.wall_learning import WallLearner
+from src.wall_codec import encode_walls, decode_walls
+from src.pathfinding import Navigator
+from src.flow_field import FlowFieldCache
+from src.spatial_index import GameIndex
+from src.threat import ThreatForecaster, candidate_ring
+from src.motion import MotionEstimator
+from src.blade import BladeSweep
 import numpy as np
-from scipy.optimize import fsolve
-import keyboard
-
-class Cell:
-    def __init__(self) -> None:
-        self.walls = [False, False, False, False]  # [top, right, bottom, left]
-
-class Map:
-    def __init__(self) -> None:
-        self.size = 10
-        self.grid = [[Cell() for _ in range(self.size)] for _ in range(self.size)]
-
-    def place_wall(self, x, y, direction):
-        if x < 0 or x >= self.size or y < 0 or y >= self.size:
-            print("Invalid cell coordinates")
-            return
-
-        if direction not in ["top", "right", "bottom", "left"]:
-            print("Invalid direction. Use 'top', 'right', 'bottom', or 'left'")
-            return
-
-        directions = ["top", "right", "bottom", "left"]
-        dir_index = directions.index(direction)
-
-        # Place wall in the current cell
-        self.grid[y][x].walls[dir_index] = True
-
-        # Place wall in the adjacent cell
-        adj_x, adj_y = x, y
-        adj_dir_index = (dir_index + 2) % 4  # Opposite direction
-
-        if direction == "top":
-            adj_y -= 1
-        elif direction == "right":
-            adj_x += 1
-        elif direction == "bottom":
-            adj_y += 1
-        elif direction == "left":
-            adj_x -= 1
-
-        # Check if adjacent cell is within the grid
-        if 0 <= adj_x < self.size and 0 <= adj_y < self.size:
-            self.grid[adj_y][adj_x].walls[adj_dir_index] = True
-
-    def print_map(self):
-        for row in self.grid:
-            for cell in row:
-                print(f"[{''.join('W' if w else ' ' for w in cell.walls)}]", end="")
-            print()
 
 class MyBot:
     def __init__(self):
         self.name = "ChevyMalibu2010"  # 10 characters
         self.__map_state = None
-        self.map = Map()
-        self.initialize = True
-        self.move_speed = 10  # Adjust this value as needed
+        self.map = WallMap()
+        self.inference = WallInference()
+        self.wall_learner = WallLearner(self.inference)
+        self.saved_walls = (0, 0)
+        self.save_sequence = 0
+        self.navigator = Navigator(self.map)
+        self.flow_fields = FlowFieldCache(self.map)
+        self.threats = ThreatForecaster()
+        self.motion = MotionEstimator()
+        self.blade_sweep = BladeSweep(self.motion, self.map)
+        self.manual = None  # KeyboardControl, when run with --manual
 
     def currentCell(self, location):
-        x, y = location[0], location[1]
-        cell_x = int(x // 10)
-        cell_y = int(y // 10)
-        return (cell_x, cell_y)
-
-    def getWall(self, current_location):
-        current_cell = self.currentCell(current_location)
-        x, y = current_location
-
-        # Calculate distances to cell boundaries
-        distances = {
-            "top": y % 10,
-            "bottom": 10 - (y % 10),
-            "left": x % 10,
-            "right": 10 - (x % 10)
-        }
-
-        # Find the closest wall
-        closest_wall = min(distances, key=distances.get)
-
-        # Map the direction to the corresponding index in the Cell.walls list
-        direction_to_index = {"top": 0, "right": 1, "bottom": 2, "left": 3}
-        wall_index = direction_to_index[closest_wall]
-
-        # Place the wall in the map
-        self.map.place_wall(int(current_cell[0]), int(current_cell[1]), closest_wall)
-
-        print(f"Closest wall: {closest_wall}")
-        print(f"Current location: {current_location}")
-        print(f"Current cell: {current_cell}")
-        self.map.print_map()
-        return closest_wall
+        return self.map.cell_of(location[0], location[1])
+
+    def learn(self, edges):
+        for x, y, direction, wall in edges:
+            if self.map.set_wall(x, y, direction, wall):
+                self.navigator.notify_wall(x, y, direction)
+                self.flow_fields.notify_wall(x, y, direction)
+
+    def save_walls(self, tick):
+        # Only spend a SaveAction when the wall knowledge changed.
+        if (self.inference.known, self.inference.walls) == self.saved_walls:
+            return None
+        self.saved_walls = (self.inference.known, self.inference.walls)
+        self.save_sequence += 1
+        return SaveAction(encode_walls(self.inference, tick, self.save_sequence))
 
     def on_tick(self, game_state: GameState) -> List[Union[MoveAction, SwitchWeaponAction, RotateBladeAction, ShootAction, SaveAction]]:
         actions = []
-        mystate = next((player for player in game_state.players if player.name == self.name), None)
-
-        if not mystate:
+        index = GameIndex(game_state)
+        self.motion.update(game_state)
+        self.learn(self.wall_learner.update(game_state))
+        save = self.save_walls(game_state.current_tick)
+        if save:
+            actions.append(save)
+        mystate = index.player(self.name)
+
+        if not mystate or not mystate.isAlive():
             return actions
 
-        if self.initialize:
-            actions.append(SwitchWeaponAction(PlayerWeapon.PlayerWeaponCanon))
-            self.initialize = False
-
-        # Shooting logic
-        us = self.name_search(game_state.players, "ChevyMalibu2010")
-        a = self.find_nearest_enemy(game_state.players, "ChevyMalibu2010")
-
-        target_vel = [a.dest.x - a.pos.x, a.dest.y - a.pos.y]
-        target_vel = [Consts.Player.SPEED/self.distance((0,0), (target_vel[0], target_vel[1]))*target_vel[0], 
-                      Consts.Player.SPEED/self.distance((0,0), (target_vel[0], target_vel[1]))*target_vel[1]]
-
-        predicted_position = self.predict(us.pos, a.pos, target_vel)
-        actions.append(ShootAction(predicted_position))
-
         # Movement logic
         current_x, current_y = mystate.pos.x, mystate.pos.y
-        move_x, move_y = 0, 0
-
-        if keyboard.is_pressed('w'):
-            move_y -= self.move_speed
-        if keyboard.is_pressed('s'):
-            move_y += self.move_speed
-        if keyboard.is_pressed('a'):
-            move_x -= self.move_speed
-        if keyboard.is_pressed('d'):
-            move_x += self.move_speed
-
-        if move_x != 0 or move_y != 0:
-            new_x = current_x + move_x
-            new_y = current_y + move_y
-            actions.append(MoveAction((new_x, new_y)))
+        manual = self.manual.move(current_x, current_y) if self.manual else None
+        move = None
+
+        if manual:
+            move = MoveAction(manual)
+        elif game_state.coins:
+            treasure = next((coin for coin in game_state.coins if coin.value == Consts.Treasure.VALUE), None)
+            if treasure:
+                # The treasure never moves during phase 2, so an incremental plan pays off.
+                move = self.navigator.move((current_x, current_y), self.createPoint(treasure.pos))
+            else:
+                location = self.createPoint(index.nearest_coins(current_x, current_y)[0].pos)
+                waypoint = self.flow_fields.waypoint((current_x, current_y), location)
+                move = MoveAction(waypoint) if waypoint else None
+            if move:
+                move = self.dodge(mystate, move, game_state)
+        if move:
+            actions.append(move)
+
+        # Weapon logic: the blade is aimed along the move just planned.
+        enemies = [player for player in game_state.players if player.name != self.name and player.isAlive()]
+        if enemies:
+            names = [enemy.name for enemy in enemies]
+            positions = np.array([[enemy.pos.x, enemy.pos.y] for enemy in enemies])
+            plan = self.blade_sweep.plan(mystate.playerWeapon, (current_x, current_y),
+                                         move.dest_pos if move else None, names, positions)
+            if plan.weapon != mystate.playerWeapon:
+                actions.append(SwitchWeaponAction(plan.weapon))
+            elif plan.weapon == PlayerWeapon.PlayerWeaponBlade:
+                actions.append(RotateBladeAction(plan.angle))
+            else:
+                target = self.choose_target(mystate, enemies)
+                if target is not None:
+                    actions.append(ShootAction(target))
+        elif mystate.playerWeapon == PlayerWeapon.PlayerWeaponNone:
+            actions.append(SwitchWeaponAction(PlayerWeapon.PlayerWeaponCanon))
 
         return actions
 
+    def dodge(self, mystate, move, game_state):
+        self.threats.update(game_state, self.name)
+        pos = (mystate.pos.x, mystate.pos.y)
+        planned = self.threats.danger(pos, [move.dest_pos])[0]
+        if planned <= 0:
+            return move
+
+        candidates = self.reachable(pos, candidate_ring(pos))
+        if not len(candidates):
+            return move
+        best, danger = self.threats.safest(pos, candidates)
+        if danger < planned:
+            return MoveAction(tuple(candidates[best].tolist()))
+        return move
+
+    def reachable(self, pos, candidates):
+        # A destination behind or against a known wall would leave us stuck in the line of fire.
+        radius = Consts.Player.SIZE / 2
+        keep = [self.map.fits(x, y, radius) and self.map.line_of_sight(pos[0], pos[1], x, y) for x, y in candidates]
+        return candidates[np.array(keep, dtype=bool)]
+
     def on_start(self, map_state: MapState):
         self.__map_state = map_state
+        self.motion.reset()
+        try:
+            self.inference = WallInference.from_map_state(map_state)
+        except ValueError as e:
+            print(e)
+            self.inference = WallInference(WallMap.from_map_state(map_state).size)
+
+        # After a reconnect the save brings back everything learnt so far this game.
+        restored = decode_walls(map_state.save, self.inference)
+        self.save_sequence = restored.sequence if restored else 0
+        self.saved_walls = (self.inference.known, self.inference.walls)
+
+        self.map = self.inference.wall_map()
+        self.wall_learner.set_inference(self.inference)
+        self.navigator.set_map(self.map)
+        self.flow_fields.set_map(self.map)
+        self.blade_sweep.set_map(self.map)
         print(map_state)
 
     def createPoint(self, location: Point):
@@ -150,66 +151,37 @@ class MyBot:
     def on_end(self):
         pass
 
-    def find_nearest_coin(self, coins, our_position):
-        return min(coins, key=lambda coin: self.distance(coin.position, our_position), default=None)
-
-    def nearestcoin(self, pos, coins):
-        index = 0
-        smallestindex = 0
-        shortestdistance = 100000
-        distance = 0
-
-        for coin in coins:
-            coinlocation = self.createPoint(coin.pos)
-            distance = self.distance(coinlocation, pos)
-
-            if distance < shortestdistance:
-                shortestdistance = distance
-                smallestindex = index
-            index += 1
-
-        cell = self.currentCell(self.createPoint(coins[smallestindex].pos))
-        location = self.createPoint(coins[smallestindex].pos)
-
-        return cell, location
-
     def distance(self, tuple1, tuple2):
         return ((tuple1[0] - tuple2[0])**2 + (tuple1[1] - tuple2[1])**2)**0.5
 
-    def find_nearest_enemy(self, players, our_name):
-        name_closest_bot = ""
-        smallest_distance = float('inf')
-
-        my_pos = self.name_search(players, our_name).pos
-
-        for player in players:
-            if player.name != our_name:
-                curr_distance = self.distance((my_pos.x, my_pos.y), (player.pos.x, player.pos.y))
-
-                if curr_distance < smallest_distance:
-                    smallest_distance = curr_distance
-                    name_closest_bot = player.name
-
-        target = self.name_search(players, name_closest_bot)
-
-        return target
-
-    def name_search(self, players, name):
-        for player in players:
-            if player.name == name:
-                return player
-        return None
-
-    def predict(self, my_pos, target_pos, target_vel):
-        def equations(t):
-            x = target_pos.x + target_vel[0] * t
-            y = target_pos.y + target_vel[1] * t
-            d = np.sqrt((x - my_pos.x) ** 2 + (y - my_pos.y) ** 2)
-            return d - Consts.Projectile.SPEED * t
-
-        t_solution = fsolve(equations, 0)[0]
-
-        x_intercept = target_pos.x + target_vel[0] * t_solution
-        y_intercept = target_pos.y + target_vel[1] * t_solution
-
-        return [x_intercept, y_intercept]
\ No newline at end of file
+    def velocity(self, player):
+        dx, dy = player.dest.x - player.pos.x, player.dest.y - player.pos.y
+        norm = self.distance((0, 0), (dx, dy))
+        if norm < 1e-9:
+            return [0.0, 0.0]
+        return [Consts.Player.SPEED / norm * dx, Consts.Player.SPEED / norm * dy]
+
+    def choose_target(self, us, enemies):
+        # Projectiles stop on walls: enemies behind a known one are not shot at.
+        enemies = [enemy for enemy in enemies
+                   if self.map.line_of_sight(us.pos.x, us.pos.y, enemy.pos.x, enemy.pos.y)]
+        if not enemies:
+            return None
+        positions = np.array([[enemy.pos.x, enemy.pos.y] for enemy in enemies])
+        # Filtered velocity once an enemy has been tracked, its heading before that.
+        names = [enemy.name for enemy in enemies]
+        velocities = self.motion.velocities(names)
+        for i, tracked in enumerate(self.motion.known(names)):
+            if not tracked:
+                velocities[i] = self.velocity(enemies[i])
+        result = intercept((us.pos.x, us.pos.y), positions, velocities)
+        valid = np.array([bool(ok) and self.map.line_of_sight(us.pos.x, us.pos.y, x, y)
+                          for ok, (x, y) in zip(result.valid, result.points)])
+
+        if valid.any():
+            best = int(np.argmin(np.where(valid, result.times, np.inf)))
+            return result.points[best].tolist()
+
+        # No intercept in sight: aim at the nearest enemy, which is.
+        best = int(np.argmin(np.hypot(positions[:, 0] - us.pos.x, positions[:, 1] - us.pos.y)))
+        return positions[best].tolist()
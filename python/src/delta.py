@@ -0,0 +1,147 @@
+import math
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from core.consts import Consts
+from core.game_state import GameState
+
+
+COIN_SPAWNED = "coin_spawned"
+COIN_COLLECTED = "coin_collected"
+COIN_REMOVED = "coin_removed"
+PROJECTILE_FIRED = "projectile_fired"
+PROJECTILE_EXPIRED = "projectile_expired"
+PLAYER_JOINED = "player_joined"
+PLAYER_LEFT = "player_left"
+PLAYER_DIED = "player_died"
+PLAYER_RESPAWNED = "player_respawned"
+HEALTH_CHANGED = "health_changed"
+SCORE_CHANGED = "score_changed"
+WEAPON_SWITCHED = "weapon_switched"
+ROUND_CHANGED = "round_changed"
+
+
+class Event(NamedTuple):
+    """
+    One change between two ticks. `key` is the coin or projectile uid, or the
+    player name; `player` is the projectile owner or coin collector (None if
+    unknown); `before`/`after` carry the changed value where there is one.
+    """
+    tick: int
+    kind: str
+    key: str
+    player: Optional[str] = None
+    before: object = None
+    after: object = None
+
+
+class _Player(NamedTuple):
+    x: float
+    y: float
+    health: int
+    score: int
+    weapon: int
+
+
+class DeltaTracker:
+    """
+    Diffs consecutive GameStates. Entities are remembered by uid (coins,
+    projectiles) and name (players) as plain tuples, so the tracker is safe
+    with pooled or lazily decoded states. Also derives each player's velocity
+    from its observed displacement.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.tick: Optional[int] = None
+        self.round: Optional[int] = None
+        self.players: Dict[str, _Player] = {}
+        self.coins: Dict[str, Tuple[float, float, int]] = {}
+        self.projectiles: Dict[str, str] = {}
+        self.velocities: Dict[str, Tuple[float, float]] = {}
+
+    def velocity(self, name: str) -> Optional[Tuple[float, float]]:
+        return self.velocities.get(name)
+
+    def update(self, game_state: GameState) -> List[Event]:
+        tick = game_state.current_tick
+        first = self.tick is None
+        elapsed = max(tick - self.tick, 1) * Consts.Game.TICK_DURATION if not first else Consts.Game.TICK_DURATION
+        events: List[Event] = []
+
+        if not first and game_state.current_round != self.round:
+            events.append(Event(tick, ROUND_CHANGED, str(game_state.current_round), None, self.round, game_state.current_round))
+
+        players: Dict[str, _Player] = {}
+        projectiles: Dict[str, str] = {}
+        velocities: Dict[str, Tuple[float, float]] = {}
+        for p in game_state.players:
+            now = _Player(p.pos.x, p.pos.y, p.health, p.score, int(p.playerWeapon))
+            players[p.name] = now
+            for projectile in p.projectiles:
+                projectiles[projectile.uid] = p.name
+
+            before = self.players.get(p.name)
+            if before is None:
+                if not first:
+                    events.append(Event(tick, PLAYER_JOINED, p.name))
+                continue
+
+            was_alive, alive = before.health > 0, now.health > 0
+            if was_alive and not alive:
+                events.append(Event(tick, PLAYER_DIED, p.name, None, before.health, now.health))
+            elif alive and not was_alive:
+                events.append(Event(tick, PLAYER_RESPAWNED, p.name))
+            elif now.health != before.health:
+                events.append(Event(tick, HEALTH_CHANGED, p.name, None, before.health, now.health))
+            if now.score != before.score:
+                events.append(Event(tick, SCORE_CHANGED, p.name, None, before.score, now.score))
+            if now.weapon != before.weapon:
+                events.append(Event(tick, WEAPON_SWITCHED, p.name, None, before.weapon, now.weapon))
+
+            # Respawns teleport: only a walkable displacement is a velocity.
+            dx, dy = now.x - before.x, now.y - before.y
+            if alive and was_alive and math.hypot(dx, dy) <= 1.5 * Consts.Player.SPEED * elapsed:
+                velocities[p.name] = (dx / elapsed, dy / elapsed)
+            elif alive:
+                velocities[p.name] = (0.0, 0.0)
+
+        if not first:
+            for name in self.players.keys() - players.keys():
+                events.append(Event(tick, PLAYER_LEFT, name))
+
+            for uid in projectiles.keys() - self.projectiles.keys():
+                events.append(Event(tick, PROJECTILE_FIRED, uid, projectiles[uid]))
+            for uid in self.projectiles.keys() - projectiles.keys():
+                events.append(Event(tick, PROJECTILE_EXPIRED, uid, self.projectiles[uid]))
+
+        coins = {coin.uid: (coin.pos.x, coin.pos.y, coin.value) for coin in game_state.coins}
+        if not first:
+            for uid in coins.keys() - self.coins.keys():
+                events.append(Event(tick, COIN_SPAWNED, uid, None, None, coins[uid][2]))
+            gained = {name: now.score - self.players[name].score for name, now in players.items() if name in self.players}
+            for uid in self.coins.keys() - coins.keys():
+                x, y, value = self.coins[uid]
+                collector = self._collector(players, gained, x, y, value)
+                if collector is not None:
+                    gained[collector] -= value
+                    events.append(Event(tick, COIN_COLLECTED, uid, collector, value, None))
+                else:
+                    events.append(Event(tick, COIN_REMOVED, uid, None, value, None))
+
+        self.tick = tick
+        self.round = game_state.current_round
+        self.players = players
+        self.projectiles = projectiles
+        self.coins = coins
+        self.velocities = velocities
+        return events
+
+    @staticmethod
+    def _collector(players: Dict[str, _Player], gained: Dict[str, int], x: float, y: float, value: int) -> Optional[str]:
+        """The nearest player whose score rose by at least the coin's value."""
+        candidates = [name for name, points in gained.items() if points >= value]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda name: math.hypot(players[name].x - x, players[name].y - y))
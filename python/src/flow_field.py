@@ -0,0 +1,180 @@
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import numpy as np
+
+from core.consts import Consts
+from src.wall_map import WallMap, OFFSETS, TOP, RIGHT, BOTTOM, LEFT
+
+
+UNREACHABLE = -1
+
+
+class FlowField:
+    """
+    BFS distance (in cells) from every cell to `target`, plus the direction
+    of the next step toward it. Both arrays are indexed [y, x]; unreachable
+    cells hold UNREACHABLE.
+    """
+
+    def __init__(self, wall_map: WallMap, target: Tuple[int, int]):
+        self.target = target
+        self.dist, self.next_dir = self._compute(wall_map, target)
+
+    @staticmethod
+    def _compute(wall_map: WallMap, target: Tuple[int, int]) -> Tuple[np.ndarray, np.ndarray]:
+        masks = wall_map.neighbour_masks()
+        open_top = (masks >> TOP & 1).astype(bool)
+        open_right = (masks >> RIGHT & 1).astype(bool)
+        open_bottom = (masks >> BOTTOM & 1).astype(bool)
+        open_left = (masks >> LEFT & 1).astype(bool)
+
+        dist = np.full(masks.shape, UNREACHABLE, dtype=np.int32)
+        tx, ty = target
+        dist[ty, tx] = 0
+        frontier = np.zeros(masks.shape, dtype=bool)
+        frontier[ty, tx] = True
+
+        # Expand the whole BFS frontier at once with shifted masks.
+        step = 0
+        while frontier.any():
+            step += 1
+            reached = np.zeros_like(frontier)
+            reached[:, 1:] |= frontier[:, :-1] & open_right[:, :-1]
+            reached[:, :-1] |= frontier[:, 1:] & open_left[:, 1:]
+            reached[1:, :] |= frontier[:-1, :] & open_bottom[:-1, :]
+            reached[:-1, :] |= frontier[1:, :] & open_top[1:, :]
+            reached &= dist == UNREACHABLE
+            dist[reached] = step
+            frontier = reached
+
+        next_dir = np.full(masks.shape, UNREACHABLE, dtype=np.int8)
+        opened = [open_top, open_right, open_bottom, open_left]
+        for direction, (dx, dy) in enumerate(OFFSETS):
+            neighbour = np.full(masks.shape, UNREACHABLE, dtype=np.int32)
+            ys = slice(max(dy, 0), masks.shape[0] + min(dy, 0))
+            xs = slice(max(dx, 0), masks.shape[1] + min(dx, 0))
+            ys_src = slice(max(-dy, 0), masks.shape[0] + min(-dy, 0))
+            xs_src = slice(max(-dx, 0), masks.shape[1] + min(-dx, 0))
+            neighbour[ys_src, xs_src] = dist[ys, xs]
+
+            downhill = opened[direction] & (dist > 0) & (neighbour == dist - 1) & (next_dir == UNREACHABLE)
+            next_dir[downhill] = direction
+
+        return dist, next_dir
+
+    def distance(self, cell: Tuple[int, int]) -> int:
+        return int(self.dist[cell[1], cell[0]])
+
+    def direction(self, cell: Tuple[int, int]) -> int:
+        return int(self.next_dir[cell[1], cell[0]])
+
+    def is_tight(self, wall_map: WallMap, x: int, y: int, direction: int) -> bool:
+        """
+        True when closing the edge changes distances, i.e. it was the only step
+        toward the target of the farther of its two cells. `wall_map` already
+        has the edge closed.
+        """
+        dx, dy = OFFSETS[direction]
+        a, b = int(self.dist[y, x]), int(self.dist[y + dy, x + dx])
+        # Neighbours on a grid are always one step apart, or both unreachable.
+        if a == b:
+            return False
+        fx, fy = (x, y) if a > b else (x + dx, y + dy)
+        step = max(a, b) - 1
+        return not any(self.dist[ny, nx] == step for nx, ny in wall_map.neighbours(fx, fy))
+
+    def is_shortcut(self, x: int, y: int, direction: int) -> bool:
+        """True when opening the edge would shorten some distance."""
+        dx, dy = OFFSETS[direction]
+        a, b = int(self.dist[y, x]), int(self.dist[y + dy, x + dx])
+        if a == UNREACHABLE or b == UNREACHABLE:
+            return a != b
+        return abs(a - b) > 1
+
+    def repoint(self, wall_map: WallMap, cell: Tuple[int, int]) -> None:
+        """Re-chooses the step direction of `cell` after one of its edges changed without changing distances."""
+        x, y = cell
+        distance = self.dist[y, x]
+        self.next_dir[y, x] = UNREACHABLE
+        if distance <= 0:
+            return
+        for direction, (dx, dy) in enumerate(OFFSETS):
+            if not wall_map.has_wall(x, y, direction) and self.dist[y + dy, x + dx] == distance - 1:
+                self.next_dir[y, x] = direction
+                return
+
+
+class FlowFieldCache:
+    """
+    LRU cache of flow fields keyed by target cell. Call notify_wall whenever
+    the wall map changes so only the fields that the edge affects are dropped.
+    """
+
+    def __init__(self, wall_map: WallMap, capacity: int = 32):
+        self.wall_map = wall_map
+        self.capacity = capacity
+        self.fields: "OrderedDict[Tuple[int, int], FlowField]" = OrderedDict()
+        self.version = wall_map.version
+
+    def set_map(self, wall_map: WallMap) -> None:
+        self.wall_map = wall_map
+        self.fields.clear()
+        self.version = wall_map.version
+
+    def notify_wall(self, x: int, y: int, direction: int) -> None:
+        dx, dy = OFFSETS[direction]
+        if not (self.wall_map.in_bounds(x, y) and self.wall_map.in_bounds(x + dx, y + dy)):
+            return
+
+        closed = self.wall_map.has_wall(x, y, direction)
+        for target in list(self.fields):
+            field = self.fields[target]
+            if field.is_tight(self.wall_map, x, y, direction) if closed else field.is_shortcut(x, y, direction):
+                del self.fields[target]
+            else:
+                # Same distances, but either cell may have lost or gained a step toward the target.
+                field.repoint(self.wall_map, (x, y))
+                field.repoint(self.wall_map, (x + dx, y + dy))
+        self.version = self.wall_map.version
+
+    def field(self, target: Tuple[int, int]) -> FlowField:
+        # Changes that were never reported through notify_wall invalidate everything.
+        if self.version != self.wall_map.version:
+            self.fields.clear()
+            self.version = self.wall_map.version
+
+        field = self.fields.get(target)
+        if field is not None:
+            self.fields.move_to_end(target)
+            return field
+
+        field = FlowField(self.wall_map, target)
+        self.fields[target] = field
+        if len(self.fields) > self.capacity:
+            self.fields.popitem(last=False)
+        return field
+
+    def distance(self, pos: Tuple[float, float], target_pos: Tuple[float, float]) -> int:
+        return self.field(self.wall_map.cell_of(*target_pos)).distance(self.wall_map.cell_of(*pos))
+
+    def waypoint(self, pos: Tuple[float, float], target_pos: Tuple[float, float]) -> Optional[Tuple[float, float]]:
+        """Next turn on the way to `target_pos`, or `target_pos` itself once the run is straight."""
+        target = self.wall_map.cell_of(*target_pos)
+        field = self.field(target)
+        cell = self.wall_map.cell_of(*pos)
+
+        if field.distance(cell) == UNREACHABLE:
+            return None
+
+        direction = field.direction(cell)
+        if direction == UNREACHABLE:
+            return target_pos
+
+        dx, dy = OFFSETS[direction]
+        while field.direction(cell) == direction:
+            cell = (cell[0] + dx, cell[1] + dy)
+
+        if cell == target:
+            return target_pos
+        return (cell[0] + 0.5) * Consts.Map.CELL_WIDTH, (cell[1] + 0.5) * Consts.Map.CELL_HEIGHT
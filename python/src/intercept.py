@@ -0,0 +1,55 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from core.consts import Consts
+
+
+@dataclass
+class Intercept:
+    points: np.ndarray  # (n, 2) aim points
+    times: np.ndarray   # (n,) time to impact in seconds, clipped to [0, TTL]
+    valid: np.ndarray   # (n,) False when no intercept exists within TTL
+
+
+def intercept(shooter_pos, target_pos, target_vel,
+              speed: float = Consts.Projectile.SPEED, ttl: float = Consts.Projectile.TTL) -> Intercept:
+    """
+    Closed-form intercept for every target at once. Solves
+    |D + V t| = speed * t with D = target_pos - shooter_pos and V = target_vel,
+    i.e. (V.V - speed^2) t^2 + 2 (D.V) t + D.D = 0, keeping the smallest
+    non-negative root. Positions and velocities are broadcast against each other.
+    """
+    shooter_pos = np.asarray(shooter_pos, dtype=float)
+    target_pos = np.atleast_2d(np.asarray(target_pos, dtype=float))
+    d = target_pos - shooter_pos
+    v = np.atleast_2d(np.asarray(target_vel, dtype=float))
+    d, v = np.broadcast_arrays(d, v)
+
+    a = np.einsum('ij,ij->i', v, v) - speed * speed
+    b = 2.0 * np.einsum('ij,ij->i', d, v)
+    c = np.einsum('ij,ij->i', d, d)
+
+    t = np.full(len(a), np.inf)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        linear = np.abs(a) < 1e-12
+        t_lin = np.where(b < 0, -c / b, np.inf)
+        t[linear] = t_lin[linear]
+
+        disc = b * b - 4.0 * a * c
+        quad = ~linear & (disc >= 0)
+        root = np.sqrt(np.where(quad, disc, 0.0))
+        r1 = (-b - root) / (2.0 * a)
+        r2 = (-b + root) / (2.0 * a)
+        r1 = np.where(r1 >= 0, r1, np.inf)
+        r2 = np.where(r2 >= 0, r2, np.inf)
+        t[quad] = np.minimum(r1, r2)[quad]
+
+    # A target sitting on the shooter is hit immediately.
+    t[c == 0] = 0.0
+
+    valid = np.isfinite(t) & (t <= ttl)
+    times = np.clip(np.where(np.isfinite(t), t, ttl), 0.0, ttl)
+    points = target_pos + v * times[:, None]
+
+    return Intercept(points, times, valid)
@@ -0,0 +1,40 @@
+from typing import Optional, Tuple
+
+
+class KeyboardControl:
+    """
+    Manual steering with w/a/s/d, as an optional plugin of MyBot. The
+    `keyboard` package is only imported by `load`: on Linux it needs root
+    (or access to /dev/uinput), so a bot that does not ask for manual
+    control starts without it.
+    """
+
+    def __init__(self, keyboard, speed: float = 10):
+        self.keyboard = keyboard
+        self.speed = speed
+
+    @classmethod
+    def load(cls, speed: float = 10) -> Optional["KeyboardControl"]:
+        """The plugin, or None (with the reason printed) if `keyboard` is unavailable."""
+        try:
+            import keyboard
+        except (ImportError, OSError) as e:
+            print(f"Manual control disabled: {e}")
+            return None
+        return cls(keyboard, speed)
+
+    def move(self, x: float, y: float) -> Optional[Tuple[float, float]]:
+        """The destination the pressed keys point to from (x, y), or None if none is pressed."""
+        move_x, move_y = 0, 0
+        if self.keyboard.is_pressed('w'):
+            move_y -= self.speed
+        if self.keyboard.is_pressed('s'):
+            move_y += self.speed
+        if self.keyboard.is_pressed('a'):
+            move_x -= self.speed
+        if self.keyboard.is_pressed('d'):
+            move_x += self.speed
+
+        if move_x == 0 and move_y == 0:
+            return None
+        return (x + move_x, y + move_y)
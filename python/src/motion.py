@@ -0,0 +1,197 @@
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from core.consts import Consts
+from core.game_state import GameState
+
+
+MAP_SIZE = np.array([Consts.Map.WIDTH * Consts.Map.CELL_WIDTH, Consts.Map.HEIGHT * Consts.Map.CELL_HEIGHT])
+
+# Players turn instantly when given a new destination, so the velocity may
+# jump by about a full SPEED at every tick. Positions come straight from the
+# server; the measurement noise only absorbs tick timing jitter.
+VELOCITY_CHANGE_STD = Consts.Player.SPEED
+MEASUREMENT_STD = 0.05
+INITIAL_VELOCITY_STD = Consts.Player.SPEED
+
+
+class MotionEstimator:
+    """
+    Constant-velocity Kalman filter over every visible player, updated for
+    all of them at once. The state of a player is [x, y, vx, vy] with its
+    4x4 covariance; a player is reset (zero velocity, wide velocity
+    uncertainty) when first seen, when it dies, and when it reappears far
+    from where it was, i.e. after a respawn.
+    """
+
+    def __init__(self, capacity: int = 16):
+        self.slots: Dict[str, int] = {}
+        self.state = np.zeros((capacity, 4))
+        self.covariance = np.zeros((capacity, 4, 4))
+        self.last_tick = np.zeros(capacity, dtype=np.int64)
+        self.alive = np.zeros(capacity, dtype=bool)
+        # Updates since the player was last (re)initialised; one is not enough for a velocity.
+        self.updates = np.zeros(capacity, dtype=np.int64)
+
+    def reset(self) -> None:
+        self.slots.clear()
+        self.alive[:] = False
+
+    def _slot(self, name: str) -> int:
+        slot = self.slots.get(name)
+        if slot is None:
+            slot = len(self.slots)
+            if slot == len(self.state):
+                grow = len(self.state)
+                self.state = np.concatenate([self.state, np.zeros((grow, 4))])
+                self.covariance = np.concatenate([self.covariance, np.zeros((grow, 4, 4))])
+                self.last_tick = np.concatenate([self.last_tick, np.zeros(grow, dtype=np.int64)])
+                self.alive = np.concatenate([self.alive, np.zeros(grow, dtype=bool)])
+                self.updates = np.concatenate([self.updates, np.zeros(grow, dtype=np.int64)])
+            self.slots[name] = slot
+        return slot
+
+    @staticmethod
+    def _transition(dt: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Batched F and Q for per-player time steps. The velocity change is
+        modelled as happening at the start of each tick (a new destination),
+        so it moves the position by the whole step.
+        """
+        n = len(dt)
+        F = np.tile(np.eye(4), (n, 1, 1))
+        F[:, 0, 2] = dt
+        F[:, 1, 3] = dt
+
+        ticks = np.maximum(dt / Consts.Game.TICK_DURATION, 1.0)
+        q = VELOCITY_CHANGE_STD ** 2 * ticks
+        Q = np.zeros((n, 4, 4))
+        for axis in (0, 1):
+            Q[:, axis, axis] = q * dt ** 2
+            Q[:, axis, axis + 2] = Q[:, axis + 2, axis] = q * dt
+            Q[:, axis + 2, axis + 2] = q
+        return F, Q
+
+    def update(self, game_state: GameState) -> None:
+        tick = game_state.current_tick
+        names, measured, alive = [], [], []
+        for p in game_state.players:
+            names.append(p.name)
+            measured.append((p.pos.x, p.pos.y))
+            alive.append(p.isAlive())
+        if not names:
+            return
+
+        slots = np.array([self._slot(name) for name in names])
+        z = np.array(measured)
+        alive = np.array(alive)
+        known = self.alive[slots]
+
+        dt = np.maximum(tick - self.last_tick[slots], 1) * Consts.Game.TICK_DURATION
+        F, Q = self._transition(dt)
+        x = np.einsum('nij,nj->ni', F, self.state[slots])
+        P = F @ self.covariance[slots] @ F.transpose(0, 2, 1) + Q
+
+        # Position-only measurement: H = [I 0].
+        S = P[:, :2, :2] + np.eye(2) * MEASUREMENT_STD ** 2
+        K = P[:, :, :2] @ np.linalg.inv(S)
+        innovation = z - x[:, :2]
+        x = x + np.einsum('nij,nj->ni', K, innovation)
+        P = P - K @ P[:, :2, :]
+
+        # Nobody walks faster than SPEED; anything faster is a wall stop catching up or noise.
+        speed = np.hypot(x[:, 2], x[:, 3])
+        too_fast = speed > Consts.Player.SPEED
+        x[too_fast, 2:] *= (Consts.Player.SPEED / speed[too_fast])[:, None]
+
+        # Resets: new, previously dead, or teleported (respawn) players.
+        jumped = np.hypot(innovation[:, 0], innovation[:, 1]) > 1.5 * Consts.Player.SPEED * dt + 1.0
+        reset = ~known | jumped
+        if reset.any():
+            x[reset] = np.column_stack([z[reset], np.zeros((reset.sum(), 2))])
+            P[reset] = np.diag([MEASUREMENT_STD ** 2] * 2 + [INITIAL_VELOCITY_STD ** 2] * 2)
+
+        self.state[slots] = x
+        self.covariance[slots] = P
+        self.updates[slots] = np.where(reset, 1, self.updates[slots] + 1)
+        self.last_tick[slots] = tick
+        self.alive[slots] = alive
+
+        gone = np.ones(len(self.alive), dtype=bool)
+        gone[slots] = False
+        self.alive[gone] = False
+
+    def velocities(self, names: Sequence[str]) -> np.ndarray:
+        """(N, 2) estimated velocities; zero for unknown players."""
+        out = np.zeros((len(names), 2))
+        for i, name in enumerate(names):
+            slot = self.slots.get(name)
+            if slot is not None and self.alive[slot]:
+                out[i] = self.state[slot, 2:]
+        return out
+
+    def _rows(self, names: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Indices into `names` of the tracked, alive players and their slots."""
+        rows = [(i, self.slots[name]) for i, name in enumerate(names)
+                if name in self.slots and self.alive[self.slots[name]]]
+        if not rows:
+            return np.zeros(0, dtype=int), np.zeros(0, dtype=int)
+        return tuple(map(np.array, zip(*rows)))
+
+    def predict(self, names: Sequence[str], lead: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Positions `lead` seconds after the last update, as (N, 2) means and
+        (N, 2, 2) covariances, for the given players (unknown or dead ones get
+        NaN).
+        """
+        means = np.full((len(names), 2), np.nan)
+        covariances = np.full((len(names), 2, 2), np.nan)
+        index, slots = self._rows(names)
+        if not len(slots):
+            return means, covariances
+
+        F, Q = self._transition(np.full(len(slots), float(lead)))
+        x = np.einsum('nij,nj->ni', F, self.state[slots])
+        P = F @ self.covariance[slots] @ F.transpose(0, 2, 1) + Q
+
+        means[index] = np.clip(x[:, :2], 0, MAP_SIZE)
+        covariances[index] = P[:, :2, :2]
+        return means, covariances
+
+    def trajectories(self, names: Sequence[str], times: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Predictions at several leads in one batch: `times` is (T,) seconds
+        for everyone or (N, T) per player. Returns (N, T, 2) means and (N, T)
+        isotropic 1-sigma position uncertainties (NaN for unknown or dead
+        players).
+        """
+        times = np.broadcast_to(np.asarray(times, dtype=float), (len(names), np.shape(times)[-1]))
+        means = np.full(times.shape + (2,), np.nan)
+        stds = np.full(times.shape, np.nan)
+        index, slots = self._rows(names)
+        if not len(slots):
+            return means, stds
+
+        # predict() in closed form: x + v t, and the trace of the position block
+        # of F P F' + Q, without building a 4x4 system per (player, lead).
+        t = times[index]
+        state, P = self.state[slots], self.covariance[slots]
+        means[index] = np.clip(state[:, None, :2] + state[:, None, 2:] * t[..., None], 0, MAP_SIZE)
+
+        q = VELOCITY_CHANGE_STD ** 2 * np.maximum(t / Consts.Game.TICK_DURATION, 1.0)
+        position = (P[:, 0, 0] + P[:, 1, 1])[:, None] / 2
+        cross = (P[:, 0, 2] + P[:, 1, 3])[:, None]
+        velocity = (P[:, 2, 2] + P[:, 3, 3])[:, None] / 2
+        stds[index] = np.sqrt(position + cross * t + (velocity + q) * t * t)
+        return means, stds
+
+    def position_std(self, names: Sequence[str], lead: float) -> np.ndarray:
+        """Isotropic 1-sigma position uncertainty at `lead` seconds."""
+        _, covariances = self.predict(names, lead)
+        return np.sqrt(np.trace(covariances, axis1=1, axis2=2) / 2)
+
+    def known(self, names: Sequence[str]) -> List[bool]:
+        """Whether each player's velocity comes from at least two updates since it was (re)initialised."""
+        return [name in self.slots and bool(self.alive[self.slots[name]]) and int(self.updates[self.slots[name]]) >= 2
+                for name in names]
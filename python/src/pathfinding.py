@@ -0,0 +1,255 @@
+import heapq
+import math
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from core.action import MoveAction
+from core.consts import Consts
+from src.wall_map import WallMap, OFFSETS, RIGHT, BOTTOM, LEFT
+
+
+Node = Tuple[int, int]
+INF = math.inf
+
+
+class CellGrid:
+    """
+    Search graph with one node per map cell. Unknown edges are assumed open.
+    Costs are counted in whole node steps so D* Lite keys compare exactly.
+    """
+
+    def __init__(self, wall_map: WallMap):
+        self.wall_map = wall_map
+        self.size = wall_map.size
+        self.step = 1
+
+    def node_of(self, x: float, y: float) -> Node:
+        return self.wall_map.cell_of(x, y)
+
+    def position(self, node: Node) -> Tuple[float, float]:
+        return (node[0] + 0.5) * Consts.Map.CELL_WIDTH, (node[1] + 0.5) * Consts.Map.CELL_HEIGHT
+
+    def neighbours(self, node: Node) -> Iterator[Node]:
+        return self.wall_map.neighbours(*node)
+
+    def heuristic(self, a: Node, b: Node) -> int:
+        return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+    def edge_nodes(self, x: int, y: int, direction: int) -> List[Tuple[Node, Node]]:
+        dx, dy = OFFSETS[direction]
+        return [((x, y), (x + dx, y + dy))]
+
+
+class SubCellGrid(CellGrid):
+    """
+    Search graph that splits every cell into `resolution` x `resolution`
+    sub-cells. Moves inside a cell are always open; moves across a cell
+    boundary follow the wall map.
+    """
+
+    def __init__(self, wall_map: WallMap, resolution: int = 2):
+        super().__init__(wall_map)
+        self.resolution = resolution
+        self.size = wall_map.size * resolution
+
+    def node_of(self, x: float, y: float) -> Node:
+        sx = int(x * self.resolution // Consts.Map.CELL_WIDTH)
+        sy = int(y * self.resolution // Consts.Map.CELL_HEIGHT)
+        return min(max(sx, 0), self.size - 1), min(max(sy, 0), self.size - 1)
+
+    def position(self, node: Node) -> Tuple[float, float]:
+        return ((node[0] + 0.5) * Consts.Map.CELL_WIDTH / self.resolution,
+                (node[1] + 0.5) * Consts.Map.CELL_HEIGHT / self.resolution)
+
+    def neighbours(self, node: Node) -> Iterator[Node]:
+        sx, sy = node
+        r = self.resolution
+        for direction, (dx, dy) in enumerate(OFFSETS):
+            nx, ny = sx + dx, sy + dy
+            if not (0 <= nx < self.size and 0 <= ny < self.size):
+                continue
+            cx, cy = sx // r, sy // r
+            if (nx // r, ny // r) != (cx, cy) and self.wall_map.has_wall(cx, cy, direction):
+                continue
+            yield nx, ny
+
+    def edge_nodes(self, x: int, y: int, direction: int) -> List[Tuple[Node, Node]]:
+        r = self.resolution
+        dx, dy = OFFSETS[direction]
+        if direction in (LEFT, RIGHT):
+            sx = x * r + (r - 1 if direction == RIGHT else 0)
+            return [((sx, y * r + i), (sx + dx, y * r + i)) for i in range(r)]
+        sy = y * r + (r - 1 if direction == BOTTOM else 0)
+        return [((x * r + i, sy), (x * r + i, sy + dy)) for i in range(r)]
+
+
+def astar(grid: CellGrid, start: Node, goal: Node) -> Optional[List[Node]]:
+    g = {start: 0}
+    parent: Dict[Node, Node] = {}
+    heap = [(grid.heuristic(start, goal), 0, start)]
+
+    while heap:
+        _, cost, node = heapq.heappop(heap)
+        if node == goal:
+            path = [node]
+            while node in parent:
+                node = parent[node]
+                path.append(node)
+            return path[::-1]
+
+        if cost > g[node]:
+            continue
+
+        for neighbour in grid.neighbours(node):
+            new_cost = cost + grid.step
+            if new_cost < g.get(neighbour, INF):
+                g[neighbour] = new_cost
+                parent[neighbour] = node
+                heapq.heappush(heap, (new_cost + grid.heuristic(neighbour, goal), new_cost, neighbour))
+
+    return None
+
+
+class DStarLite:
+    """
+    Incremental planner (D* Lite). The plan is searched backwards from the
+    goal, so when a wall is discovered only the vertices whose cost actually
+    changes are repaired instead of searching from scratch.
+    """
+
+    def __init__(self, grid: CellGrid, start: Node, goal: Node):
+        self.grid = grid
+        self.start = start
+        self.goal = goal
+        self.last = start
+        self.km = 0
+        self.g: Dict[Node, float] = {}
+        self.rhs: Dict[Node, float] = {goal: 0}
+        self.queue: List[Tuple[Tuple[float, float], Node]] = []
+        self.queued: Dict[Node, Tuple[float, float]] = {}
+        self._push(goal)
+
+    def _key(self, node: Node) -> Tuple[float, float]:
+        best = min(self.g.get(node, INF), self.rhs.get(node, INF))
+        return best + self.grid.heuristic(self.start, node) + self.km, best
+
+    def _push(self, node: Node) -> None:
+        key = self._key(node)
+        self.queued[node] = key
+        heapq.heappush(self.queue, (key, node))
+
+    def _top(self) -> Tuple[Tuple[float, float], Optional[Node]]:
+        while self.queue:
+            key, node = self.queue[0]
+            if self.queued.get(node) == key:
+                return key, node
+            heapq.heappop(self.queue)
+        return (INF, INF), None
+
+    def _update(self, node: Node) -> None:
+        if node != self.goal:
+            self.rhs[node] = min(
+                (self.grid.step + self.g.get(n, INF) for n in self.grid.neighbours(node)), default=INF
+            )
+        self.queued.pop(node, None)
+        if self.g.get(node, INF) != self.rhs.get(node, INF):
+            self._push(node)
+
+    def compute(self) -> None:
+        while True:
+            top_key, node = self._top()
+            start_key = self._key(self.start)
+            if node is None or (top_key >= start_key and self.rhs.get(self.start, INF) == self.g.get(self.start, INF)):
+                return
+
+            heapq.heappop(self.queue)
+            del self.queued[node]
+
+            new_key = self._key(node)
+            if top_key < new_key:
+                self._push(node)
+            elif self.g.get(node, INF) > self.rhs.get(node, INF):
+                self.g[node] = self.rhs[node]
+                for n in self.grid.neighbours(node):
+                    self._update(n)
+            else:
+                self.g[node] = INF
+                self._update(node)
+                for n in self.grid.neighbours(node):
+                    self._update(n)
+
+    def move_start(self, start: Node) -> None:
+        if start == self.start:
+            return
+        self.start = start
+        self.km += self.grid.heuristic(self.last, start)
+        self.last = start
+
+    def notify_wall(self, x: int, y: int, direction: int) -> None:
+        """Call after the wall map changed at cell (x, y) in `direction`."""
+        self.km += self.grid.heuristic(self.last, self.start)
+        self.last = self.start
+        for u, v in self.grid.edge_nodes(x, y, direction):
+            self._update(u)
+            self._update(v)
+
+    def path(self, limit: int = 10_000) -> Optional[List[Node]]:
+        self.compute()
+        if self.g.get(self.start, INF) == INF:
+            return None
+
+        node, path = self.start, [self.start]
+        while node != self.goal and len(path) < limit:
+            node = min(self.grid.neighbours(node), key=lambda n: self.g.get(n, INF))
+            path.append(node)
+        return path
+
+
+def waypoints(grid: CellGrid, path: List[Node]) -> List[Tuple[float, float]]:
+    """World positions at every turn of the path, ending on the goal."""
+    if len(path) < 2:
+        return [grid.position(node) for node in path]
+
+    points = []
+    for prev, node, nxt in zip(path, path[1:], path[2:]):
+        if (node[0] - prev[0], node[1] - prev[1]) != (nxt[0] - node[0], nxt[1] - node[1]):
+            points.append(grid.position(node))
+    points.append(grid.position(path[-1]))
+    return points
+
+
+class Navigator:
+    """Keeps a D* Lite plan toward a goal and turns it into MoveActions."""
+
+    def __init__(self, wall_map: WallMap, resolution: int = 1):
+        self.resolution = resolution
+        self.set_map(wall_map)
+
+    def set_map(self, wall_map: WallMap) -> None:
+        self.wall_map = wall_map
+        self.grid = CellGrid(wall_map) if self.resolution <= 1 else SubCellGrid(wall_map, self.resolution)
+        self.planner: Optional[DStarLite] = None
+
+    def notify_wall(self, x: int, y: int, direction: int) -> None:
+        if self.planner is not None:
+            self.planner.notify_wall(x, y, direction)
+
+    def plan(self, pos: Tuple[float, float], goal_pos: Tuple[float, float]) -> Optional[List[Node]]:
+        start, goal = self.grid.node_of(*pos), self.grid.node_of(*goal_pos)
+        if self.planner is None or self.planner.goal != goal:
+            self.planner = DStarLite(self.grid, start, goal)
+        else:
+            self.planner.move_start(start)
+        return self.planner.path()
+
+    def move(self, pos: Tuple[float, float], goal_pos: Tuple[float, float]) -> Optional[MoveAction]:
+        path = self.plan(pos, goal_pos)
+        if path is None:
+            return None
+        if len(path) == 1:
+            return MoveAction(goal_pos)
+
+        points = waypoints(self.grid, path)
+        # No turn left before the goal node: head straight for the exact goal position.
+        if len(points) == 1:
+            return MoveAction(goal_pos)
+        return MoveAction(points[0])
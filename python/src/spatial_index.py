@@ -0,0 +1,142 @@
+import math
+from collections import defaultdict
+from functools import cached_property
+from typing import Callable, Dict, Generic, Iterable, List, Optional, Tuple, TypeVar
+
+from core.consts import Consts
+from core.game_state import Coin, GameState, PlayerInfo, Projectile
+
+
+T = TypeVar("T")
+
+
+class SpatialHash(Generic[T]):
+    """Uniform grid of buckets; each bucket holds (x, y, item) entries."""
+
+    def __init__(self, bucket_size: float = Consts.Map.CELL_WIDTH):
+        self.bucket_size = bucket_size
+        self.buckets: Dict[Tuple[int, int], List[Tuple[float, float, T]]] = defaultdict(list)
+        self.count = 0
+        self.bounds = (0, 0, 0, 0)
+
+    def _bucket(self, x: float, y: float) -> Tuple[int, int]:
+        return int(x // self.bucket_size), int(y // self.bucket_size)
+
+    def insert(self, x: float, y: float, item: T) -> None:
+        bx, by = self._bucket(x, y)
+        self.buckets[(bx, by)].append((x, y, item))
+        if self.count == 0:
+            self.bounds = (bx, bx, by, by)
+        else:
+            min_x, max_x, min_y, max_y = self.bounds
+            self.bounds = (min(min_x, bx), max(max_x, bx), min(min_y, by), max(max_y, by))
+        self.count += 1
+
+    def _last_ring(self, bx: int, by: int) -> int:
+        min_x, max_x, min_y, max_y = self.bounds
+        return max(bx - min_x, max_x - bx, by - min_y, max_y - by, 0)
+
+    def _ring(self, bx: int, by: int, ring: int) -> Iterable[Tuple[float, float, T]]:
+        if ring == 0:
+            yield from self.buckets.get((bx, by), ())
+            return
+        for i in range(-ring, ring + 1):
+            for key in ((bx + i, by - ring), (bx + i, by + ring)):
+                yield from self.buckets.get(key, ())
+        for j in range(-ring + 1, ring):
+            for key in ((bx - ring, by + j), (bx + ring, by + j)):
+                yield from self.buckets.get(key, ())
+
+    def within(self, x: float, y: float, radius: float,
+               predicate: Optional[Callable[[T], bool]] = None) -> List[Tuple[float, T]]:
+        """(distance, item) for every item within `radius`, closest first."""
+        bx, by = self._bucket(x, y)
+        rings = int(math.ceil(radius / self.bucket_size))
+        found = []
+        for ring in range(min(rings, self._last_ring(bx, by)) + 1):
+            for ix, iy, item in self._ring(bx, by, ring):
+                d = math.hypot(ix - x, iy - y)
+                if d <= radius and (predicate is None or predicate(item)):
+                    found.append((d, item))
+        found.sort(key=lambda entry: entry[0])
+        return found
+
+    def nearest(self, x: float, y: float, k: int = 1,
+                predicate: Optional[Callable[[T], bool]] = None) -> List[Tuple[float, T]]:
+        """The k closest items as (distance, item), closest first."""
+        if self.count == 0:
+            return []
+
+        bx, by = self._bucket(x, y)
+        last_ring = self._last_ring(bx, by)
+        found: List[Tuple[float, T]] = []
+        for ring in range(last_ring + 1):
+            for ix, iy, item in self._ring(bx, by, ring):
+                if predicate is None or predicate(item):
+                    found.append((math.hypot(ix - x, iy - y), item))
+
+            # Anything beyond this ring is at least `ring` whole buckets away.
+            if len(found) >= k:
+                found.sort(key=lambda entry: entry[0])
+                if found[k - 1][0] <= ring * self.bucket_size:
+                    break
+        found.sort(key=lambda entry: entry[0])
+        return found[:k]
+
+
+class GameIndex:
+    """
+    Spatial indexes over one GameState, aligned to Consts.Map.CELL_WIDTH, plus
+    an O(1) name to player lookup. Build one per tick. The projectile index is
+    only built on first use, so lazily decoded projectiles stay undecoded on
+    ticks that never query them.
+    """
+
+    def __init__(self, game_state: GameState):
+        self.game_state = game_state
+        self.players: SpatialHash[PlayerInfo] = SpatialHash()
+        self.coins: SpatialHash[Coin] = SpatialHash()
+        self.by_name: Dict[str, PlayerInfo] = {}
+
+        for player in game_state.players:
+            self.by_name[player.name] = player
+            if player.isAlive():
+                self.players.insert(player.pos.x, player.pos.y, player)
+
+        for coin in game_state.coins:
+            self.coins.insert(coin.pos.x, coin.pos.y, coin)
+
+    @cached_property
+    def projectiles(self) -> SpatialHash[Tuple[PlayerInfo, Projectile]]:
+        projectiles = SpatialHash()
+        for player in self.game_state.players:
+            for projectile in player.projectiles:
+                projectiles.insert(projectile.pos.x, projectile.pos.y, (player, projectile))
+        return projectiles
+
+    def player(self, name: str) -> Optional[PlayerInfo]:
+        return self.by_name.get(name)
+
+    def nearest_enemy(self, name: str) -> Optional[PlayerInfo]:
+        me = self.by_name.get(name)
+        if me is None:
+            return None
+        found = self.players.nearest(me.pos.x, me.pos.y, predicate=lambda p: p.name != name)
+        return found[0][1] if found else None
+
+    def nearest_coins(self, x: float, y: float, k: int = 1) -> List[Coin]:
+        return [coin for _, coin in self.coins.nearest(x, y, k)]
+
+    def enemies_within(self, name: str, radius: float) -> List[PlayerInfo]:
+        me = self.by_name.get(name)
+        if me is None:
+            return []
+        return [p for _, p in self.players.within(me.pos.x, me.pos.y, radius, predicate=lambda p: p.name != name)]
+
+    def enemies_in_blade_reach(self, name: str) -> List[PlayerInfo]:
+        return self.enemies_within(name, Consts.Blade.LENGTH + Consts.Player.SIZE / 2)
+
+    def projectiles_within(self, x: float, y: float, radius: float, exclude_owner: Optional[str] = None
+                           ) -> List[Tuple[PlayerInfo, Projectile]]:
+        predicate = None if exclude_owner is None else (lambda entry: entry[0].name != exclude_owner)
+        return [entry for _, entry in self.projectiles.within(x, y, radius, predicate)]
@@ -0,0 +1,122 @@
+import math
+from typing import Optional, Tuple
+
+import numpy as np
+
+from core.consts import Consts
+from core.game_state import GameState
+
+
+HIT_RADIUS = (Consts.Player.SIZE + Consts.Projectile.SIZE) / 2
+
+
+def first_contact(r0: np.ndarray, w: np.ndarray, lo: np.ndarray, hi: np.ndarray,
+                  radius: float = HIT_RADIUS) -> np.ndarray:
+    """
+    Earliest t in [lo, hi] with |r0 + w t| <= radius, element-wise over the
+    leading axes of r0/w (last axis is x, y). Returns inf where there is none.
+    """
+    a = np.sum(w * w, axis=-1)
+    b = 2.0 * np.sum(r0 * w, axis=-1)
+    c = np.sum(r0 * r0, axis=-1) - radius * radius
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        disc = b * b - 4.0 * a * c
+        root = np.sqrt(np.maximum(disc, 0.0))
+        moving = a > 1e-12
+        t_in = np.where(moving, (-b - root) / (2.0 * a), np.where(c <= 0, -np.inf, np.inf))
+        t_out = np.where(moving, (-b + root) / (2.0 * a), np.where(c <= 0, np.inf, -np.inf))
+
+    touching = (~moving | (disc >= 0)) & (t_in <= hi) & (t_out >= lo) & (lo <= hi)
+    return np.where(touching, np.maximum(t_in, lo), np.inf)
+
+
+class ThreatForecaster:
+    """
+    Forecasts which enemy projectiles will hit a player within the next
+    `horizon_ticks` ticks. Projectiles fly from `pos` toward `dest` at
+    Consts.Projectile.SPEED and vanish on arrival. Every query is a single
+    batched swept-circle test over all projectiles.
+    """
+
+    def __init__(self, horizon_ticks: int = 3):
+        self.horizon = horizon_ticks * Consts.Game.TICK_DURATION
+        self.pos = np.zeros((0, 2))
+        self.vel = np.zeros((0, 2))
+        self.end = np.zeros(0)
+
+    def update(self, game_state: GameState, my_name: str) -> None:
+        pos, dest = [], []
+        for player in game_state.players:
+            if player.name == my_name:
+                continue
+            for projectile in player.projectiles:
+                pos.append((projectile.pos.x, projectile.pos.y))
+                dest.append((projectile.dest.x, projectile.dest.y))
+
+        self.pos = np.array(pos, dtype=float).reshape(-1, 2)
+        travel = np.array(dest, dtype=float).reshape(-1, 2) - self.pos
+        length = np.hypot(travel[:, 0], travel[:, 1])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.vel = np.where(length[:, None] > 1e-9, travel / length[:, None] * Consts.Projectile.SPEED, 0.0)
+        self.end = np.minimum(length / Consts.Projectile.SPEED, self.horizon)
+
+    def incoming(self, pos: Tuple[float, float], vel: Tuple[float, float] = (0.0, 0.0)) -> np.ndarray:
+        """Time until each projectile hits a player at `pos` moving at `vel` (inf when it misses)."""
+        r0 = self.pos - np.asarray(pos, dtype=float)
+        w = self.vel - np.asarray(vel, dtype=float)
+        return first_contact(r0, w, np.zeros_like(self.end), self.end)
+
+    def hit_ticks(self, pos: Tuple[float, float], vel: Tuple[float, float] = (0.0, 0.0)) -> np.ndarray:
+        """Tick index (0 = current tick) of each hit, -1 when the projectile misses."""
+        times = self.incoming(pos, vel)
+        ticks = np.full(times.shape, -1, dtype=int)
+        finite = np.isfinite(times)
+        ticks[finite] = (times[finite] // Consts.Game.TICK_DURATION).astype(int)
+        return ticks
+
+    def danger(self, pos: Tuple[float, float], candidates: np.ndarray) -> np.ndarray:
+        """
+        Expected damage for walking from `pos` toward each candidate
+        destination (k, 2), weighted so earlier hits count more. The player
+        stops on reaching its candidate.
+        """
+        candidates = np.atleast_2d(np.asarray(candidates, dtype=float))
+        if len(self.pos) == 0:
+            return np.zeros(len(candidates))
+
+        start = np.asarray(pos, dtype=float)
+        travel = candidates - start
+        length = np.hypot(travel[:, 0], travel[:, 1])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            vel = np.where(length[:, None] > 1e-9, travel / length[:, None] * Consts.Player.SPEED, 0.0)
+        stop = np.minimum(length / Consts.Player.SPEED, self.horizon)
+
+        # (k, m) grids: candidate along axis 0, projectile along axis 1.
+        end = self.end[None, :]
+        walking = first_contact(
+            self.pos[None, :, :] - start,
+            self.vel[None, :, :] - vel[:, None, :],
+            np.zeros((1, 1)), np.minimum(stop[:, None], end),
+        )
+        standing = first_contact(
+            self.pos[None, :, :] - candidates[:, None, :],
+            np.broadcast_to(self.vel[None, :, :], (len(candidates),) + self.vel.shape),
+            stop[:, None], end,
+        )
+        hit = np.minimum(walking, standing)
+        weight = np.where(np.isfinite(hit), 1.0 - hit / (2.0 * self.horizon), 0.0)
+        return Consts.Projectile.DAMAGE * weight.sum(axis=1)
+
+    def safest(self, pos: Tuple[float, float], candidates: np.ndarray) -> Tuple[int, float]:
+        scores = self.danger(pos, candidates)
+        best = int(np.argmin(scores))
+        return best, float(scores[best])
+
+
+def candidate_ring(pos: Tuple[float, float], count: int = 12, radius: Optional[float] = None) -> np.ndarray:
+    """`count` destinations evenly spread around `pos`, two ticks of walking away by default."""
+    if radius is None:
+        radius = Consts.Player.SPEED * Consts.Game.TICK_DURATION * 2
+    angles = np.linspace(0.0, 2.0 * math.pi, count, endpoint=False)
+    return np.asarray(pos, dtype=float) + radius * np.stack([np.cos(angles), np.sin(angles)], axis=1)
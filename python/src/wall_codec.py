@@ -0,0 +1,61 @@
+import struct
+from dataclasses import dataclass
+from typing import Optional
+
+from src.wall_inference import WallInference
+
+
+SAVE_SIZE = 100
+SAVE_FORMAT = 1
+
+# Format, map size, save sequence number, tick, discrete grid fingerprint.
+_HEADER = struct.Struct('<BBHiI')
+
+
+@dataclass
+class SaveHeader:
+    format: int
+    size: int
+    sequence: int
+    tick: int
+    fingerprint: int
+
+
+def encode_walls(inference: WallInference, tick: int, sequence: int = 0) -> bytes:
+    """
+    Packs what the inference knows into a SaveAction payload: the 12-byte
+    header, then a "known" bitset and a "wall" bitset with one bit per
+    internal edge. For the 180 edges of a 10x10 map each bitset is 23 bytes,
+    so the payload is 12 + 2 * 23 = 58 bytes.
+    """
+    width = (len(inference.edges) + 7) // 8
+    data = _HEADER.pack(SAVE_FORMAT, inference.size, sequence & 0xFFFF, tick, inference.fingerprint)
+    data += inference.known.to_bytes(width, "little") + inference.walls.to_bytes(width, "little")
+    if len(data) > SAVE_SIZE:
+        raise ValueError(f"{len(data)} bytes do not fit in a {SAVE_SIZE} byte save")
+    return data
+
+
+def decode_header(data: bytes) -> Optional[SaveHeader]:
+    if len(data) < _HEADER.size:
+        return None
+    header = SaveHeader(*_HEADER.unpack_from(data))
+    return header if header.format == SAVE_FORMAT else None
+
+
+def decode_walls(data: bytes, inference: WallInference) -> Optional[SaveHeader]:
+    """
+    Restores a save made by encode_walls into `inference`. Returns its header,
+    or None when the save is empty, from another map or inconsistent.
+    """
+    header = decode_header(bytes(data))
+    if header is None or header.size != inference.size or header.fingerprint != inference.fingerprint:
+        return None
+
+    width = (len(inference.edges) + 7) // 8
+    offset = _HEADER.size
+    if len(data) < offset + 2 * width:
+        return None
+    known = int.from_bytes(data[offset:offset + width], "little")
+    walls = int.from_bytes(data[offset + width:offset + 2 * width], "little")
+    return header if inference.restore(known, walls) else None
@@ -0,0 +1,261 @@
+import zlib
+from collections import deque
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from core.consts import Consts
+from core.map_state import MapState
+from src.wall_map import WallMap, TOP, RIGHT, BOTTOM, LEFT
+
+
+OPEN, WALL, UNKNOWN = 0, 1, -1
+
+
+def _bits(mask: int) -> Iterable[int]:
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class WallInference:
+    """
+    Deduces walls from MapState.discrete_grid. Every grid entry constrains
+    the number of walls among the 12 edges of its 2x2 block; with `connected`
+    every cell also keeps at least one open side. Edges are indexed like
+    WallMap.edge_index and tracked as two bitsets: `known` and `walls`.
+
+    Propagation combines a unit rule (a constraint already at its bound
+    decides all its unknown edges) with a pairwise rule on overlapping
+    constraints (bounds on the shared edges decide the rest). observe()
+    re-propagates only from the constraints touching the observed edge.
+    """
+
+    def __init__(self, size: int = Consts.Map.WIDTH, grid: Optional[List[List[int]]] = None, connected: bool = True):
+        self.layout = WallMap(size)
+        self.size = size
+        self.edges = self.layout.internal_edges()
+        self.known = 0
+        self.walls = 0
+        self.fingerprint = zlib.crc32(bytes(count for row in grid for count in row)) if grid else 0
+
+        self.masks: List[int] = []
+        self.lo: List[int] = []
+        self.hi: List[int] = []
+        self.blocks = 0
+        if grid:
+            self._add_blocks(grid)
+        if connected:
+            self._add_cells()
+
+        self.edge_constraints: List[List[int]] = [[] for _ in self.edges]
+        for c, mask in enumerate(self.masks):
+            for e in _bits(mask):
+                self.edge_constraints[e].append(c)
+        self.neighbours = [sorted({o for e in _bits(mask) for o in self.edge_constraints[e]} - {c})
+                           for c, mask in enumerate(self.masks)]
+
+        result = self._propagate(range(len(self.masks)), 0, 0)
+        if result is None:
+            raise ValueError("discrete grid is inconsistent")
+        self.known, self.walls, _ = result
+
+    @classmethod
+    def from_map_state(cls, map_state: Optional[MapState], connected: bool = True) -> "WallInference":
+        if map_state is None or not map_state.discrete_grid:
+            return cls(connected=connected)
+        return cls(2 * len(map_state.discrete_grid), map_state.discrete_grid, connected)
+
+    def _add_blocks(self, grid: List[List[int]]) -> None:
+        for by, row in enumerate(grid):
+            for bx, count in enumerate(row):
+                x0, y0 = 2 * bx, 2 * by
+                sides = []
+                for i in range(2):
+                    sides += [(x0 + i, y0, TOP), (x0 + i, y0 + 1, BOTTOM), (x0, y0 + i, LEFT), (x0 + 1, y0 + i, RIGHT),
+                              (x0 + i, y0, BOTTOM), (x0, y0 + i, RIGHT)]
+
+                # The outer border counts, and is always a wall.
+                mask, border = 0, 0
+                for side in sides:
+                    e = self.layout.edge_index(*side)
+                    if e is None:
+                        border += 1
+                    else:
+                        mask |= 1 << e
+                self.masks.append(mask)
+                self.lo.append(count - border)
+                self.hi.append(count - border)
+                self.blocks += 1
+
+    def _add_cells(self) -> None:
+        for y in range(self.size):
+            for x in range(self.size):
+                mask = 0
+                for direction in range(4):
+                    e = self.layout.edge_index(x, y, direction)
+                    if e is not None:
+                        mask |= 1 << e
+                self.masks.append(mask)
+                self.lo.append(0)
+                self.hi.append(mask.bit_count() - 1)
+
+    def _propagate(self, queue: Iterable[int], known: int, walls: int) -> Optional[Tuple[int, int, List[int]]]:
+        """Runs both rules to a fixed point. None if the constraints contradict each other."""
+        pending = deque(queue)
+        queued = set(pending)
+        decided = []
+
+        while pending:
+            c = pending.popleft()
+            queued.discard(c)
+
+            mask = self.masks[c]
+            unknown = mask & ~known
+            placed = (walls & mask).bit_count()
+            lo, hi, n = self.lo[c] - placed, self.hi[c] - placed, unknown.bit_count()
+            if lo > n or hi < 0:
+                return None
+            if not unknown:
+                continue
+
+            new_open = new_wall = 0
+            if hi == 0:
+                new_open = unknown
+            elif lo == n:
+                new_wall = unknown
+            else:
+                for other in self.neighbours[c]:
+                    other_unknown = self.masks[other] & ~known
+                    overlap = unknown & other_unknown
+                    rest = unknown & ~overlap
+                    if not overlap or not rest:
+                        continue
+
+                    # Walls on the shared edges, as bounded by the other constraint.
+                    other_placed = (walls & self.masks[other]).bit_count()
+                    least = max(0, self.lo[other] - other_placed - (other_unknown & ~overlap).bit_count())
+                    most = min(self.hi[other] - other_placed, overlap.bit_count())
+                    if hi - least < 0 or lo - most > rest.bit_count():
+                        return None
+                    if hi - least == 0:
+                        new_open = rest
+                        break
+                    if lo - most == rest.bit_count():
+                        new_wall = rest
+                        break
+
+            changed = new_open | new_wall
+            if not changed:
+                continue
+
+            known |= changed
+            walls |= new_wall
+            for e in _bits(changed):
+                decided.append(e)
+                for touched in self.edge_constraints[e]:
+                    for d in [touched] + self.neighbours[touched]:
+                        if d not in queued:
+                            queued.add(d)
+                            pending.append(d)
+
+        return known, walls, decided
+
+    def state(self, x: int, y: int, direction: int) -> int:
+        e = self.layout.edge_index(x, y, direction)
+        if e is None:
+            return WALL
+        if not (self.known >> e) & 1:
+            return UNKNOWN
+        return (self.walls >> e) & 1
+
+    def observe(self, x: int, y: int, direction: int, wall: bool = True) -> List[Tuple[int, int, int, bool]]:
+        """
+        Records a seen wall (or opening) and re-propagates. Returns every edge
+        decided as a result, the observed one included, as (x, y, direction,
+        wall). An observation contradicting what is known is ignored.
+        """
+        e = self.layout.edge_index(x, y, direction)
+        if e is None or (self.known >> e) & 1:
+            return []
+
+        bit = 1 << e
+        result = self._propagate(self.edge_constraints[e], self.known | bit, self.walls | (bit if wall else 0))
+        if result is None:
+            return []
+
+        self.known, self.walls, decided = result
+        return [self.edges[d] + (bool((self.walls >> d) & 1),) for d in [e] + decided]
+
+    def restore(self, known: int, walls: int) -> bool:
+        """
+        Merges previously learnt edges (e.g. from a save) and re-propagates.
+        Nothing is merged if they contradict the grid or what is known.
+        """
+        walls &= known
+        if (walls ^ self.walls) & known & self.known:
+            return False
+
+        result = self._propagate(range(len(self.masks)), self.known | known, self.walls | walls)
+        if result is None:
+            return False
+        self.known, self.walls, _ = result
+        return True
+
+    @property
+    def unknown_count(self) -> int:
+        return len(self.edges) - self.known.bit_count()
+
+    def wall_map(self) -> WallMap:
+        """The walls known for certain; unknown edges are left open."""
+        wall_map = WallMap(self.size)
+        for e in _bits(self.walls):
+            wall_map.set_wall(*self.edges[e])
+        wall_map.version = 0
+        return wall_map
+
+    def _mask_array(self, mask: int) -> np.ndarray:
+        return np.array([(mask >> e) & 1 for e in range(len(self.edges))], dtype=bool)
+
+    def probabilities(self, iterations: int = 30) -> np.ndarray:
+        """
+        Wall probability of every edge, in edge_index order. Known edges are 0
+        or 1; unknown ones are fitted so that the expected wall count of each
+        block matches what is left of its grid count.
+        """
+        known = self._mask_array(self.known)
+        walls = self._mask_array(self.walls)
+        p = walls.astype(float)
+        unknown = ~known
+        if not unknown.any():
+            return p
+
+        blocks = self.masks[:self.blocks]
+        incidence = np.zeros((len(blocks), len(self.edges)))
+        for c, mask in enumerate(blocks):
+            incidence[c] = self._mask_array(mask & ~self.known)
+        remaining = np.array([self.lo[c] - (self.walls & mask).bit_count() for c, mask in enumerate(blocks)], dtype=float)
+        degree = incidence.sum(axis=0)
+        constrained = unknown & (degree > 0)
+
+        density = remaining / np.maximum(incidence.sum(axis=1), 1)
+        p[unknown] = 0.5
+        p[constrained] = (incidence.T @ density)[constrained] / degree[constrained]
+
+        # Iterative proportional fitting of every block's expected wall count.
+        for _ in range(iterations):
+            expected = incidence @ p
+            ratio = np.where(expected > 0, remaining / np.maximum(expected, 1e-9), 1.0)
+            log_factor = incidence.T @ np.log(np.maximum(ratio, 1e-9))
+            p[constrained] *= np.exp(log_factor[constrained] / degree[constrained])
+            p[constrained] = np.clip(p[constrained], 1e-3, 1 - 1e-3)
+        return p
+
+    def probability(self, x: int, y: int, direction: int, probabilities: Optional[np.ndarray] = None) -> float:
+        e = self.layout.edge_index(x, y, direction)
+        if e is None:
+            return 1.0
+        if probabilities is None:
+            probabilities = self.probabilities()
+        return float(probabilities[e])
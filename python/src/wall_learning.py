@@ -0,0 +1,144 @@
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from core.consts import Consts
+from core.game_state import GameState
+from src.wall_inference import WallInference
+from src.wall_map import TOP, RIGHT, BOTTOM, LEFT
+
+
+# Log-odds added per stall against an edge, and needed before an edge is
+# taken as a wall.
+STALL_EVIDENCE = 1.2
+WALL_THRESHOLD = 2.0
+
+RADIUS = Consts.Player.SIZE / 2
+TICK_STEP = Consts.Player.SPEED * Consts.Game.TICK_DURATION
+
+
+class WallLearner:
+    """
+    Learns walls from how every visible player moves. Between two GameStates
+    a player that kept the same `dest` but made (almost) no progress along
+    an axis, while touching the cell side it was heading for, is evidence of
+    a wall on that side. A player crossing from a cell into its neighbour
+    proves the edge between them is open.
+
+    Evidence is accumulated as per-edge log-odds, starting from the
+    WallInference probabilities, for all players in one batched pass per
+    tick. Edges are handed to the inference once certain, so they propagate.
+    """
+
+    def __init__(self, inference: WallInference):
+        self.previous: Dict[str, Tuple[float, float, float, float, bool]] = {}
+        self.set_inference(inference)
+
+    def set_inference(self, inference: WallInference) -> None:
+        self.inference = inference
+        self.size = inference.size
+        p = np.clip(inference.probabilities(), 1e-3, 1 - 1e-3)
+        self.prior = np.log(p / (1 - p))
+        self.log_odds = self.prior.copy()
+        self.previous = {}
+
+    def _edge_indices(self, cx: np.ndarray, cy: np.ndarray, direction: int) -> np.ndarray:
+        """Vectorized WallMap.edge_index; -1 on the outer border."""
+        n = self.size
+        if direction == RIGHT:
+            return np.where(cx < n - 1, cy * (n - 1) + cx, -1)
+        if direction == LEFT:
+            return np.where(cx > 0, cy * (n - 1) + cx - 1, -1)
+        if direction == BOTTOM:
+            return np.where(cy < n - 1, n * (n - 1) + cy * n + cx, -1)
+        return np.where(cy > 0, n * (n - 1) + (cy - 1) * n + cx, -1)
+
+    def update(self, game_state: GameState) -> List[Tuple[int, int, int, bool]]:
+        """Folds in one tick; returns the edges the inference decided as a result."""
+        rows = []
+        current = {}
+        for player in game_state.players:
+            if not player.isAlive():
+                continue
+            has_dest = player.dest.x != 0.0 or player.dest.y != 0.0
+            state = (player.pos.x, player.pos.y, player.dest.x, player.dest.y, has_dest)
+            current[player.name] = state
+            before = self.previous.get(player.name)
+            if before is not None:
+                rows.append(before + state)
+        self.previous = current
+        if not rows:
+            return []
+
+        data = np.array(rows, dtype=float)
+        x0, y0, dx0, dy0, had_dest = data[:, 0], data[:, 1], data[:, 2], data[:, 3], data[:, 4].astype(bool)
+        x1, y1, dx1, dy1, has_dest = data[:, 5], data[:, 6], data[:, 7], data[:, 8], data[:, 9].astype(bool)
+
+        moved_x, moved_y = x1 - x0, y1 - y0
+        # Respawns teleport; anything faster than a tick of walking is not motion.
+        walked = np.hypot(moved_x, moved_y) <= 1.5 * TICK_STEP
+
+        cx0 = np.clip((x0 // Consts.Map.CELL_WIDTH).astype(int), 0, self.size - 1)
+        cy0 = np.clip((y0 // Consts.Map.CELL_HEIGHT).astype(int), 0, self.size - 1)
+        cx1 = np.clip((x1 // Consts.Map.CELL_WIDTH).astype(int), 0, self.size - 1)
+        cy1 = np.clip((y1 // Consts.Map.CELL_HEIGHT).astype(int), 0, self.size - 1)
+
+        decided = []
+
+        # Crossing into a side neighbour proves the edge open.
+        step_x = walked & (cy0 == cy1) & (np.abs(cx1 - cx0) == 1)
+        step_y = walked & (cx0 == cx1) & (np.abs(cy1 - cy0) == 1)
+        opened = np.concatenate([
+            self._edge_indices(np.minimum(cx0, cx1)[step_x], cy0[step_x], RIGHT),
+            self._edge_indices(cx0[step_y], np.minimum(cy0, cy1)[step_y], BOTTOM),
+        ])
+        for e in np.unique(opened[opened >= 0]):
+            self.log_odds[e] = -np.inf
+            decided += self.inference.observe(*self.inference.edges[e], wall=False)
+
+        # Stalls: same destination, heading into a side, and not getting anywhere.
+        to_x, to_y = dx0 - x0, dy0 - y0
+        distance = np.hypot(to_x, to_y)
+        expected = np.minimum(distance, TICK_STEP)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            want_x = np.where(distance > 0, to_x / distance * expected, 0.0)
+            want_y = np.where(distance > 0, to_y / distance * expected, 0.0)
+        steady = walked & had_dest & has_dest & (dx0 == dx1) & (dy0 == dy1) & (cx0 == cx1) & (cy0 == cy1)
+
+        left_side = cx1 * Consts.Map.CELL_WIDTH
+        top_side = cy1 * Consts.Map.CELL_HEIGHT
+        off_x, off_y = x1 - left_side, y1 - top_side
+        touch = RADIUS + 0.25
+        # Only trust a stall when the player is not straddling the perpendicular cell line.
+        inside_x = (off_y >= RADIUS) & (off_y <= Consts.Map.CELL_HEIGHT - RADIUS)
+        inside_y = (off_x >= RADIUS) & (off_x <= Consts.Map.CELL_WIDTH - RADIUS)
+
+        stalled_x = steady & inside_x & (np.abs(want_x) > 0.3 * TICK_STEP) & (np.abs(moved_x) < 0.25 * np.abs(want_x))
+        stalled_y = steady & inside_y & (np.abs(want_y) > 0.3 * TICK_STEP) & (np.abs(moved_y) < 0.25 * np.abs(want_y))
+
+        hits = []
+        for direction, mask in (
+            (RIGHT, stalled_x & (want_x > 0) & (Consts.Map.CELL_WIDTH - off_x <= touch)),
+            (LEFT, stalled_x & (want_x < 0) & (off_x <= touch)),
+            (BOTTOM, stalled_y & (want_y > 0) & (Consts.Map.CELL_HEIGHT - off_y <= touch)),
+            (TOP, stalled_y & (want_y < 0) & (off_y <= touch)),
+        ):
+            hits.append(self._edge_indices(cx1[mask], cy1[mask], direction))
+        hits = np.concatenate(hits)
+        hits = hits[hits >= 0]
+        if hits.size:
+            np.add.at(self.log_odds, hits, STALL_EVIDENCE)
+            for e in np.unique(hits):
+                if self.log_odds[e] - max(self.prior[e], 0.0) >= WALL_THRESHOLD:
+                    self.log_odds[e] = np.inf
+                    decided += self.inference.observe(*self.inference.edges[e], wall=True)
+
+        return decided
+
+    def probability(self, x: int, y: int, direction: int) -> float:
+        e = self.inference.layout.edge_index(x, y, direction)
+        if e is None:
+            return 1.0
+        if (self.inference.known >> e) & 1:
+            return float((self.inference.walls >> e) & 1)
+        return float(1 / (1 + np.exp(-self.log_odds[e])))
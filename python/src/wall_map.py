@@ -0,0 +1,207 @@
+import math
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from core.consts import Consts
+from core.map_state import MapState
+
+
+TOP, RIGHT, BOTTOM, LEFT = 0, 1, 2, 3
+DIRECTIONS = ["top", "right", "bottom", "left"]
+OFFSETS = [(0, -1), (1, 0), (0, 1), (-1, 0)]
+
+
+class WallMap:
+    """
+    Wall knowledge over the cell grid, stored as two edge bitsets.
+
+    Bit `y * size + x` of `right` is the wall between (x, y) and (x + 1, y),
+    the same bit of `bottom` is the wall between (x, y) and (x, y + 1). The
+    outer border is always a wall. Both bitsets are plain ints, so copies are
+    free and a map can be hashed or used as a dict key.
+    """
+
+    __slots__ = ("size", "right", "bottom", "version")
+
+    def __init__(self, size: int = Consts.Map.WIDTH, right: int = 0, bottom: int = 0):
+        self.size = size
+        self.right = right
+        self.bottom = bottom
+        self.version = 0
+
+    @classmethod
+    def from_map_state(cls, map_state: Optional[MapState]) -> "WallMap":
+        # Each discrete grid entry counts the walls of a 2x2 block of cells.
+        if map_state is not None and map_state.discrete_grid:
+            return cls(2 * len(map_state.discrete_grid))
+        return cls()
+
+    def in_bounds(self, x: int, y: int) -> bool:
+        return 0 <= x < self.size and 0 <= y < self.size
+
+    def _edge(self, x: int, y: int, direction: int) -> Tuple[Optional[str], int]:
+        if direction == RIGHT:
+            return ("right", y * self.size + x) if x < self.size - 1 else (None, 0)
+        if direction == BOTTOM:
+            return ("bottom", y * self.size + x) if y < self.size - 1 else (None, 0)
+        if direction == LEFT:
+            return ("right", y * self.size + x - 1) if x > 0 else (None, 0)
+        return ("bottom", (y - 1) * self.size + x) if y > 0 else (None, 0)
+
+    @property
+    def edge_count(self) -> int:
+        return 2 * self.size * (self.size - 1)
+
+    def edge_index(self, x: int, y: int, direction: int) -> Optional[int]:
+        """
+        Dense index of an internal edge: the right edges row by row, then the
+        bottom edges. None for the outer border.
+        """
+        if direction == LEFT:
+            x, direction = x - 1, RIGHT
+        elif direction == TOP:
+            y, direction = y - 1, BOTTOM
+
+        if direction == RIGHT:
+            return y * (self.size - 1) + x if 0 <= x < self.size - 1 and 0 <= y < self.size else None
+        return self.size * (self.size - 1) + y * self.size + x if 0 <= y < self.size - 1 and 0 <= x < self.size else None
+
+    def internal_edges(self) -> List[Tuple[int, int, int]]:
+        """(x, y, direction) of every internal edge, in edge_index order."""
+        edges = [(x, y, RIGHT) for y in range(self.size) for x in range(self.size - 1)]
+        edges += [(x, y, BOTTOM) for y in range(self.size - 1) for x in range(self.size)]
+        return edges
+
+    def has_wall(self, x: int, y: int, direction: int) -> bool:
+        board, bit = self._edge(x, y, direction)
+        if board is None:
+            return True
+        return bool((getattr(self, board) >> bit) & 1)
+
+    def set_wall(self, x: int, y: int, direction: int, wall: bool = True) -> bool:
+        """Records a wall (or its absence). Returns True if the map changed."""
+        board, bit = self._edge(x, y, direction)
+        if board is None:
+            return False
+
+        before = getattr(self, board)
+        after = before | (1 << bit) if wall else before & ~(1 << bit)
+        if after == before:
+            return False
+
+        setattr(self, board, after)
+        self.version += 1
+        return True
+
+    def place_wall(self, x: int, y: int, direction: str) -> bool:
+        if not self.in_bounds(x, y):
+            print("Invalid cell coordinates")
+            return False
+
+        if direction not in DIRECTIONS:
+            print("Invalid direction. Use 'top', 'right', 'bottom', or 'left'")
+            return False
+
+        return self.set_wall(x, y, DIRECTIONS.index(direction))
+
+    def neighbour_mask(self, x: int, y: int) -> int:
+        """Bit d is set when the cell can be left through direction d."""
+        mask = 0
+        for direction in range(4):
+            if not self.has_wall(x, y, direction):
+                mask |= 1 << direction
+        return mask
+
+    def neighbours(self, x: int, y: int) -> Iterator[Tuple[int, int]]:
+        for direction, (dx, dy) in enumerate(OFFSETS):
+            if not self.has_wall(x, y, direction):
+                yield x + dx, y + dy
+
+    def _unpack(self, board: int) -> np.ndarray:
+        n = self.size * self.size
+        raw = np.frombuffer(board.to_bytes((n + 7) // 8, "little"), dtype=np.uint8)
+        return np.unpackbits(raw, bitorder="little")[:n].reshape(self.size, self.size).astype(bool)
+
+    def wall_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(right, bottom) as (size, size) bool arrays indexed [y, x], border included."""
+        right = self._unpack(self.right)
+        bottom = self._unpack(self.bottom)
+        right[:, -1] = True
+        bottom[-1, :] = True
+        return right, bottom
+
+    def neighbour_masks(self) -> np.ndarray:
+        """neighbour_mask for every cell at once, as a (size, size) uint8 array indexed [y, x]."""
+        right, bottom = self.wall_arrays()
+        left = np.ones_like(right)
+        left[:, 1:] = right[:, :-1]
+        top = np.ones_like(bottom)
+        top[1:, :] = bottom[:-1, :]
+
+        masks = (~top).astype(np.uint8) << TOP
+        masks |= (~right).astype(np.uint8) << RIGHT
+        masks |= (~bottom).astype(np.uint8) << BOTTOM
+        masks |= (~left).astype(np.uint8) << LEFT
+        return masks
+
+    def cell_of(self, x: float, y: float) -> Tuple[int, int]:
+        cx = min(max(int(x // Consts.Map.CELL_WIDTH), 0), self.size - 1)
+        cy = min(max(int(y // Consts.Map.CELL_HEIGHT), 0), self.size - 1)
+        return cx, cy
+
+    def fits(self, x: float, y: float, radius: float) -> bool:
+        """True when a disc of `radius` at (x, y) touches no wall of its cell, the map border included."""
+        cx, cy = self.cell_of(x, y)
+        left, top = cx * Consts.Map.CELL_WIDTH, cy * Consts.Map.CELL_HEIGHT
+        return not ((x - radius < left and self.has_wall(cx, cy, LEFT))
+                    or (x + radius > left + Consts.Map.CELL_WIDTH and self.has_wall(cx, cy, RIGHT))
+                    or (y - radius < top and self.has_wall(cx, cy, TOP))
+                    or (y + radius > top + Consts.Map.CELL_HEIGHT and self.has_wall(cx, cy, BOTTOM)))
+
+    def line_of_sight(self, x0: float, y0: float, x1: float, y1: float) -> bool:
+        """True when the segment from (x0, y0) to (x1, y1) crosses no wall, walking the cells it passes through."""
+        cx, cy = self.cell_of(x0, y0)
+        end = self.cell_of(x1, y1)
+        dx, dy = x1 - x0, y1 - y0
+        step_x, step_y = (1 if dx > 0 else -1), (1 if dy > 0 else -1)
+        # Fraction of the segment at which the next vertical / horizontal cell border is crossed.
+        next_x = ((cx + (dx > 0)) * Consts.Map.CELL_WIDTH - x0) / dx if dx else math.inf
+        next_y = ((cy + (dy > 0)) * Consts.Map.CELL_HEIGHT - y0) / dy if dy else math.inf
+        delta_x = Consts.Map.CELL_WIDTH / abs(dx) if dx else math.inf
+        delta_y = Consts.Map.CELL_HEIGHT / abs(dy) if dy else math.inf
+
+        while (cx, cy) != end and min(next_x, next_y) <= 1.0:
+            if next_x < next_y:
+                if self.has_wall(cx, cy, RIGHT if step_x > 0 else LEFT):
+                    return False
+                cx, next_x = cx + step_x, next_x + delta_x
+            else:
+                if self.has_wall(cx, cy, BOTTOM if step_y > 0 else TOP):
+                    return False
+                cy, next_y = cy + step_y, next_y + delta_y
+        return True
+
+    def key(self) -> Tuple[int, int, int]:
+        return self.size, self.right, self.bottom
+
+    def copy(self) -> "WallMap":
+        other = WallMap(self.size, self.right, self.bottom)
+        other.version = self.version
+        return other
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, WallMap) and self.key() == other.key()
+
+    def __hash__(self) -> int:
+        return hash(self.key())
+
+    def rows(self) -> List[str]:
+        return [
+            ''.join(f"[{''.join('W' if self.has_wall(x, y, d) else ' ' for d in range(4))}]" for x in range(self.size))
+            for y in range(self.size)
+        ]
+
+    def print_map(self) -> None:
+        for row in self.rows():
+            print(row)
@@ -0,0 +1,147 @@
+import asyncio
+import time
+
+from core.action import MoveAction, ShootAction
+from network.async_network import AsyncSocket
+from network.stand_in_server import StandInServer
+from network.synthetic import synthetic_frame
+
+
+class ScriptedBot:
+    """Answers every tick with a move and a shot; sleeps `delays[tick]` seconds first."""
+
+    def __init__(self, delays=None):
+        self.name = "scripted"
+        self.delays = delays or {}
+        self.ticks = []
+
+    def on_start(self, map_state):
+        pass
+
+    def on_tick(self, game_state):
+        tick = game_state.current_tick
+        self.ticks.append(tick)
+        time.sleep(self.delays.get(tick, 0.0))
+        return [MoveAction((float(tick), 1.0)), ShootAction((2.0, 2.0))]
+
+    def on_end(self):
+        pass
+
+
+def frames(ticks):
+    return [synthetic_frame(players=2, projectiles_per_player=1, coins=3, tick=tick, seed=tick) for tick in ticks]
+
+
+async def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+def test_reconnects_after_dropped_connection():
+    async def scenario():
+        async with StandInServer(frames([1, 2]), tick_interval=0.1, drop=True) as server:
+            client = AsyncSocket(server.url, "token", bot=ScriptedBot(), initial_backoff=0.01, max_backoff=0.05)
+            run = asyncio.create_task(client.run_async())
+            await wait_until(lambda: server.connections >= 2 and len(server.actions) >= 4)
+            client.stop()
+            await asyncio.wait_for(run, 5)
+            return server, client
+
+    server, client = asyncio.run(scenario())
+    assert server.connections >= 2
+    assert all(headers["Authorization"] == "token" for headers in server.headers)
+    # Every frame of every connection got its answer.
+    assert client.bot.ticks[:4] == [1, 2, 1, 2]
+    assert server.actions[0] == {"dest": {"x": 1.0, "y": 1.0}, "shoot": {"x": 2.0, "y": 2.0}}
+
+
+def test_actions_are_sent_as_text_frames():
+    async def scenario():
+        async with StandInServer(frames([1, 2]), tick_interval=0.05) as server:
+            client = AsyncSocket(server.url, "token", bot=ScriptedBot())
+            client.reconnect = False
+            run = asyncio.create_task(client.run_async())
+            await wait_until(lambda: len(server.actions) >= 2)
+            client.stop()
+            await asyncio.wait_for(run, 5)
+            return server
+
+    server = asyncio.run(scenario())
+    # Same opcode as websocket-client's ws.send(bytearray): the live server has only seen text.
+    assert server.binary_frames == 0
+    assert server.actions[1] == {"dest": {"x": 2.0, "y": 1.0}, "shoot": {"x": 2.0, "y": 2.0}}
+
+
+def test_late_tick_falls_back_to_last_move():
+    async def scenario():
+        async with StandInServer(frames([1, 2, 3]), tick_interval=0.2) as server:
+            client = AsyncSocket(server.url, "token", bot=ScriptedBot({2: 0.15}), tick_deadline=0.1)
+            client.reconnect = False
+            run = asyncio.create_task(client.run_async())
+            await wait_until(lambda: len(server.actions) >= 3)
+            client.stop()
+            await asyncio.wait_for(run, 5)
+            return server, client
+
+    server, client = asyncio.run(scenario())
+    assert client.late_ticks == 1
+    assert server.actions[0] == {"dest": {"x": 1.0, "y": 1.0}, "shoot": {"x": 2.0, "y": 2.0}}
+    # Tick 2 missed the deadline: only the previous move is repeated, no shot.
+    assert server.actions[1] == {"dest": {"x": 1.0, "y": 1.0}}
+    assert server.actions[2] == {"dest": {"x": 3.0, "y": 1.0}, "shoot": {"x": 2.0, "y": 2.0}}
+
+
+def test_keepalive_pings_share_the_connection():
+    async def scenario():
+        async with StandInServer(frames([1]), tick_interval=0.05) as server:
+            client = AsyncSocket(server.url, "token", bot=ScriptedBot())
+            client.ping_interval = 0.02
+            client.reconnect = False
+            run = asyncio.create_task(client.run_async())
+            await wait_until(lambda: server.pings >= 3 and server.actions)
+            client.stop()
+            await asyncio.wait_for(run, 5)
+            return server
+
+    server = asyncio.run(scenario())
+    assert server.pings >= 3
+    assert len(server.actions) == 1
+
+
+def test_bad_frame_costs_one_tick():
+    async def scenario():
+        good = frames([1, 2, 3])
+        # A truncated GameState makes the decoder throw inside the bot's tick.
+        async with StandInServer([good[0], good[1][:12], good[2]], tick_interval=0.05) as server:
+            client = AsyncSocket(server.url, "token", bot=ScriptedBot())
+            client.reconnect = False
+            run = asyncio.create_task(client.run_async())
+            await wait_until(lambda: len(server.actions) >= 2)
+            client.stop()
+            await asyncio.wait_for(run, 5)
+            return server, client
+
+    server, client = asyncio.run(scenario())
+    assert server.connections == 1
+    assert client.bot.ticks == [1, 3]
+    assert server.actions[1] == {"dest": {"x": 3.0, "y": 1.0}, "shoot": {"x": 2.0, "y": 2.0}}
+
+
+def test_states_arriving_during_a_late_tick_are_skipped():
+    async def scenario():
+        async with StandInServer(frames([1, 2, 3, 4, 5]), tick_interval=0.2) as server:
+            client = AsyncSocket(server.url, "token", bot=ScriptedBot({2: 0.5}), tick_deadline=0.1)
+            client.reconnect = False
+            run = asyncio.create_task(client.run_async())
+            await wait_until(lambda: 5 in client.bot.ticks and len(server.actions) >= 3)
+            client.stop()
+            await asyncio.wait_for(run, 5)
+            return server, client
+
+    server, client = asyncio.run(scenario())
+    # Tick 2 runs until ~0.7 s: ticks 3 and 4 are dropped instead of queuing behind it.
+    assert client.bot.ticks == [1, 2, 5]
+    assert (client.late_ticks, client.skipped_ticks) == (1, 2)
+    assert server.actions[2] == {"dest": {"x": 5.0, "y": 1.0}, "shoot": {"x": 2.0, "y": 2.0}}
@@ -0,0 +1,63 @@
+import math
+
+import numpy as np
+
+from core.game_state import GameState, PlayerInfo, PlayerWeapon
+from core.map_state import Point
+from src.blade import BLADE_REACH, BladeSweep, _PROBIT, blade_contact
+from src.motion import MotionEstimator
+from src.wall_map import RIGHT, WallMap
+
+
+def segment_distance(px, py, dx, dy, length):
+    # Brute force: the closest of many points along the blade.
+    along = np.linspace(0.0, length, 20001)
+    return float(np.min(np.hypot(px - along * dx, py - along * dy)))
+
+
+def test_blade_contact_matches_point_to_segment_distance():
+    rng = np.random.default_rng(0)
+    rel = rng.uniform(-8.0, 8.0, size=(6, 4, 2))
+    sigma = rng.uniform(0.2, 2.0, size=(6, 4))
+    angles = rng.uniform(0.0, 2 * math.pi, size=5)
+    directions = np.column_stack([np.cos(angles), np.sin(angles)])
+    length = 3.0
+
+    expected = np.zeros((5, 6))
+    for a, (dx, dy) in enumerate(directions):
+        for n in range(6):
+            for s in range(4):
+                distance = segment_distance(rel[n, s, 0], rel[n, s, 1], dx, dy, length)
+                z = (BLADE_REACH - distance) * _PROBIT / sigma[n, s]
+                expected[a, n] += 1.0 / (1.0 + math.exp(-z)) / 4
+
+    assert np.allclose(blade_contact(rel, sigma, directions, length), expected, atol=1e-4)
+
+
+def test_line_of_sight():
+    walls = WallMap(10)
+    walls.set_wall(4, 2, RIGHT)
+
+    assert not walls.line_of_sight(45.0, 25.0, 55.0, 25.0)
+    assert not walls.line_of_sight(38.0, 21.0, 62.0, 29.0)
+    assert walls.line_of_sight(45.0, 35.0, 55.0, 35.0)
+    assert walls.line_of_sight(45.0, 21.0, 45.0, 29.0)
+
+
+def test_plan_ignores_enemies_behind_walls():
+    motion = MotionEstimator()
+    for tick in (1, 2):
+        g = GameState(current_tick=tick, current_round=1)
+        g.players = [PlayerInfo(name="enemy", health=100, pos=Point(51.0, 25.0))]
+        motion.update(g)
+    positions = np.array([[51.0, 25.0]])
+
+    open_map = BladeSweep(motion, WallMap(10)).plan(PlayerWeapon.PlayerWeaponCanon, (49.0, 25.0), None,
+                                                    ["enemy"], positions)
+    assert open_map.blade > 0 and open_map.canon > 0
+
+    walls = WallMap(10)
+    walls.set_wall(4, 2, RIGHT)
+    walled = BladeSweep(motion, walls).plan(PlayerWeapon.PlayerWeaponBlade, (49.0, 25.0), None,
+                                            ["enemy"], positions)
+    assert walled == (PlayerWeapon.PlayerWeaponCanon, 0.0, 0.0, 0.0)
@@ -0,0 +1,45 @@
+from core.action import MoveAction
+from core.game_state import GameState, PlayerInfo, Projectile
+from core.map_state import Point
+from src.bot import MyBot
+from src.wall_map import BOTTOM, RIGHT
+
+
+def player(name, x, y, dest=None):
+    return PlayerInfo(name=name, health=100, pos=Point(x, y), dest=dest or Point(x, y))
+
+
+def test_choose_target_skips_enemies_behind_known_walls():
+    bot = MyBot()
+    bot.map.set_wall(4, 2, RIGHT)
+    us = player(bot.name, 45.0, 25.0)
+    hidden = player("hidden", 55.0, 25.0)
+    visible = player("visible", 45.0, 45.0)
+
+    assert bot.choose_target(us, [hidden]) is None
+    assert bot.choose_target(us, [hidden, visible]) == [45.0, 45.0]
+
+
+def test_choose_target_does_not_lead_into_a_wall():
+    bot = MyBot()
+    bot.map.set_wall(4, 2, BOTTOM)
+    us = player(bot.name, 45.0, 25.0)
+    # Visible now, but behind the wall by the time a shot would reach it.
+    runner = player("runner", 45.0, 29.5, dest=Point(45.0, 60.0))
+
+    assert bot.choose_target(us, [runner]) == [45.0, 29.5]
+
+
+def test_dodge_stays_clear_of_known_walls():
+    bot = MyBot()
+    bot.map.set_wall(0, 0, RIGHT)
+    us = player(bot.name, 9.5, 5.0)
+    # A shot coming straight down on us; sidestepping right would walk into the wall.
+    enemy = player("enemy", 9.5, 0.5)
+    enemy.projectiles = [Projectile("shot", Point(9.5, 2.5), Point(9.5, 20.0))]
+    game_state = GameState(current_tick=1, current_round=1)
+    game_state.players = [us, enemy]
+
+    move = bot.dodge(us, MoveAction((9.5, 5.0)), game_state)
+    assert move.dest_pos != (9.5, 5.0)
+    assert move.dest_pos[0] <= 9.5 and bot.map.fits(*move.dest_pos, 0.5)
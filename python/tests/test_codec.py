@@ -0,0 +1,215 @@
+import random
+
+import pytest
+
+from core.compact import EntityPool
+from core.map_state import Collider, ColliderType, MapState, Point
+from core.message import MessageType
+from network.columnar_decoder import ColumnarDecoder
+from network.compact_decoder import CompactDecoder
+from network.decoder import JDISDecoder, MemoryViewDecoder, format_uuid
+from network.encoder import JDISEncoder
+from network.lazy_decoder import LazyDecoder
+from network.synthetic import synthetic_game_state, synthetic_map_state
+from sim.maze import discrete_grid, random_maze
+from src.bot import MyBot
+from src.wall_codec import SAVE_SIZE, decode_walls, encode_walls
+from src.wall_inference import WallInference
+
+
+SEEDS = range(25)
+DECODERS = {
+    "jdis": JDISDecoder,
+    "memoryview": MemoryViewDecoder,
+    "slots": CompactDecoder,
+    "pooled": lambda: CompactDecoder(EntityPool()),
+}
+
+
+def uids(table):
+    # numpy drops the trailing NUL bytes of 'S16' items.
+    return [format_uuid(bytes(uid).ljust(16, b'\0')) for uid in table['uid']]
+
+
+def random_game_state(seed):
+    rng = random.Random(seed)
+    return synthetic_game_state(rng.randint(0, 40), rng.randint(0, 12), rng.randint(0, 60),
+                                tick=rng.randint(0, 2**31 - 1), seed=rng.getrandbits(32))
+
+
+@pytest.fixture(params=SEEDS)
+def game_state(request):
+    return random_game_state(request.param)
+
+
+@pytest.mark.parametrize("name", DECODERS)
+def test_game_state_round_trip(name, game_state):
+    encoder = JDISEncoder()
+    payload = encoder.encode_game_state(game_state)
+    decoded = DECODERS[name]().decode_game_state(payload)
+
+    assert decoded == game_state
+    assert encoder.encode_game_state(decoded) == payload
+    assert str(decoded) == str(game_state)
+
+
+@pytest.mark.parametrize("name", ["memoryview", "slots", "pooled"])
+def test_game_state_from_frame_offset(name, game_state):
+    encoder = JDISEncoder()
+    frame = encoder.encode_message(MessageType.GameState, encoder.encode_game_state(game_state))
+
+    assert DECODERS[name]().decode_game_state(frame, 1) == game_state
+
+
+def test_lazy_decoder_round_trip(game_state):
+    encoder = JDISEncoder()
+    frame = encoder.encode_message(MessageType.GameState, encoder.encode_game_state(game_state))
+    decoded = LazyDecoder().decode_game_state(frame, 1)
+
+    assert decoded.materialize() == game_state
+    assert str(decoded) == str(game_state)
+
+
+def test_lazy_fields_survive_a_reused_buffer(game_state):
+    encoder = JDISEncoder()
+    frame = bytearray(encoder.encode_message(MessageType.GameState, encoder.encode_game_state(game_state)))
+    decoded = LazyDecoder().decode_game_state(frame, 1)
+    frame[:] = bytes(len(frame))
+
+    assert decoded.materialize() == game_state
+
+
+def test_pooled_states_stay_valid_for_two_ticks():
+    encoder = JDISEncoder()
+    decoder = CompactDecoder(EntityPool(generations=2))
+    states = [random_game_state(seed) for seed in range(4)]
+    decoded = [decoder.decode_game_state(encoder.encode_game_state(g)) for g in states]
+
+    # The two most recent states are untouched; older ones have been recycled.
+    assert decoded[-2:] == states[-2:]
+
+
+def test_columnar_round_trip(game_state):
+    encoder = JDISEncoder()
+    frame = encoder.encode_message(MessageType.GameState, encoder.encode_game_state(game_state))
+    s = ColumnarDecoder().decode_columnar(frame, 1)
+
+    assert (s.current_tick, s.current_round) == (game_state.current_tick, game_state.current_round)
+    assert s.names == [p.name for p in game_state.players]
+    for i, p in enumerate(game_state.players):
+        row = s.players[i]
+        assert (row['color'], row['health'], row['score'], row['weapon']) == \
+               (p.color, p.health, p.score, int(p.playerWeapon))
+        assert tuple(row['pos']) == (p.pos.x, p.pos.y)
+        assert bool(row['has_dest']) == (p.dest != Point())
+        if row['has_dest']:
+            assert tuple(row['dest']) == (p.dest.x, p.dest.y)
+        assert tuple(row['blade_start']) == (p.blade.start.x, p.blade.start.y)
+        assert tuple(row['blade_end']) == (p.blade.end.x, p.blade.end.y)
+        assert row['blade_rotation'] == p.blade.rotation
+
+        projectiles = s.player_projectiles(i)
+        assert uids(projectiles) == [q.uid for q in p.projectiles]
+        assert [tuple(q['pos']) for q in projectiles] == [(q.pos.x, q.pos.y) for q in p.projectiles]
+        assert [tuple(q['dest']) for q in projectiles] == [(q.dest.x, q.dest.y) for q in p.projectiles]
+
+    assert uids(s.coins) == [c.uid for c in game_state.coins]
+    assert [tuple(c['pos']) for c in s.coins] == [(c.pos.x, c.pos.y) for c in game_state.coins]
+    assert [int(c['value']) for c in s.coins] == [c.value for c in game_state.coins]
+
+
+@pytest.mark.parametrize("name", DECODERS)
+@pytest.mark.parametrize("seed", SEEDS)
+def test_map_state_round_trip(name, seed):
+    rng = random.Random(seed)
+    encoder = JDISEncoder()
+    map_state = synthetic_map_state(rng.randint(1, 10), seed=rng.getrandbits(32))
+    payload = encoder.encode_map_state(map_state)
+    decoded = DECODERS[name]().decode_map_state(payload)
+
+    assert decoded == map_state
+    assert encoder.encode_map_state(decoded) == payload
+
+
+@pytest.mark.parametrize("name", ["memoryview", "slots", "pooled"])
+def test_map_state_with_colliders_round_trip(name):
+    # JDISDecoder reads every collider's points from the start of the payload instead.
+    map_state = synthetic_map_state(seed=4)
+    map_state.walls = [
+        Collider(ColliderType.Wall, [Point(10.0, 20.0), Point(10.0, 30.0)]),
+        Collider(ColliderType.Projectile, [Point(1.5, 2.5), Point(3.5, 4.5), Point(5.5, 6.5)]),
+    ]
+    encoder = JDISEncoder()
+    payload = encoder.encode_map_state(map_state)
+    decoded = DECODERS[name]().decode_map_state(payload)
+
+    assert decoded == map_state
+    assert decoded.walls[1].positions[2] == Point(5.5, 6.5)
+    assert JDISDecoder().decode_map_state(payload).walls != map_state.walls
+
+
+def learnt_inference(seed, observed=40):
+    """Inference over a random maze's grid, plus `observed` edges seen in play."""
+    maze = random_maze(seed=seed)
+    grid = discrete_grid(maze)
+    inference = WallInference(maze.size, grid)
+    rng = random.Random(seed)
+    for x, y, direction in rng.sample(inference.edges, observed):
+        inference.observe(x, y, direction, maze.has_wall(x, y, direction))
+    return inference, grid
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_wall_save_round_trip(seed):
+    inference, grid = learnt_inference(seed)
+    data = encode_walls(inference, tick=1234, sequence=70001)
+    assert len(data) == 58
+
+    # The server hands the save back padded to its full size.
+    restored = WallInference(inference.size, grid)
+    header = decode_walls(bytes(data).ljust(SAVE_SIZE, b'\0'), restored)
+    assert (header.tick, header.sequence) == (1234, 70001 & 0xFFFF)
+    assert (restored.known, restored.walls) == (inference.known, inference.walls)
+
+
+def test_wall_save_size_limit():
+    # 16x16 cells have 480 internal edges: two 60-byte bitsets do not fit.
+    with pytest.raises(ValueError):
+        encode_walls(WallInference(16), tick=1)
+
+
+def test_wall_save_rejects_mismatches():
+    inference, grid = learnt_inference(0)
+    data = bytearray(encode_walls(inference, tick=10, sequence=3))
+    other_inference, _ = learnt_inference(1)
+    before = (other_inference.known, other_inference.walls)
+
+    wrong_format = bytearray(data)
+    wrong_format[0] ^= 0xFF
+    # Flip the wall bit of an edge the grid alone already decides.
+    contradiction = bytearray(data)
+    grid_known = WallInference(inference.size, grid).known
+    assert grid_known
+    e = (grid_known & -grid_known).bit_length() - 1
+    contradiction[12 + 23 + e // 8] ^= 1 << (e % 8)
+
+    # Another map's save (CRC mismatch), empty, truncated or corrupt saves restore nothing.
+    for bad in (data, bytes(SAVE_SIZE), data[:40], wrong_format):
+        assert decode_walls(bad, other_inference) is None
+        assert (other_inference.known, other_inference.walls) == before
+
+    fresh = WallInference(inference.size, grid)
+    fresh_before = (fresh.known, fresh.walls)
+    assert decode_walls(contradiction, fresh) is None
+    assert (fresh.known, fresh.walls) == fresh_before
+
+
+def test_bot_restores_walls_and_sequence_on_start():
+    inference, grid = learnt_inference(2)
+    save = bytearray(encode_walls(inference, tick=500, sequence=9).ljust(SAVE_SIZE, b'\0'))
+    bot = MyBot()
+    bot.on_start(MapState(size=len(grid), discrete_grid=grid, walls=[], save=save))
+
+    assert bot.save_sequence == 9
+    assert (bot.inference.known, bot.inference.walls) == (inference.known, inference.walls)
+    assert bot.map == inference.wall_map()
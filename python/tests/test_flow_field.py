@@ -0,0 +1,76 @@
+import random
+
+import numpy as np
+import pytest
+
+from sim.maze import random_maze
+from src.flow_field import UNREACHABLE, FlowField, FlowFieldCache
+from src.pathfinding import CellGrid, astar
+from src.wall_map import BOTTOM, RIGHT, WallMap
+
+
+def test_distances_match_a_search():
+    maze = random_maze(seed=3)
+    field = FlowField(maze, (7, 2))
+    grid = CellGrid(maze)
+    for y in range(maze.size):
+        for x in range(maze.size):
+            assert field.distance((x, y)) == len(astar(grid, (x, y), (7, 2))) - 1
+
+
+def test_walled_in_cells_are_unreachable():
+    walls = WallMap(10)
+    walls.set_wall(9, 8, BOTTOM)
+    walls.set_wall(8, 9, RIGHT)
+    field = FlowField(walls, (0, 0))
+    assert field.distance((9, 9)) == UNREACHABLE
+    assert field.direction((9, 9)) == UNREACHABLE
+
+
+def test_new_wall_only_drops_the_fields_it_affects():
+    walls = WallMap(10)
+    cache = FlowFieldCache(walls)
+    near, far = cache.field((0, 0)), cache.field((9, 9))
+
+    # (1, 0) has no other step toward (0, 0), but (0, 0) can still reach (9, 9) just as fast going down.
+    walls.set_wall(0, 0, RIGHT)
+    cache.notify_wall(0, 0, RIGHT)
+    assert (0, 0) not in cache.fields
+    assert cache.fields[(9, 9)] is far
+    assert cache.field((0, 0)) is not near
+    assert far.distance((0, 0)) == 18 and far.direction((0, 0)) == BOTTOM
+
+
+def test_unreported_change_drops_everything():
+    walls = WallMap(10)
+    cache = FlowFieldCache(walls)
+    field = cache.field((9, 9))
+    walls.set_wall(0, 0, RIGHT)
+    assert cache.field((9, 9)) is not field
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_kept_fields_stay_exact(seed):
+    # Edges of a maze are closed and reopened at random; every field the cache keeps must
+    # still equal a fresh computation.
+    rng = random.Random(seed)
+    walls = random_maze(seed=seed)
+    cache = FlowFieldCache(walls, capacity=100)
+    targets = [(rng.randrange(walls.size), rng.randrange(walls.size)) for _ in range(12)]
+    edges = walls.internal_edges()
+
+    kept = 0
+    for _ in range(40):
+        for target in targets:
+            cache.field(target)
+        x, y, direction = rng.choice(edges)
+        walls.set_wall(x, y, direction, not walls.has_wall(x, y, direction))
+        cache.notify_wall(x, y, direction)
+
+        for target, field in cache.fields.items():
+            fresh = FlowField(walls, target)
+            assert np.array_equal(field.dist, fresh.dist)
+            assert np.array_equal(field.next_dir, fresh.next_dir)
+        kept += len(cache.fields)
+    # Not every change throws every field away.
+    assert kept >= 40
@@ -0,0 +1,31 @@
+from core.game_state import GameState, PlayerInfo
+from core.map_state import Point
+from src.motion import MotionEstimator
+
+
+def state(tick, x, health=50):
+    g = GameState(current_tick=tick, current_round=1)
+    g.players = [PlayerInfo(name="enemy", health=health, pos=Point(x, 5.0))]
+    return g
+
+
+def test_tracked_only_after_two_updates():
+    motion = MotionEstimator()
+    motion.update(state(1, 5.0))
+    assert motion.known(["enemy", "stranger"]) == [False, False]
+
+    motion.update(state(2, 5.3))
+    assert motion.known(["enemy"]) == [True]
+    assert motion.velocities(["enemy"])[0, 0] > 0
+
+
+def test_respawn_starts_tracking_over():
+    motion = MotionEstimator()
+    for tick, x in enumerate((5.0, 5.3, 5.6), start=1):
+        motion.update(state(tick, x))
+    motion.update(state(4, 5.6, health=0))
+    motion.update(state(5, 60.0))
+    assert motion.known(["enemy"]) == [False]
+
+    motion.update(state(6, 60.3))
+    assert motion.known(["enemy"]) == [True]
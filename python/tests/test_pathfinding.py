@@ -0,0 +1,89 @@
+import random
+
+import pytest
+
+from sim.maze import random_maze
+from src.pathfinding import CellGrid, DStarLite, Navigator, SubCellGrid, astar
+from src.wall_map import BOTTOM, RIGHT, WallMap
+
+
+def steps_are_open(wall_map, path):
+    grid = CellGrid(wall_map)
+    return all(b in grid.neighbours(a) for a, b in zip(path, path[1:]))
+
+
+def test_straight_path_on_an_open_map():
+    planner = DStarLite(CellGrid(WallMap(10)), (0, 0), (4, 0))
+    assert planner.path() == [(0, 0), (1, 0), (2, 0), (3, 0), (4, 0)]
+
+
+def test_replans_around_a_new_wall():
+    walls = WallMap(10)
+    planner = DStarLite(CellGrid(walls), (0, 0), (2, 0))
+    assert len(planner.path()) == 3
+
+    walls.set_wall(1, 0, RIGHT)
+    planner.notify_wall(1, 0, RIGHT)
+    path = planner.path()
+    assert len(path) == 5 and steps_are_open(walls, path)
+
+
+def test_no_path_once_the_goal_is_walled_in():
+    walls = WallMap(10)
+    planner = DStarLite(CellGrid(walls), (0, 0), (9, 9))
+    assert planner.path() is not None
+
+    for x, y, direction in ((9, 8, BOTTOM), (8, 9, RIGHT)):
+        walls.set_wall(x, y, direction)
+        planner.notify_wall(x, y, direction)
+    assert planner.path() is None
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_incremental_plan_matches_a_fresh_search(seed):
+    # Walls of a maze are discovered one by one while walking; every repaired plan is a shortest one.
+    maze = random_maze(seed=seed)
+    walls = WallMap(maze.size)
+    grid = CellGrid(walls)
+    rng = random.Random(seed)
+    start, goal = (0, 0), (maze.size - 1, maze.size - 1)
+    planner = DStarLite(grid, start, goal)
+
+    hidden = [(x, y, d) for y in range(maze.size) for x in range(maze.size) for d in (RIGHT, BOTTOM)
+              if maze.has_wall(x, y, d) and walls.in_bounds(x + (d == RIGHT), y + (d == BOTTOM))]
+    rng.shuffle(hidden)
+    for x, y, direction in hidden:
+        walls.set_wall(x, y, direction)
+        planner.notify_wall(x, y, direction)
+        path = planner.path()
+        if path is None:
+            break
+        assert path[-1] == goal and steps_are_open(walls, path)
+        assert len(path) == len(astar(grid, planner.start, goal))
+
+        # Take a step along the plan now and then.
+        if rng.random() < 0.3 and len(path) > 1:
+            planner.move_start(path[1])
+
+
+def test_sub_cell_grid_only_crosses_cells_through_openings():
+    walls = WallMap(10)
+    walls.set_wall(0, 0, RIGHT)
+    grid = SubCellGrid(walls, 2)
+
+    assert (2, 0) not in grid.neighbours((1, 0))
+    assert (1, 1) in grid.neighbours((1, 0))
+    # The wall covers both sub-cells of the edge: the way round leaves through cell (0, 1).
+    assert astar(grid, (1, 0), (2, 0)) == [(1, 0), (1, 1), (1, 2), (2, 2), (2, 1), (2, 0)]
+
+
+def test_navigator_heads_for_the_first_turn():
+    walls = WallMap(10)
+    walls.set_wall(0, 0, RIGHT)
+    navigator = Navigator(walls)
+    navigator.notify_wall(0, 0, RIGHT)
+
+    # From cell (0, 0) to cell (1, 0) the way round goes down first.
+    move = navigator.move((5.0, 5.0), (15.0, 5.0))
+    assert move.dest_pos == (5.0, 15.0)
+    assert navigator.move((5.0, 5.0), (7.0, 5.0)).dest_pos == (7.0, 5.0)
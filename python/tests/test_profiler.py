@@ -0,0 +1,45 @@
+import gc
+import time
+
+from network.profiler import SlowTickProfiler
+
+
+def slow_tick_with_collection():
+    # Enough reference cycles for the forced collection to take measurable time.
+    garbage = [[] for _ in range(200_000)]
+    for item in garbage:
+        item.append(item)
+    del garbage
+    gc.collect()
+    time.sleep(0.02)
+
+
+def test_gc_pause_shows_up_in_slow_tick(tmp_path):
+    profiler = SlowTickProfiler(str(tmp_path), threshold=0.01)
+    try:
+        profiler.begin()
+        slow_tick_with_collection()
+        path = profiler.end(7)
+    finally:
+        profiler.close()
+
+    assert path is not None and profiler.gc_time > 0
+    with open(path) as f:
+        stacks = dict(line.rsplit(" ", 1) for line in f.read().splitlines())
+    gc_stacks = [stack for stack in stacks if stack.endswith("[gc gen2]")]
+    assert gc_stacks and "slow_tick_with_collection" in gc_stacks[0]
+    assert sum(int(stacks[stack]) for stack in gc_stacks) >= 1
+
+
+def test_collections_outside_a_tick_are_ignored(tmp_path):
+    profiler = SlowTickProfiler(str(tmp_path), threshold=0.0)
+    try:
+        gc.collect()
+        profiler.begin()
+        path = profiler.end(1)
+    finally:
+        profiler.close()
+
+    assert profiler.gc_time == 0.0
+    with open(path) as f:
+        assert "[gc" not in f.read()
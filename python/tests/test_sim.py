@@ -0,0 +1,28 @@
+import base64
+
+from sim.game import Simulation
+
+
+def kill(sim, player):
+    player.health, player.respawn_at = 0, sim.tick + 10
+    return player
+
+
+def test_dead_players_stay_in_the_state():
+    sim = Simulation(seed=0)
+    sim.add_player("alive")
+    kill(sim, sim.add_player("dead"))
+
+    players = {p.name: p for p in sim.game_state().players}
+    assert players["dead"].health == 0 and not players["dead"].isAlive()
+    assert players["alive"].isAlive()
+
+
+def test_dead_players_can_still_save():
+    sim = Simulation(seed=0)
+    dead = kill(sim, sim.add_player("dead"))
+    sim.apply_actions("dead", {"save": base64.b64encode(b"walls").decode(), "dest": {"x": 1.0, "y": 1.0}})
+
+    assert bytes(sim.map_state("dead").save[:5]) == b"walls"
+    # Everything else a dead player sends is still ignored.
+    assert dead.dest is None
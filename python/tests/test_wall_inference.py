@@ -0,0 +1,71 @@
+import random
+
+import pytest
+
+from sim.maze import discrete_grid, random_maze
+from src.wall_inference import OPEN, WALL, WallInference
+from src.wall_map import BOTTOM, RIGHT
+
+
+def test_grid_count_decides_a_block():
+    # One 2x2 block: 8 border edges always count, the 4 inner ones are decided by the rest.
+    assert WallInference(2, [[8]]).state(0, 0, RIGHT) == OPEN
+    assert WallInference(2, [[8]]).unknown_count == 0
+
+    walled = WallInference(2, [[12]], connected=False)
+    assert walled.unknown_count == 0
+    assert all(walled.state(x, y, d) == WALL for x, y, d in walled.edges)
+
+
+def test_unique_solution_across_blocks():
+    # 4x4 cells. The top-left block is walled in on every side, which already
+    # accounts for the 2 walls each neighbour shares with it: the rest is open.
+    inference = WallInference(4, [[12, 6], [6, 4]], connected=False)
+    assert inference.unknown_count == 0
+    walls = {edge for e, edge in enumerate(inference.edges) if (inference.walls >> e) & 1}
+    assert walls == {(x, y, d) for x in (0, 1) for y in (0, 1) for d in (RIGHT, BOTTOM)}
+
+
+@pytest.mark.parametrize("grid", [[[13]], [[12]], [[11]], [[3, 3], [3, 3]], [[12, 6], [6, 4]]])
+def test_contradictory_grid_raises(grid):
+    # Too many walls for the 12 edges, fewer than the outer border, or cells walled in on every side.
+    with pytest.raises(ValueError):
+        WallInference(2 * len(grid), grid)
+
+
+def test_observation_decides_the_rest_of_a_block():
+    inference = WallInference(2, [[9]], connected=False)
+    assert inference.unknown_count == 4
+
+    assert inference.observe(0, 0, RIGHT, False) == [(0, 0, RIGHT, False)]
+    inference.observe(0, 1, RIGHT, False)
+    decided = inference.observe(0, 0, BOTTOM, False)
+    assert decided == [(0, 0, BOTTOM, False), (1, 0, BOTTOM, True)]
+    assert inference.unknown_count == 0
+
+
+def test_contradicting_observation_is_ignored():
+    inference = WallInference(2, [[8]])
+    assert inference.observe(0, 0, RIGHT, True) == []
+    assert inference.state(0, 0, RIGHT) == OPEN
+
+
+@pytest.mark.parametrize("seed", range(25))
+def test_propagation_agrees_with_the_real_maze(seed):
+    maze = random_maze(seed=seed)
+    inference = WallInference(maze.size, discrete_grid(maze))
+
+    def check():
+        for e, (x, y, direction) in enumerate(inference.edges):
+            if (inference.known >> e) & 1:
+                assert inference.state(x, y, direction) == maze.has_wall(x, y, direction)
+
+    check()
+    edges = list(inference.edges)
+    random.Random(seed).shuffle(edges)
+    for x, y, direction in edges:
+        for ex, ey, ed, wall in inference.observe(x, y, direction, maze.has_wall(x, y, direction)):
+            assert wall == maze.has_wall(ex, ey, ed)
+    check()
+    assert inference.unknown_count == 0
+    assert inference.wall_map() == maze